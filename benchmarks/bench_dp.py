@@ -0,0 +1,45 @@
+#!/usr/bin/env python
+# Copyright (c) 2017, wradlib developers.
+# Distributed under the MIT License. See LICENSE.txt for more info.
+
+"""
+Benchmarks for wradlib.dp
+=========================
+
+Compares the available backends of :meth:`wradlib.dp.unfold_phi`::
+
+    $ python benchmarks/bench_dp.py
+
+"""
+
+import timeit
+
+import numpy as np
+
+import wradlib.dp as dp
+
+
+def synthetic_phidp(beams=360, rs=1000, seed=42):
+    """Returns folded synthetic phidp and rho of shape (beams, rs)."""
+    rng = np.random.RandomState(seed)
+    kdp = np.abs(rng.normal(0.5, 0.3, (beams, rs)))
+    phidp = np.cumsum(kdp, axis=-1) * 0.6 + rng.normal(0, 2, (beams, rs))
+    phidp = ((phidp + 180) % 360) - 180
+    rho = np.full((beams, rs), 0.95)
+    rho[:, :20] = 0.5
+    return phidp.astype("f4"), rho.astype("f4")
+
+
+def bench_unfold_phi(beams=360, rs=1000, number=3):
+    phidp, rho = synthetic_phidp(beams, rs)
+    print("unfold_phi, {0} beams x {1} gates".format(beams, rs))
+    for backend in dp.unfold_phi_backends():
+        n = 1 if backend == "python" else number
+        t = timeit.timeit(lambda: dp.unfold_phi(phidp, rho, copy=True,
+                                                backend=backend),
+                          number=n) / n
+        print("    {0:<10s}{1:10.4f} s".format(backend, t))
+
+
+if __name__ == '__main__':
+    bench_unfold_phi()
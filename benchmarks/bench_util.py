@@ -0,0 +1,191 @@
+#!/usr/bin/env python
+# Copyright (c) 2017, wradlib developers.
+# Distributed under the MIT License. See LICENSE.txt for more info.
+
+"""
+Benchmarks for wradlib.util
+===========================
+
+Compares :meth:`wradlib.util.maximum_intensity_projection` with the legacy
+loop based implementation, which is kept here for reference only::
+
+    $ python benchmarks/bench_util.py
+
+"""
+
+import timeit
+
+import numpy as np
+
+from wradlib.georef import beam_height_n
+from wradlib.util import maximum_intensity_projection
+
+
+def _maximum_intensity_projection(data, r=None, az=None, angle=None,
+                                  elev=None, autoext=True):
+    """
+    Computes the maximum intensity projection along an arbitrary cut
+    through the ppi from polar data.
+
+    Parameters
+    ----------
+    data : :class:`numpy:numpy.ndarray`
+        Array containing polar data (azimuth, range)
+    r : :class:`numpy:numpy.ndarray`
+        Array containing range data
+    az : array
+        Array containing azimuth data
+    angle : float
+        angle of slice, Defaults to 0. Should be between 0 and 180.
+        0. means horizontal slice, 90. means vertical slice
+    elev : float
+        elevation angle of scan, Defaults to 0.
+    autoext : True | False
+        This routine uses numpy.digitize to bin the data.
+        As this function needs bounds, we create one set of coordinates more
+        than would usually be provided by `r` and `az`.
+
+    Returns
+    -------
+    xs : :class:`numpy:numpy.ndarray`
+        meshgrid x array
+    ys : :class:`numpy:numpy.ndarray`
+        meshgrid y array
+    mip : :class:`numpy:numpy.ndarray`
+        Array containing the maximum intensity projection (range, range*2)
+
+    """
+
+    # this may seem odd at first, but d1 and d2 are also used in several
+    # plotting functions and thus it may be easier to compare the functions
+    d1 = r
+    d2 = az
+
+    # providing 'reasonable defaults', based on the data's shape
+    if d1 is None:
+        d1 = np.arange(data.shape[1], dtype=float)
+    if d2 is None:
+        d2 = np.arange(data.shape[0], dtype=float)
+
+    if angle is None:
+        angle = 0.0
+
+    if elev is None:
+        elev = 0.0
+
+    if autoext:
+        # the ranges need to go 'one bin further', assuming some regularity
+        # we extend by the distance between the preceding bins.
+        x = np.append(d1, d1[-1] + (d1[-1] - d1[-2]))
+        # the angular dimension is supposed to be cyclic, so we just add the
+        # first element
+        y = np.append(d2, d2[0])
+    else:
+        # no autoext basically is only useful, if the user supplied the correct
+        # dimensions himself.
+        x = d1
+        y = d2
+
+    # roll data array to specified azimuth, assuming equidistant azimuth angles
+    ind = (d2 >= angle).nonzero()[0][0]
+    data = np.roll(data, ind, axis=0)
+
+    # build cartesian range array, add delta to last element to compensate for
+    # open bound (np.digitize)
+    dc = np.linspace(-np.max(d1), np.max(d1) + 0.0001, num=d1.shape[0] * 2 + 1)
+
+    # get height values from polar data and build cartesian height array
+    # add delta to last element to compensate for open bound (np.digitize)
+    hp = np.zeros((y.shape[0], x.shape[0]))
+    hc = beam_height_n(x, elev)
+    hp[:] = hc
+    hc[-1] += 0.0001
+
+    # create meshgrid for polar data
+    xx, yy = np.meshgrid(x, y)
+
+    # create meshgrid for cartesian slices
+    xs, ys = np.meshgrid(dc, hc)
+    # xs, ys = np.meshgrid(dc,x)
+
+    # convert polar coordinates to cartesian
+    xxx = xx * np.cos(np.radians(90. - yy))
+    # yyy = xx * np.sin(np.radians(90.-yy))
+
+    # digitize coordinates according to cartesian range array
+    range_dig1 = np.digitize(xxx.ravel(), dc)
+    range_dig1.shape = xxx.shape
+
+    # digitize heights according polar height array
+    height_dig1 = np.digitize(hp.ravel(), hc)
+    # reshape accordingly
+    height_dig1.shape = hp.shape
+
+    # what am I doing here?!
+    range_dig1 = range_dig1[0:-1, 0:-1]
+    height_dig1 = height_dig1[0:-1, 0:-1]
+
+    # create height and range masks
+    height_mask = [(height_dig1 == i).ravel().nonzero()[0]
+                   for i in range(1, len(hc))]
+    range_mask = [(range_dig1 == i).ravel().nonzero()[0]
+                  for i in range(1, len(dc))]
+
+    # create mip output array, set outval to inf
+    mip = np.zeros((d1.shape[0], 2 * d1.shape[0]))
+    mip[:] = np.inf
+
+    # fill mip array,
+    # in some cases there are no values found in the specified range and height
+    # then we fill in nans and interpolate afterwards
+    for i in range(0, len(range_mask)):
+        mask1 = range_mask[i]
+        found = False
+        for j in range(0, len(height_mask)):
+            mask2 = np.intersect1d(mask1, height_mask[j])
+            # this is to catch the ValueError from the max() routine when
+            # calculating on empty array
+            try:
+                mip[j, i] = data.ravel()[mask2].max()
+                if not found:
+                    found = True
+            except ValueError:
+                if found:
+                    mip[j, i] = np.nan
+
+    # interpolate nans inside image, do not touch outvals
+    good = ~np.isnan(mip)
+    xp = good.ravel().nonzero()[0]
+    fp = mip[~np.isnan(mip)]
+    x = np.isnan(mip).ravel().nonzero()[0]
+    mip[np.isnan(mip)] = np.interp(x, xp, fp)
+
+    # reset outval to nan
+    mip[mip == np.inf] = np.nan
+
+    return xs, ys, mip
+
+
+def synthetic_sweep(shape=(360, 128), seed=42):
+    """Returns a synthetic reflectivity sweep [dBZ] of given shape."""
+    rng = np.random.RandomState(seed)
+    return rng.uniform(-10, 55, shape)
+
+
+def bench_maximum_intensity_projection(shape=(360, 128), number=3):
+    data = synthetic_sweep(shape)
+    r = np.arange(shape[1]) * 1000.
+    az = np.arange(shape[0]) * 360. / shape[0]
+    print("maximum_intensity_projection, {0} x {1} bins".format(*shape))
+    t = timeit.timeit(lambda: _maximum_intensity_projection(data, r, az,
+                                                            90., 1.5),
+                      number=1)
+    print("    {0:<20s}{1:10.4f} s".format("legacy", t))
+    t = timeit.timeit(lambda: maximum_intensity_projection(data, r, az,
+                                                           90., 1.5),
+                      number=number) / number
+    print("    {0:<20s}{1:10.4f} s".format("vectorized", t))
+
+
+if __name__ == '__main__':
+    bench_maximum_intensity_projection()
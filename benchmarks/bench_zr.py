@@ -0,0 +1,226 @@
+#!/usr/bin/env python
+# Copyright (c) 2017, wradlib developers.
+# Distributed under the MIT License. See LICENSE.txt for more info.
+
+"""
+Benchmarks for wradlib.zr
+=========================
+
+Compares :meth:`wradlib.zr.z2rEnhanced` with the legacy loop based
+implementations of the enhanced Z-R conversion, which are kept here for
+reference only::
+
+    $ python benchmarks/bench_zr.py
+
+"""
+
+import timeit
+
+import numpy as np
+
+import wradlib.zr as zr
+from wradlib.trafo import decibel
+from wradlib.zr import z2r
+
+
+def _z2rEnhanced(z):
+    """Calculates rainrates from radar reflectivities using the enhanced
+    three-part Z-R-relationship used by the DWD (as of 2009).
+
+    This function does the actual calculations without any padding.
+    Neighborhood-means are taken only for available data, reducing the number
+    of elements used near the edges of the array.
+    Refer to the RADOLAN final report or the RADOLAN System handbook for
+    details on the calculations.
+    Basically, for low reflectivities an index called the shower index is
+    calculated as the mean of the differences along both axis in a neighborhood
+    of 3x3 pixels.
+    This means:
+           x-direction -->
+    y |    +---+---+---+
+    | |    | 1 | 2 | 3 |
+    d v    +---+---+---+
+    i      | 4 | 5 | 6 |
+    r      +---+---+---+
+    e      | 7 | 8 | 9 |
+    c      +---+---+---+
+    t
+    i      if 5 is the pixel in question, its shower index is calculated as
+    o      ( |1-2| + |2-3| + |4-5| + |5-6| + |7-8| + |8-9| +
+    n      + |1-4| + |4-7| + |2-5| + |5-8| + |3-6| + |6-9| ) / 12.
+           then, the upper line of the sum would be diffx (DIFFerences in
+           X-direction), the lower line would be diffy
+           (DIFFerences in Y-direction) in the code below.
+    """
+    # get the shape of the input
+    dimy = z.shape[0]
+    dimx = z.shape[1]
+
+    # calculate the decibel values from the input
+    db = decibel(z)
+
+    # set up our output arrays
+    r = np.zeros(z.shape)
+    si = np.zeros(z.shape)
+
+    # calculate difference fields in x and y direction
+    #  mainly for performance reasons, so that we can use numpy's efficient
+    #  array operations and avoid calculating a difference more than once
+    diffx = np.abs(db[:, :-1] - db[:, 1:])
+    diffy = np.abs(db[:-1, :] - db[1:, :])
+
+    # if the reflectivity is larger than 44dBZ, then there is no need to
+    # calculate the shower index
+    gt44 = np.where(db > 44.)
+    r[gt44] = z2r(z[gt44], a=77., b=1.9)
+    # the same is true for values between 36.5 and 44 dBZ
+    bt3644 = np.where(np.logical_and(db >= 36.5, db <= 44.))
+    r[bt3644] = z2r(z[bt3644], a=200., b=1.6)
+
+    # now iterate over the array and look for the remaining values
+    # TODO : this could be a starting point for further optimization, if we
+    #        iterated only over the remaining pixels instead of all
+    for i in range(dimy):
+        for j in range(dimx):
+            # if the reflectivity is too high, we coped with it already
+            # so we can skip that one
+            if db[i, j] >= 36.5:
+                # just set the shower index to some impossible value so that
+                # we know that there was no calculation done here
+                si[i, j] = -1
+                # continue with the next iteration
+                continue
+            else:
+                # calculate the bounds of the region where we have to consider
+                # the respective difference
+                xmin = max(0, j - 1)
+                xmax = min(dimx, j + 1)
+                ymin = max(0, i - 1)
+                ymax = min(dimy, i + 1)
+                # in fact python is quite forgiving with upper indices
+                # ours might go one index too far, so don't try to port this
+                # to another programming language straigt away!
+                diffxcut = diffx[ymin:ymax + 1, xmin:xmax]
+                diffycut = diffy[ymin:ymax, xmin:xmax + 1]
+                # calculate the mean for the current pixel
+                mn = (np.sum(diffxcut) + np.sum(diffycut)) / \
+                     (diffxcut.size + diffycut.size)
+                # apply the three different Z/R relations
+                if mn < 3.5:
+                    r[i, j] = z2r(z[i, j], a=125., b=1.4)
+                elif mn <= 7.5:
+                    r[i, j] = z2r(z[i, j], a=200., b=1.6)
+                else:
+                    r[i, j] = z2r(z[i, j], a=320., b=1.4)
+                # save the shower index
+                si[i, j] = mn
+    # return the results
+    return r, si
+
+
+def _z2rEnhanced_md(z):
+    """multidimensional version
+    assuming the two last dimensions represent an image
+    This version should also be a bit more performant than the original because
+    it uses less for-loops"""
+    # get the shape of the input
+    dimy = z.shape[-2]
+    dimx = z.shape[-1]
+
+    # calculate the decibel values from the input
+    db = decibel(z)
+
+    # set up our output arrays
+    r = np.zeros(z.shape)
+    si = np.zeros(z.shape)
+
+    # calculate difference fields in x and y direction
+    #  mainly for performance reasons, so that we can use numpy's efficient
+    #  array operations and avoid calculating a difference more than once
+    diffx = np.abs(db[..., :, :-1] - db[..., :, 1:])
+    diffy = np.abs(db[..., :-1, :] - db[..., 1:, :])
+
+    # if the reflectivity is larger than 44dBZ, then there is no need to
+    # calculate the shower index
+    gt44 = db > 44.
+    r[gt44] = z2r(z[gt44], a=77, b=1.9)
+    si[gt44] = -1
+    # the same is true for values between 36.5 and 44 dBZ
+    bt3644 = (db >= 36.5) & (db <= 44.)
+    r[bt3644] = z2r(z[bt3644], a=200, b=1.6)
+    si[bt3644] = -1
+
+    # now iterate only over remaining pixels
+    wlt36 = np.where(db < 36.5)
+    # nlt36 = len(wlt36[0])
+    for indices in zip(*wlt36):
+        # x and y-indices
+        i = indices[-2]
+        j = indices[-1]
+        # all remaining dimensional indices
+        ridx = indices[:-2]
+        # calculate the bounds of the region where we have to consider
+        # the respective difference
+        xmin = max(0, j - 1)
+        xmax = min(dimx, j + 1)
+        ymin = max(0, i - 1)
+        ymax = min(dimy, i + 1)
+        # in fact python is quite forgiving with upper indices
+        # ours might go one index too far, so don't try to port this
+        # to another programming language straigt away!
+        diffxcut = diffx[ridx, ymin:ymax + 1, xmin:xmax]
+        diffycut = diffy[ridx, ymin:ymax, xmin:xmax + 1]
+        # calculate the mean for the current pixel
+        mn = (np.sum(diffxcut) + np.sum(diffycut)) / \
+             (diffxcut.size + diffycut.size)
+        # apply the three different Z/R relations
+        if mn < 3.5:
+            r[ridx, i, j] = z2r(z[ridx, i, j], a=125, b=1.4)
+        elif mn <= 7.5:
+            r[ridx, i, j] = z2r(z[ridx, i, j], a=200, b=1.6)
+        else:
+            r[ridx, i, j] = z2r(z[ridx, i, j], a=320, b=1.4)
+        # save the shower index
+        si[ridx, i, j] = mn
+    # return the results
+    return r, si
+
+
+def _z2rEnhanced_padded(z):
+    """Legacy `z2rEnhanced`, pads the cyclical dimension and calls
+    `_z2rEnhanced`."""
+    padz = np.zeros((z.shape[0] + 2, z.shape[1]))
+    padz[1:-1, :] = z
+    padz[0, :] = z[-1, :]
+    padz[-1, :] = z[0, :]
+    padr, padsi = _z2rEnhanced(padz)
+    return padr[1:-1, :], padsi[1:-1, :]
+
+
+def synthetic_z(shape=(360, 128), seed=42):
+    """Returns synthetic reflectivities [mm**6/m**3] of given shape."""
+    rng = np.random.RandomState(seed)
+    db = rng.uniform(-10, 55, shape)
+    db[rng.uniform(0, 1, shape) < 0.3] = 0.
+    return 10. ** (db / 10.)
+
+
+def bench_z2rEnhanced(shape=(360, 128), ntimes=12, number=3):
+    z = synthetic_z(shape)
+    print("z2rEnhanced, {0} x {1} bins".format(*shape))
+    t = timeit.timeit(lambda: _z2rEnhanced_padded(z), number=1)
+    print("    {0:<20s}{1:10.4f} s".format("legacy", t))
+    t = timeit.timeit(lambda: zr.z2rEnhanced(z), number=number) / number
+    print("    {0:<20s}{1:10.4f} s".format("float64", t))
+    t = timeit.timeit(lambda: zr.z2rEnhanced(z, dtype=np.float32),
+                      number=number) / number
+    print("    {0:<20s}{1:10.4f} s".format("float32", t))
+    stack = synthetic_z((ntimes,) + tuple(shape))
+    out = np.empty(stack.shape, dtype=np.float32)
+    t = timeit.timeit(lambda: zr.z2rEnhanced(stack, out=out),
+                      number=number) / number
+    print("    {0:<20s}{1:10.4f} s".format("float32, %d times" % ntimes, t))
+
+
+if __name__ == '__main__':
+    bench_z2rEnhanced()
@@ -144,9 +144,29 @@ def configuration(parent_package='', top_path=None):
     config.add_subpackage('wradlib.io')
     config.add_subpackage('wradlib.georef')
 
+    # the Fortran speedup module is optional, wradlib falls back to
+    # pure NumPy implementations if it is not available
+    if have_fortran_compiler():
+        config.add_extension('wradlib.speedup',
+                             sources=['wradlib/speedup.f'])
+
     return config
 
 
+def have_fortran_compiler():
+    """Checks for a working Fortran compiler (can be switched off by
+    setting the environment variable WRADLIB_NO_SPEEDUP)."""
+    if os.environ.get('WRADLIB_NO_SPEEDUP'):
+        return False
+    from numpy.distutils.fcompiler import new_fcompiler
+    try:
+        fcompiler = new_fcompiler()
+        fcompiler.customize()
+        return fcompiler.get_version() is not None
+    except Exception:
+        return False
+
+
 def setup_package():
     # rewrite version file
     write_version_py()
@@ -165,6 +165,15 @@ class AdjustBase(ipol.IpolBase):
     Ipclass : an interpolation class from wradib.ipol
         **Not used for AdjustMFB** - default value is wradlib.ipol.Idw
         (Inverse Distance Weighting).
+    cache_size : integer
+        Defaults to 16. Maximum number of interpolators for subsets of valid
+        gauges which are kept in order to be reused, the least recently
+        used ones are discarded first. Interpolators of subsets of
+        wradlib.ipol.Idw are derived from the default interpolator instead
+        of being set up anew.
+    cache_memory : integer
+        Defaults to 2**30 (1 GiB). Maximum memory (in bytes) of the arrays
+        held by the cached interpolators, None for no limit.
     ipargs : keyword arguments to create an instance of Ipclass
         **Not used for AdjustMFB** - for wradlib.ipol.Idw, these keyword
         arguments would e.g. be nnear or p.
@@ -175,10 +184,14 @@ class AdjustBase(ipol.IpolBase):
     See :ref:`notebooks/multisensor/wradlib_adjust_example.ipynb`.
 
     """
+    # whether the adjustment applies pointwise to the interpolated error
+    # fields, which allows for vectorized cross validation
+    _pointwise = False
 
     def __init__(self, obs_coords, raw_coords,
                  nnear_raws=9, stat='median', mingages=5, minval=0.,
-                 mfb_args=None, Ipclass=ipol.Idw, **ipargs):
+                 mfb_args=None, Ipclass=ipol.Idw, cache_size=16,
+                 cache_memory=2 ** 30, **ipargs):
 
         # Check arguments
         if mfb_args is None:
@@ -211,6 +224,8 @@ class AdjustBase(ipol.IpolBase):
         self.ipargs = ipargs
         # create a default instance of interpolator
         self.ip = Ipclass(src=self.obs_coords, trg=self.raw_coords, **ipargs)
+        # interpolators by subset of valid gauges
+        self.ipcache = ipol._LRUCache(cache_size, cache_memory)
 
         # This method will quickly retrieve the actual radar values
         # at the gage locations
@@ -231,7 +246,9 @@ class AdjustBase(ipol.IpolBase):
         instance is called in the sourse of cross validation), a new instance
         has to be created which consideres the new constellation of
         observation-radar pairs.
-        This method computes and returns this new instance.
+        This method computes and returns this new instance. The instances
+        for the radar coordinates are cached by subset of valid observation
+        points.
 
         Parameters
         ----------
@@ -239,7 +256,9 @@ class AdjustBase(ipol.IpolBase):
             These are the indices of observation points with valid
             observation-radar pairs
         targets : array of floats of shape (number of target points, 2)
-            Target coordinates for the interpolation
+            Target coordinates for the interpolation, or an interpolator
+            from the observation points *ix* to the targets, which is
+            returned as is
 
         Returns
         -------
@@ -247,35 +266,52 @@ class AdjustBase(ipol.IpolBase):
             wradlib.ipol.IpolBase
 
         """
+        if isinstance(targets, ipol.IpolBase):
+            return targets
         #    first, set interpolation targets (default: the radar coordinates)
         targets_default = False
         if targets is None:
             targets = self.raw_coords
             targets_default = True
         # second, compute inverse distance neighbours
-        if (not len(ix) == len(self.obs_coords)) or (not targets_default):
+        if not targets_default:
             return self.Ipclass(self.obs_coords[ix], targets, **self.ipargs)
-        else:
+        elif len(ix) == len(self.obs_coords):
             return self.ip
+        elif hasattr(self.ip, 'subset'):
+            return self.ipcache.get(b'ip' + np.asarray(ix).tobytes(),
+                                    lambda: self.ip.subset(ix))
+        else:
+            return self.ipcache.get(b'ip' + np.asarray(ix).tobytes(),
+                                    lambda: self.Ipclass(self.obs_coords[ix],
+                                                         targets,
+                                                         **self.ipargs))
 
     def __call__(self, obs, raw, targets=None, rawatobs=None, ix=None):
         """Returns an array of *raw* values that are adjusted by *obs*.
 
+        .. versionchanged:: 0.12.0
+           Accept stacks of time steps.
+
         Parameters
         ----------
         obs : flat (1-D) array of floats with shape (num gauges,)
             These are the gage observations used for adjustment. This array
             needs to be of the same length as the array "obs_coords" used to
-            initialize the adjustmetn object.
+            initialize the adjustmetn object. Stacks of time steps of shape
+            (num time steps, num gauges) are adjusted at once, see
+            :meth:`~wradlib.adjust.AdjustBase._call_stack`.
         raw : flat (1-D) array of floats with shape (num radar cells,)
             These are the raw (unadjusted) radar rainfall values. This array
             needs to be of the same length as the array "raw_coords" used to
-            initialize the adjustment object.
+            initialize the adjustment object. Stacks of time steps are of
+            shape (num time steps, num radar cells).
         targets : (INTERNAL - DO NOT USE)
             Array of floats. Coordinate pairs for locations on which the final
             adjustment product is interpolated
             Defaults to None. In this case, the output locations will be
-            identical to the radar coordinates
+            identical to the radar coordinates. For internal use from
+            AdjustBase.xvalidate, this might also be an interpolator instance.
         rawatobs : (INTERNAL - DO NOT USE)
             Array of floats. For internal use from AdjustBase.xvalidate only
             (defaults to None)
@@ -286,6 +322,48 @@ class AdjustBase(ipol.IpolBase):
         """
         pass
 
+    def _call_stack(self, obs, raw):
+        """INTERNAL: Adjusts stacks of time steps.
+
+        The raw values at the observation points are retrieved for all time
+        steps at once. The time steps are grouped by their set of valid
+        observation-radar pairs, and the time steps of each group are
+        adjusted at once using the same interpolator (except for the classes
+        which do not interpolate error fields, e.g. AdjustMFB).
+
+        Parameters
+        ----------
+        obs : array of floats of shape (num time steps, num gauges)
+        raw : array of floats of shape (num time steps, num radar cells)
+
+        Returns
+        -------
+        output : array of adjusted radar values of shape
+            (num time steps, num radar cells)
+
+        """
+        obs = np.asanyarray(obs)
+        raw = np.asanyarray(raw)
+        assert raw.ndim == 2 and len(raw) == len(obs), \
+            'raw must be of shape (num time steps, num radar cells).'
+        if not self._pointwise:
+            return np.array([self.__call__(o, r) for o, r in zip(obs, raw)])
+        # time steps along the last axis
+        obs = obs.T
+        raw = raw.T
+        rawatobs = self.get_raw_at_obs(raw, obs)
+        valid = ~(util._isinvalid(obs, minval=self.minval) |
+                  util._isinvalid(rawatobs, minval=self.minval))
+        patterns, inverse = np.unique(valid.T, axis=0, return_inverse=True)
+        inverse = inverse.ravel()
+        out = np.empty(raw.shape[::-1])
+        for i, pattern in enumerate(patterns):
+            cols = np.flatnonzero(inverse == i)
+            out[cols] = self.__call__(obs[:, cols], raw[:, cols],
+                                      rawatobs=rawatobs[:, cols],
+                                      ix=np.flatnonzero(pattern)).T
+        return out
+
     def _check_shape(self, obs, raw):
         """INTERNAL: Check consistency of the input data obs and raw with
         the shapes of the coordinates
@@ -314,13 +392,26 @@ class AdjustBase(ipol.IpolBase):
         This way, the actual adjustment procedure has only to be defined *once*
         in the __call__ method.
 
+        For the adjustment classes which interpolate error fields
+        (AdjustAdd, AdjustMultiply, AdjustMixed, GageOnly), the
+        estimates at all observation points are computed at once by means of
+        :func:`wradlib.ipol.leave_one_out`, which is set up only once per
+        set of valid observations and cached like the interpolators of
+        :meth:`~wradlib.adjust.AdjustBase._checkip`. Otherwise, the
+        adjustment is repeated for each observation point.
+
         The output of this method can be evaluated by using the
         `verify.ErrorMetrics` class.
 
+        .. versionchanged:: 0.12.0
+           Vectorized cross validation, accepts stacks of time steps.
+
         Parameters
         ----------
         obs : array of floats
+            of shape (num gauges,) or (num time steps, num gauges)
         raw : array of floats
+            of shape (num radar cells,) or (num time steps, num radar cells)
 
         Returns
         -------
@@ -330,10 +421,24 @@ class AdjustBase(ipol.IpolBase):
         estatobs : array of floats
             estimated values at the valid observation locations
 
+        """
+        obs = np.asanyarray(obs)
+        raw = np.asanyarray(raw)
+        if getattr(self, 'get_raws_directly_at_obs', None) is None:
+            self.get_raws_directly_at_obs = Raw_at_obs(self.obs_coords,
+                                                       self.raw_coords,
+                                                       nnear=1)
+        if obs.ndim == 1:
+            return obs, self._xvalidate(obs, raw)
+        estatobs = np.zeros(obs.shape) * np.nan
+        for i in range(len(obs)):
+            estatobs[i] = self._xvalidate(obs[i], raw[i])
+        return obs, estatobs
+
+    def _xvalidate(self, obs, raw):
+        """INTERNAL: Leave-One-Out Cross Validation of one time step.
         """
         rawatobs, ix = self._get_valid_pairs(obs, raw)
-        self.get_raws_directly_at_obs = Raw_at_obs(self.obs_coords,
-                                                   self.raw_coords, nnear=1)
         raws_directly_at_obs = self.get_raws_directly_at_obs(raw)
         ix = np.intersect1d(ix, util._idvalid(raws_directly_at_obs,
                                               minval=self.minval))
@@ -342,7 +447,20 @@ class AdjustBase(ipol.IpolBase):
         # check whether enough gages remain for adjustment
         if len(ix) <= (self.mingages - 1):
             # not enough gages for cross validation: return empty arrays
-            return obs, estatobs
+            return estatobs
+        if self._pointwise:
+            if len(ix) - 1 < self.mingages:
+                # not enough gages for adjustment when leaving one out
+                estatobs[ix] = raws_directly_at_obs[ix]
+                return estatobs
+            loo = self.ipcache.get(
+                b'loo' + ix.tobytes(),
+                lambda: ipol.leave_one_out(self.obs_coords[ix],
+                                           self.Ipclass, **self.ipargs))
+            estatobs[ix] = np.reshape(
+                self.__call__(obs, raws_directly_at_obs[ix], loo,
+                              rawatobs, ix), -1)
+            return estatobs
         # Now iterate over valid pairs
         for i in ix:
             # Pass all valid pairs except ONE which you pass as target
@@ -350,7 +468,7 @@ class AdjustBase(ipol.IpolBase):
             estatobs[i] = self.__call__(obs, raws_directly_at_obs[i],
                                         self.obs_coords[i].reshape((1, -1)),
                                         rawatobs, ix_adjust)
-        return obs, estatobs
+        return estatobs
 
 
 class AdjustAdd(AdjustBase):
@@ -382,6 +500,8 @@ class AdjustAdd(AdjustBase):
 
     """
 
+    _pointwise = True
+
     def __call__(self, obs, raw, targets=None, rawatobs=None, ix=None):
         """Returns an array of *raw* values that are adjusted by *obs*.
 
@@ -391,7 +511,10 @@ class AdjustAdd(AdjustBase):
 
         """
         # ----------------GENERIC PART FOR MOST __call__ methods---------------
-        if None in [ix, rawatobs]:
+        if ix is None or rawatobs is None:
+            if np.ndim(obs) == 2:
+                # stacks of time steps
+                return self._call_stack(obs, raw)
             # Check for valid observation-radar pairs in case this method has
             # not been called from self.xvalidate
             rawatobs, ix = self._get_valid_pairs(obs, raw)
@@ -439,6 +562,8 @@ class AdjustMultiply(AdjustBase):
 
     """
 
+    _pointwise = True
+
     def __call__(self, obs, raw, targets=None, rawatobs=None, ix=None):
         """Returns an array of *raw* values that are adjusted by *obs*.
 
@@ -448,7 +573,10 @@ class AdjustMultiply(AdjustBase):
 
         """
         # ----------------GENERIC PART FOR MOST __call__ methods---------------
-        if None in [ix, rawatobs]:
+        if ix is None or rawatobs is None:
+            if np.ndim(obs) == 2:
+                # stacks of time steps
+                return self._call_stack(obs, raw)
             # Check for valid observation-radar pairs in case this method has
             # not been called from self.xvalidate
             rawatobs, ix = self._get_valid_pairs(obs, raw)
@@ -522,6 +650,8 @@ class AdjustMixed(AdjustBase):
 
     """
 
+    _pointwise = True
+
     def __call__(self, obs, raw, targets=None, rawatobs=None, ix=None):
         """Returns an array of *raw* values that are adjusted by *obs*.
 
@@ -531,7 +661,10 @@ class AdjustMixed(AdjustBase):
 
         """
         # ----------------GENERIC PART FOR MOST __call__ methods---------------
-        if None in [ix, rawatobs]:
+        if ix is None or rawatobs is None:
+            if np.ndim(obs) == 2:
+                # stacks of time steps
+                return self._call_stack(obs, raw)
             # Check for valid observation-radar pairs in case this method has
             # not been called from self.xvalidate
             rawatobs, ix = self._get_valid_pairs(obs, raw)
@@ -587,7 +720,10 @@ class AdjustMFB(AdjustBase):
 
         """
         # ----------------GENERIC PART FOR MOST __call__ methods---------------
-        if None in [ix, rawatobs]:
+        if ix is None or rawatobs is None:
+            if np.ndim(obs) == 2:
+                # stacks of time steps
+                return self._call_stack(obs, raw)
             # Check for valid observation-radar pairs in case this method has
             # not been called from self.xvalidate
             rawatobs, ix = self._get_valid_pairs(obs, raw)
@@ -664,7 +800,10 @@ class AdjustNone(AdjustBase):
 
         """
         # ----------------GENERIC PART FOR MOST __call__ methods---------------
-        if None in [ix, rawatobs]:
+        if ix is None or rawatobs is None:
+            if np.ndim(obs) == 2:
+                # stacks of time steps
+                return self._call_stack(obs, raw)
             # Check for valid observation-radar pairs in case this method has
             # not been called from self.xvalidate
             rawatobs, ix = self._get_valid_pairs(obs, raw)
@@ -703,6 +842,8 @@ class GageOnly(AdjustBase):
     output : array of adjusted radar values
     """
 
+    _pointwise = True
+
     def __call__(self, obs, raw, targets=None, rawatobs=None, ix=None):
         """Returns an array of *raw* values that are adjusted by *obs*.
 
@@ -712,7 +853,10 @@ class GageOnly(AdjustBase):
 
         """
         # ----------------GENERIC PART FOR MOST __call__ methods---------------
-        if None in [ix, rawatobs]:
+        if ix is None or rawatobs is None:
+            if np.ndim(obs) == 2:
+                # stacks of time steps
+                return self._call_stack(obs, raw)
             # Check for valid observation-radar pairs in case this method has
             # not been called from self.xvalidate
             rawatobs, ix = self._get_valid_pairs(obs, raw)
@@ -756,7 +900,11 @@ class Raw_at_obs():
         Parameters
         ----------
         raw : array of float
-            raw values
+            raw values of shape (num raw points, ...), e.g. with time steps
+            along further axes
+        obs : array of float
+            observations of shape (num observation points, ...), only used
+            for stat='best'
 
         """
         # get the values of the raw neighbours of obs
@@ -765,7 +913,7 @@ class Raw_at_obs():
         # by using a statistics option
         # (only needed in case nnear > 1, i.e. multiple neighbours
         # per observation location)
-        if raw_neighbs.ndim > 1:
+        if self.raw_ix.ndim > 1:
             return self.statfunc(obs, raw_neighbs)
         else:
             return raw_neighbs
@@ -849,16 +997,28 @@ def best(x, y):
 
     If x is an array, the comparison is carried out for each element of x
 
+    .. versionchanged:: 0.12.0
+       Accept trailing dimensions (e.g. time steps).
+
     Parameters
     ----------
-    x : float or 1-d array of float
-    y : array of float
+    x : float or array of float with shape (n, ...)
+    y : array of float with shape (n, m, ...)
 
     Returns
     -------
-    output : 1-d array of float with length len(y)
+    output : array of float with shape (n, ...)
 
     """
+    if isinstance(y, np.ndarray) and y.ndim > 2:
+        x = np.asanyarray(x)
+        assert x.shape == y.shape[:1] + y.shape[2:], \
+            'Shape of x must correspond to shape of y without second axis.'
+        ix = np.argmin(np.abs(x[:, np.newaxis] - y), axis=1)
+        out = y[:, 0]
+        for i in range(1, y.shape[1]):
+            out = np.where(ix == i, y[:, i], out)
+        return out
     if type(x) == np.ndarray:
         assert x.ndim == 1, 'x must be a 1-d array of floats or a float.'
         assert len(x) == len(y), 'Length of x and y must be equal.'
@@ -16,6 +16,7 @@ Clutter Identification
    filter_cloudtype
    filter_window_distance
    histo_cut
+   ClutterMap
    classify_echo_fuzzy
 
 """
@@ -35,7 +36,8 @@ def filter_gabella_a(img, wsize, tr1, cartesian=False, radial=False):
     Parameters
     ----------
     img : array_like
-        radar image to which the filter is to be applied
+        radar image to which the filter is to be applied, or a stack of
+        images with shape (..., number of beams, number of range bins)
     wsize : int
         Size of the window surrounding the central pixel
     tr1 : float
@@ -61,22 +63,33 @@ def filter_gabella_a(img, wsize, tr1, cartesian=False, radial=False):
     See :ref:`notebooks/classify/wradlib_clutter_gabella_example.ipynb`.
 
     """
+    img = np.asanyarray(img)
     nn = wsize // 2
-    count = -np.ones(img.shape, dtype=int)
+    naz, nr = img.shape[-2:]
     range_shift = range(-nn, nn + 1)
     azimuth_shift = range(-nn, nn + 1)
     if radial:
         azimuth_shift = [0]
+    # pad (wrapping around) instead of rolling, the shifted images
+    # are then just views into the padded image
+    na = max(azimuth_shift)
+    pad = [(0, 0)] * (img.ndim - 2) + [(na, na), (nn, nn)]
+    padded = np.pad(img, pad, mode='wrap')
+    count = -np.ones(img.shape, dtype=int)
+    # img - ref < tr1 is evaluated as ref > img - tr1
+    thrs = img - tr1
+    below = np.empty(img.shape, dtype=bool)
     for sa in azimuth_shift:
-        refa = np.roll(img, sa, axis=0)
         for sr in range_shift:
-            refr = np.roll(refa, sr, axis=1)
-            count += (img - refr < tr1)
-    count[:, 0:nn] = wsize ** 2
-    count[:, -nn:] = wsize ** 2
+            ref = padded[..., na + sa:na + sa + naz, nn + sr:nn + sr + nr]
+            with np.errstate(invalid='ignore'):
+                np.greater(ref, thrs, out=below)
+            count += below
+    count[..., 0:nn] = wsize ** 2
+    count[..., -nn:] = wsize ** 2
     if cartesian:
-        count[0:nn, :] = wsize ** 2
-        count[-nn:, :] = wsize ** 2
+        count[..., 0:nn, :] = wsize ** 2
+        count[..., -nn:, :] = wsize ** 2
     return count
 
 
@@ -223,6 +236,9 @@ def histo_cut(prec_accum):
     """
 
     prec_accum = np.array(prec_accum)
+    # the histograms are computed from the valid values only instead of
+    # masked copies of the whole field
+    values = prec_accum[np.isfinite(prec_accum)]
 
     # initialization of data bounds for clutter and shade definition
     lower_bound = 0
@@ -237,18 +253,12 @@ def histo_cut(prec_accum):
     while (abs(lower_bound - lower_bound_before) > 1) or \
             (abs(upper_bound - upper_bound_before) > 1):
 
-        # masks for bins with sums over/under the data bounds
-        upper_mask = (prec_accum <= upper_bound).astype(int)
-        lower_mask = (prec_accum >= lower_bound).astype(int)
-        # NaNs in place of masked bins
-        # Kopie der Datenmatrix mit Nans an Stellen,
-        # wo der Threshold erreicht wird
-        prec_accum_masked = np.where((upper_mask * lower_mask) == 0,
-                                     np.nan, prec_accum)
+        # bounds of the valid bins within the data bounds
+        mask_bounds = (lower_bound, upper_bound)
+        values = values[(values >= lower_bound) & (values <= upper_bound)]
 
         # generate a histogram of the valid bins with 50 classes
-        (n, bins) = np.histogram(prec_accum_masked[np.isfinite(
-            prec_accum_masked)].ravel(), bins=50)
+        (n, bins) = np.histogram(values, bins=50)
         # get the class with biggest occurence
         index = np.where(n == n.max())
         index = index[0][0]
@@ -275,10 +285,242 @@ def histo_cut(prec_accum):
         lower_bound = bins[i]
         upper_bound = bins[j + 1]
 
-    return np.isnan(prec_accum_masked)
+    # bins outside the bounds of the last iteration (and NaNs)
+    with np.errstate(invalid='ignore'):
+        inside = (prec_accum >= mask_bounds[0]) & \
+                 (prec_accum <= mask_bounds[1])
+    return ~inside
+
+
+class ClutterMap():
+    """
+    ClutterMap(shape, threshold=0., edges=None)
+
+    Incremental static clutter map.
+
+    Sweeps are folded in one at a time with :meth:`update`. The map keeps
+    running sums, counts of valid values and counts of values exceeding
+    `threshold` per bin, so its memory footprint only depends on the
+    number of bins and not on the number of sweeps. A static clutter mask
+    compatible with :func:`histo_cut` can be derived at any moment with
+    :meth:`histo_cut`. The state can be stored with :meth:`save` and
+    restored with :meth:`load`, so a map can be refreshed with new data
+    without reprocessing the past.
+
+    .. versionadded:: 0.12.0
 
+    Parameters
+    ----------
+    shape : tuple
+        shape of the sweeps, e.g. (n azimuth angles, n range gates)
+    threshold : float
+        values above this threshold are counted as exceedance
+    edges : array_like
+        monotonically increasing class edges of an optional per-bin
+        histogram, which is used to estimate quantiles with
+        :meth:`quantile`. Values outside the edges are counted in the first
+        or last class. Requires len(edges) - 1 counters per bin.
+
+    Examples
+    --------
+    >>> import wradlib
+    >>> import numpy as np
+    >>> cmap = wradlib.clutter.ClutterMap((360, 100))
+    >>> for i in range(10):
+    ...     cmap = cmap.update(np.random.uniform(0, 1, (360, 100)))
+    >>> cmap.nsweeps
+    10
+    >>> cmap.histo_cut().shape
+    (360, 100)
 
-def classify_echo_fuzzy(dat, weights=None, trpz=None, thresh=0.5):
+    """
+
+    def __init__(self, shape, threshold=0., edges=None):
+        self.shape = tuple(shape)
+        self.threshold = threshold
+        if edges is not None:
+            edges = np.asarray(edges, dtype=float)
+            assert edges.ndim == 1 and len(edges) > 1, \
+                "Parameter `edges` must be a 1d array with at least 2 edges."
+            assert np.all(np.diff(edges) > 0), \
+                "Parameter `edges` must be monotonically increasing."
+        self.edges = edges
+        self.reset()
+
+    def reset(self):
+        """
+        Reset all counters.
+        """
+        self.nsweeps = 0
+        self._sum = np.zeros(self.shape, dtype=np.float64)
+        self._valid = np.zeros(self.shape, dtype=np.int64)
+        self._exceed = np.zeros(self.shape, dtype=np.int64)
+        if self.edges is None:
+            self._hist = None
+        else:
+            self._hist = np.zeros((len(self.edges) - 1,) + self.shape,
+                                  dtype=np.int64)
+
+    def update(self, data):
+        """
+        Fold in one sweep or a stack of sweeps.
+
+        Parameters
+        ----------
+        data : array_like
+            sweep of shape :attr:`shape` or stack of sweeps with shape
+            (..., ) + :attr:`shape`. NaNs are ignored.
+
+        Returns
+        -------
+        self : :class:`ClutterMap`
+        """
+        data = np.asanyarray(data, dtype=float)
+        ndim = len(self.shape)
+        assert data.shape[data.ndim - ndim:] == self.shape, \
+            "Shape of `data` does not match the shape of the clutter map."
+        data = data.reshape((-1,) + self.shape)
+        valid = np.isfinite(data)
+        self._sum += np.where(valid, data, 0.).sum(axis=0)
+        self._valid += valid.sum(axis=0)
+        with np.errstate(invalid='ignore'):
+            self._exceed += (data > self.threshold).sum(axis=0)
+        if self._hist is not None:
+            nclass = len(self.edges) - 1
+            nbins = self._sum.size
+            idx = np.searchsorted(self.edges, data, side='right') - 1
+            np.clip(idx, 0, nclass - 1, out=idx)
+            # flat index class * nbins + bin of every valid value
+            idx *= nbins
+            idx += np.arange(nbins).reshape(self.shape)
+            counts = np.bincount(idx[valid], minlength=nclass * nbins)
+            self._hist += counts.reshape(self._hist.shape)
+        self.nsweeps += len(data)
+        return self
+
+    @property
+    def accumulation(self):
+        """
+        Accumulated values per bin.
+        """
+        return self._sum.copy()
+
+    @property
+    def count(self):
+        """
+        Number of valid values per bin.
+        """
+        return self._valid.copy()
+
+    @property
+    def mean(self):
+        """
+        Mean value per bin, NaN for bins without valid values.
+        """
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(self._valid > 0, self._sum / self._valid, np.nan)
+
+    @property
+    def frequency(self):
+        """
+        Relative frequency of values exceeding :attr:`threshold` per bin,
+        NaN for bins without valid values.
+        """
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(self._valid > 0, self._exceed / self._valid,
+                            np.nan)
+
+    def quantile(self, q):
+        """
+        Estimate quantiles per bin from the per-bin histogram.
+
+        The quantiles are linearly interpolated within the histogram classes.
+
+        Parameters
+        ----------
+        q : float
+            quantile, 0 <= q <= 1
+
+        Returns
+        -------
+        output : array
+            quantile per bin, NaN for bins without valid values
+        """
+        assert self._hist is not None, \
+            "Quantiles require the class `edges` of the clutter map."
+        assert 0 <= q <= 1, "Parameter `q` must be between 0 and 1."
+        hist = self._hist.reshape(len(self._hist), -1)
+        cum = np.cumsum(hist, axis=0)
+        total = cum[-1]
+        target = q * total
+        # first class where the cumulative count reaches the target
+        j = np.argmax(cum >= np.maximum(target, 1), axis=0)
+        k = np.arange(hist.shape[1])
+        below = np.where(j > 0, cum[j - 1, k], 0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            frac = np.clip((target - below) / hist[j, k], 0, 1)
+        left = self.edges[j]
+        out = left + frac * (self.edges[j + 1] - left)
+        out[total == 0] = np.nan
+        return out.reshape(self.shape)
+
+    def histo_cut(self):
+        """
+        Static clutter mask of the current accumulation.
+
+        Returns
+        -------
+        output : array
+            boolean array with pixels identified as clutter/shadings set to
+            True, see :func:`histo_cut`.
+        """
+        return histo_cut(self._sum)
+
+    def save(self, filename):
+        """
+        Save the state of the clutter map to a numpy `.npz` file.
+
+        Parameters
+        ----------
+        filename : string
+            name of the output file
+        """
+        state = dict(shape=np.array(self.shape), threshold=self.threshold,
+                     nsweeps=self.nsweeps, sum=self._sum, valid=self._valid,
+                     exceed=self._exceed)
+        if self._hist is not None:
+            state.update(edges=self.edges, hist=self._hist)
+        np.savez_compressed(filename, **state)
+
+    @classmethod
+    def load(cls, filename):
+        """
+        Restore a clutter map saved with :meth:`save`.
+
+        Parameters
+        ----------
+        filename : string
+            name of the `.npz` file
+
+        Returns
+        -------
+        output : :class:`ClutterMap`
+        """
+        with np.load(filename) as state:
+            edges = state['edges'] if 'edges' in state.files else None
+            cmap = cls(tuple(state['shape']), float(state['threshold']),
+                       edges=edges)
+            cmap.nsweeps = int(state['nsweeps'])
+            cmap._sum[:] = state['sum']
+            cmap._valid[:] = state['valid']
+            cmap._exceed[:] = state['exceed']
+            if edges is not None:
+                cmap._hist[:] = state['hist']
+        return cmap
+
+
+def classify_echo_fuzzy(dat, weights=None, trpz=None, thresh=0.5,
+                        fused=False):
     """Fuzzy echo classification and clutter identification based on \
     polarimetric moments.
 
@@ -321,6 +563,13 @@ def classify_echo_fuzzy(dat, weights=None, trpz=None, thresh=0.5):
     thresh : float
        Threshold below which membership in non-meteorological membership class
        is assumed.
+    fused : boolean
+       If True, the membership functions are evaluated in float32 and their
+       weighted sum is accumulated in place, without allocating separate
+       membership and weight arrays for each decision variable. The texture
+       of an array which is used for several decision variables is only
+       computed once. The input dictionary is not modified in this mode.
+       Results may differ from the default mode within float32 precision.
 
     Returns
     -------
@@ -371,6 +620,9 @@ def classify_echo_fuzzy(dat, weights=None, trpz=None, thresh=0.5):
         else:
             print("WARNING: Missing decision variable: %s" % key)
 
+    if fused:
+        return _classify_echo_fuzzy_fused(dat, weights, trpz, thresh)
+
     # If all dual-pol moments are NaN, can we assume that and echo is
     # non-meteorological?
     # Successively identify those bins where all moments are NaN
@@ -430,6 +682,93 @@ def classify_echo_fuzzy(dat, weights=None, trpz=None, thresh=0.5):
     return np.where(Q < thresh, True, False), nan_mask
 
 
+def _classify_echo_fuzzy_fused(dat, weights, trpz, thresh):
+    """Fused evaluation of :meth:`~wradlib.clutter.classify_echo_fuzzy`.
+    """
+    arrays = [np.asanyarray(dat[key]) for key in dat.keys()
+              if dat[key] is not None]
+    shape = np.broadcast(*arrays).shape
+
+    nan_mask = np.isnan(dat["rho"])
+    nan_mask &= np.isnan(dat["zdr"])
+    nan_mask &= np.isnan(dat["phi"])
+
+    # textures, computed only once per array
+    textures = {}
+
+    def _texture(data):
+        if id(data) not in textures:
+            textures[id(data)] = dp.texture(data).astype(np.float32)
+        return textures[id(data)]
+
+    # decision variables (texture is applied to the data if True)
+    variables = [("map", "map", False),
+                 ("dop", "dop", False),
+                 ("zdr", "zdr", True),
+                 ("rho", "rho", True),
+                 ("phi", "phi", True),
+                 ("rho2", "rho", False)]
+
+    # accumulate weighted membership in meteorological class and weights,
+    # the sums are kept in float64 to avoid spurious threshold crossings
+    num = np.zeros(shape)
+    den = np.zeros(shape)
+    wq = np.empty(shape)
+    q = np.empty(shape, dtype=np.float32)
+    tmp = np.empty(shape, dtype=np.float32)
+    valid = np.empty(shape, dtype=bool)
+    for wkey, dkey, use_texture in variables:
+        data = dat[dkey]
+        if data is None:
+            continue
+        if use_texture:
+            data = _texture(data)
+        data = np.broadcast_to(np.asanyarray(data, dtype=np.float32), shape)
+        # non-meteorological membership
+        _trapezoid_into(data, trpz[wkey], q, tmp)
+        np.isnan(q, out=valid)
+        np.logical_not(valid, out=valid)
+        # weighted meteorological membership
+        np.subtract(1., q, out=q)
+        np.multiply(q, weights[wkey], out=wq, dtype=np.float64)
+        np.add(num, wq, out=num, where=valid)
+        np.add(den, weights[wkey], out=den, where=valid)
+
+    # Membership in meteorological class after combining all variables
+    with np.errstate(invalid='ignore', divide='ignore'):
+        np.divide(num, den, out=num)
+        return np.less(num, thresh), nan_mask
+
+
+def _trapezoid_into(data, trpz, out, tmp):
+    """Evaluates :meth:`wradlib.util.trapezoid` into `out`, using `tmp` as
+    scratch buffer.
+
+    The trapezoid is evaluated as the minimum of the rising and falling edge,
+    clipped to [0, 1].
+    """
+    x1, x2, x3, x4 = trpz
+    with np.errstate(invalid='ignore'):
+        # rising edge
+        if x2 > x1:
+            np.subtract(data, x1, out=out)
+            np.divide(out, float(x2 - x1), out=out)
+        else:
+            out[...] = -np.inf
+            out[data >= x2] = np.inf
+        # falling edge
+        if x4 > x3:
+            np.subtract(x4, data, out=tmp)
+            np.divide(tmp, float(x4 - x3), out=tmp)
+        else:
+            tmp[...] = -np.inf
+            tmp[data <= x3] = np.inf
+        np.minimum(out, tmp, out=out)
+        np.clip(out, 0., 1., out=out)
+    out[np.isnan(data)] = np.nan
+    return out
+
+
 def _weight_array(data, weight):
     """
     Generates weight array where valid values have the weight value
@@ -500,7 +839,8 @@ def filter_window_distance(img, rscale, fsize=1500, tr1=7):
     Parameters
     ----------
     img : array_like
-        2d polar data to which the filter is to be applied
+        2d polar data to which the filter is to be applied, or a stack of
+        sweeps with shape (..., number of beams, number of range bins)
     rscale : float
         range [m] scale of the polar grid
     fsize : int
@@ -519,7 +859,9 @@ def filter_window_distance(img, rscale, fsize=1500, tr1=7):
     filter_gabella_b : filter using a echo area
 
     """
-    ascale = 2 * np.pi / img.shape[0]
+    img = np.asanyarray(img)
+    naz, nbins = img.shape[-2:]
+    ascale = 2 * np.pi / naz
     count = np.ones(img.shape, dtype=int)
     similar = np.zeros(img.shape, dtype=float)
     good = np.ones(img.shape, dtype=float)
@@ -527,30 +869,43 @@ def filter_window_distance(img, rscale, fsize=1500, tr1=7):
     hole = np.sum(~valid) > 0
     nr = int(round(fsize / rscale))
     range_shift = range(-nr, nr + 1)
-    r = np.arange(img.shape[1]) * rscale + rscale / 2
+    r = np.arange(nbins) * rscale + rscale / 2
     adist = r * ascale
     na = np.around(fsize / adist).astype(int)
-    max_na = img.shape[0] / 10
+    max_na = naz / 10
+    # azimuth shifts and the number of range bins they apply to
+    azimuth_shift = []
     sa = 0
     while sa < max_na:
-        imax = np.where(na >= sa)[0][-1] + 1
-        refa1 = util.roll2d_polar(img, sa, axis=0)
-        refa2 = util.roll2d_polar(img, -sa, axis=0)
-        for sr in range_shift:
-            refr1 = util.roll2d_polar(refa1, sr, axis=1)
-            similar[:, 0: imax] += (img[:, 0: imax] - refr1[:, 0: imax] < tr1)
-            if sa > 0:
-                refr2 = util.roll2d_polar(refa2, sr, axis=1)
-                similar[:, 0: imax] += (img[:, 0: imax] -
-                                        refr2[:, 0: imax] < tr1)
-        count[:, 0:imax] = 2 * sa + 1
+        azimuth_shift.append((sa, np.where(na >= sa)[0][-1] + 1))
         sa += 1
+    # pad (wrapping around in azimuth, NaN in range) instead of rolling,
+    # the shifted images are then just views into the padded image
+    pa = azimuth_shift[-1][0]
+    pad = [(0, 0)] * (img.ndim - 2)
+    padded = np.pad(img.astype(float), pad + [(pa, pa), (0, 0)],
+                    mode='wrap')
+    padded = np.pad(padded, pad + [(0, 0), (nr, nr)], mode='constant',
+                    constant_values=np.nan)
+    # img - ref < tr1 is evaluated as ref > img - tr1
+    thrs = img - tr1
+    below = np.empty(img.shape, dtype=bool)
+    for sa, imax in azimuth_shift:
+        for shift in ([sa, -sa] if sa > 0 else [sa]):
+            for sr in range_shift:
+                ref = padded[..., pa - shift:pa - shift + naz,
+                             nr - sr:nr - sr + imax]
+                with np.errstate(invalid='ignore'):
+                    np.greater(ref, thrs[..., 0:imax],
+                               out=below[..., 0:imax])
+                similar[..., 0:imax] += below[..., 0:imax]
+        count[..., 0:imax] = 2 * sa + 1
     similar[~valid] = np.nan
     count[~valid] = -1
-    count[:, nr:-nr] = count[:, nr:-nr] * (2 * nr + 1)
+    count[..., nr:-nr] = count[..., nr:-nr] * (2 * nr + 1)
     for i in range(0, nr):
-        count[:, i] = count[:, i] * (nr + 1 + i)
-        count[:, -i - 1] = count[:, -i - 1] * (nr + 1 + i)
+        count[..., i] = count[..., i] * (nr + 1 + i)
+        count[..., -i - 1] = count[..., -i - 1] * (nr + 1 + i)
     if hole:
         good = util.filter_window_polar(valid.astype(float),
                                         fsize, "uniform", rscale)
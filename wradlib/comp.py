@@ -14,11 +14,16 @@ Combine data from different radar locations on one common set of locations
 
    extract_circle
    togrid
+   togrid_sparse
+   Compositor
    compose_ko
    compose_weighted
 
 """
 import numpy as np
+from scipy import sparse
+
+from .ipol import SparseInterpolator
 
 
 # from scipy.spatial import KDTree
@@ -118,13 +123,298 @@ def togrid(src, trg, radius, center, data, interpol, *args, **kwargs):
     # create container for entire grid
     composegridshape = [len(trg)]
     composegridshape.extend(data.shape[1:])
-    compose_grid = np.repeat(np.nan, len(trg) *
-                             np.prod(data.shape[1:])).reshape(composegridshape)
+    compose_grid = np.full(composegridshape, np.nan)
     # push subgrid results into the large grid
     compose_grid[ix] = data_on_subgrid
     return compose_grid
 
 
+def togrid_sparse(src, trg, radius, center, interpol, *args, **kwargs):
+    """
+    Sparse interpolation operator from a radar location to the composite grid
+    or set of locations
+
+    .. versionadded:: 0.12.0
+
+    Applying the operator to data is equivalent to :meth:`togrid`, but the
+    geometry is set up only once and many fields (e.g. time steps) are
+    transferred with a single sparse matrix product.
+
+    Parameters
+    ----------
+    src : ndarray of float of shape (numpoints, ndim)
+        cartesian x / y coordinates of the radar bins
+    trg : ndarray of float of shape (numpoints, ndim)
+        cartesian x / y coordinates of the composite
+    radius : float
+        the radius of the radar circle (same units as src and trg)
+    center : array of float
+        the location coordinates of the radar
+    interpol : an interpolation class name from :meth:`wradlib.ipol`
+        e.g. :class:`~wradlib.ipol.Nearest` or :class:`~wradlib.ipol.Idw`
+
+    Other Parameters
+    ----------------
+    *args : arguments of Interpolator (see class documentation)
+
+    Keyword Arguments
+    -----------------
+    **kwargs : keyword arguments of Interpolator (see class documentation)
+
+    Returns
+    -------
+    output : :class:`wradlib.ipol.SparseInterpolator`
+        interpolator which transfers data of shape (numbins, ...) of the
+        radar circle to the composite grid
+
+    """
+    # get indices to select the subgrid from the composite grid
+    ix = extract_circle(center, radius, trg)
+    # interpolate on subgrid
+    ip = interpol(src, trg[ix], *args, **kwargs)
+    # push subgrid results into the large grid
+    embed = sparse.csr_matrix((np.ones(len(ix)), (ix, np.arange(len(ix)))),
+                              shape=(len(trg), len(ix)))
+    return SparseInterpolator(ip).chain(embed)
+
+
+class Compositor():
+    """
+    Compositor(trg)
+
+    Composition of data from several radar locations on one common grid or
+    set of locations.
+
+    The radar locations are registered once with :meth:`add_site`, which
+    selects the target points within the radar circle and sets up the
+    interpolator from the radar bins to these targets. The data (e.g. of a
+    time step) of all radar locations is then composited with
+    :meth:`compose_weighted` or :meth:`compose_ko`. The sites are
+    interpolated one after the other and reduced into the composite
+    right away, so that no full size grid of each radar location is
+    created. Besides the composite, only one grid of the same size is needed
+    for the running reduction.
+
+    .. versionadded:: 0.12.0
+
+    Parameters
+    ----------
+    trg : ndarray of float of shape (numpoints, ndim)
+        cartesian x / y coordinates of the composite
+
+    Examples
+    --------
+    >>> import wradlib.ipol as ipol
+    >>> x, y = np.meshgrid(np.arange(-2., 3.), np.arange(-2., 3.))
+    >>> src = np.column_stack([x.ravel(), y.ravel()])
+    >>> trg = np.column_stack([np.linspace(-4., 4., 9), np.zeros(9)])
+    >>> compositor = Compositor(trg)
+    >>> compositor.add_site(src - [2., 0.], 2.5, [-2., 0.], ipol.Nearest)
+    0
+    >>> compositor.add_site(src + [2., 0.], 2.5, [2., 0.], ipol.Nearest)
+    1
+    >>> compositor.compose_weighted([np.ones(25), 3 * np.ones(25)])
+    array([1., 1., 1., 1., 2., 3., 3., 3., 3.])
+
+    """
+
+    def __init__(self, trg):
+        self.trg = np.asanyarray(trg)
+        self.ix = []
+        self.ip = []
+        self.quality = []
+
+    def __len__(self):
+        return len(self.ip)
+
+    def add_site(self, src, radius, center, interpol, *args, **kwargs):
+        """Adds a radar location to the composite.
+
+        Parameters
+        ----------
+        src : ndarray of float of shape (numpoints, ndim)
+            cartesian x / y coordinates of the radar bins
+        radius : float
+            the radius of the radar circle (same units as src and trg)
+        center : array of float
+            the location coordinates of the radar
+        interpol : an interpolation class name from :meth:`wradlib.ipol`
+            e.g. :class:`~wradlib.ipol.Nearest` or :class:`~wradlib.ipol.Idw`
+
+        Other Parameters
+        ----------------
+        *args : arguments of Interpolator (see class documentation)
+
+        Keyword Arguments
+        -----------------
+        **kwargs : keyword arguments of Interpolator (see class
+            documentation)
+        quality : ndarray of float of shape (numpoints,), optional
+            static quality of the radar bins (e.g. depending on the distance
+            to the radar), which is used if no quality is given on
+            composition; it is interpolated to the composite only once.
+
+        Returns
+        -------
+        output : int
+            index of the radar location
+
+        """
+        quality = kwargs.pop('quality', None)
+        # get indices to select the subgrid from the composite grid
+        ix = extract_circle(center, radius, self.trg)
+        # interpolator to the subgrid
+        ip = interpol(src, self.trg[ix], *args, **kwargs)
+        self.ix.append(ix)
+        self.ip.append(ip)
+        if quality is not None:
+            quality = self._togrid(len(self) - 1, quality)
+        self.quality.append(quality)
+        return len(self) - 1
+
+    def _togrid(self, site, data):
+        """Interpolates data of the radar location `site` to its subgrid.
+        """
+        data = np.asanyarray(data)
+        out = self.ip[site](data)
+        return np.reshape(out, (len(self.ix[site]),) + data.shape[1:])
+
+    def togrid(self, site, data):
+        """Interpolates data of one radar location to the composite grid,
+        see :func:`togrid`.
+
+        Parameters
+        ----------
+        site : int
+            index of the radar location
+        data : ndarray of float of shape (numpoints, ...)
+            the data that should be transferred to composite
+
+        Returns
+        -------
+        output : ndarray of float of shape (len(trg), ...)
+            data of the radar circle which is interpolated on the composite
+            grid, NaN outside of the radar circle
+
+        """
+        data = self._togrid(site, data)
+        out = np.full((len(self.trg),) + data.shape[1:], np.nan)
+        out[self.ix[site]] = data
+        return out
+
+    def _sites(self, radardata, qualitydata):
+        """Yields the interpolated data and quality of the radar locations
+        one after the other.
+        """
+        assert len(self) > 0, 'No radar locations added.'
+        if qualitydata is None:
+            qualitydata = [None] * len(self)
+        nsites = 0
+        for site, (data, quality) in enumerate(zip(radardata, qualitydata)):
+            assert site < len(self), \
+                'More data than radar locations given.'
+            data = self._togrid(site, data)
+            if quality is None:
+                quality = self.quality[site]
+            else:
+                quality = self._togrid(site, quality)
+            if quality is None:
+                quality = np.ones(len(data))
+            # align quality with trailing dimensions of data
+            quality = np.reshape(quality, quality.shape +
+                                 (1,) * (data.ndim - quality.ndim))
+            nsites += 1
+            yield self.ix[site], data, quality
+        assert nsites == len(self), \
+            'Data of %d radar locations expected, got %d.' % (len(self),
+                                                              nsites)
+
+    def _output(self, shape, out):
+        """Returns an output array for the composite."""
+        shape = (len(self.trg),) + shape
+        if out is None:
+            return np.empty(shape)
+        assert out.shape == shape, \
+            'out must be of shape %s.' % (shape,)
+        return out
+
+    def compose_weighted(self, radardata, qualitydata=None, out=None):
+        """Composes the data using a weighted averaging approach, see
+        :func:`compose_weighted`.
+
+        Parameters
+        ----------
+        radardata : iterable of ndarrays of float of shape (numpoints, ...)
+            data of the radar locations (on the radar bins) in the order of
+            registration, e.g. a generator which reads the data of one radar
+            location after the other. The trailing dimensions (e.g. time
+            steps) must be the same for all radar locations.
+        qualitydata : iterable of ndarrays of float or None
+            quality of the radar bins, of shape (numpoints,) or the same
+            shape as the data, which is used as weights. Defaults to the
+            static quality given in :meth:`add_site` or equal weights.
+        out : ndarray of float of shape (len(trg), ...)
+            Array to place the composite in, optional
+
+        Returns
+        -------
+        composite : ndarray of float of shape (len(trg), ...)
+            NaN where no radar location has valid data
+
+        """
+        weights = None
+        for ix, data, quality in self._sites(radardata, qualitydata):
+            if weights is None:
+                out = self._output(data.shape[1:], out)
+                out.fill(0.)
+                weights = np.zeros(out.shape)
+            quality = np.where(np.isnan(data), np.nan, quality)
+            valid = ~np.isnan(quality)
+            out[ix] += np.where(valid, data * quality, 0.)
+            weights[ix] += np.where(valid, quality, 0.)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            out /= weights
+        out[weights == 0.] = np.nan
+        return out
+
+    def compose_ko(self, radardata, qualitydata=None, out=None):
+        """Composes the data using the quality information as a knockout
+        criterion, see :func:`compose_ko`.
+
+        The value of the composed pixel is taken from the radar location
+        whose quality is highest, the first radar location wins in case of
+        equal quality.
+
+        Parameters
+        ----------
+        radardata : iterable of ndarrays of float of shape (numpoints, ...)
+            data of the radar locations (on the radar bins) in the order of
+            registration, see :meth:`compose_weighted`
+        qualitydata : iterable of ndarrays of float or None
+            quality of the radar bins, of shape (numpoints,) or the same
+            shape as the data. Defaults to the static quality given in
+            :meth:`add_site`.
+        out : ndarray of float of shape (len(trg), ...)
+            Array to place the composite in, optional
+
+        Returns
+        -------
+        composite : ndarray of float of shape (len(trg), ...)
+
+        """
+        best = None
+        for ix, data, quality in self._sites(radardata, qualitydata):
+            if best is None:
+                out = self._output(data.shape[1:], out)
+                out.fill(np.nan)
+                best = np.full(out.shape, -np.inf)
+            # NaN quality never wins
+            better = quality > best[ix]
+            best[ix] = np.where(better, quality, best[ix])
+            out[ix] = np.where(better, data, out[ix])
+        return out
+
+
 def compose_ko(radargrids, qualitygrids):
     """Composes grids according to quality information using quality \
     information as a knockout criterion.
@@ -44,14 +44,19 @@ all input arrays.
    :toctree: generated/
 
     process_raw_phidp_vulpiani
+    VulpianiProcessor
     kdp_from_phidp_finitediff
     kdp_from_phidp_linregress
     kdp_from_phidp_convolution
     kdp_from_phidp_sobel
     unfold_phi_vulpiani
     unfold_phi
+    unfold_phi_vectorized
+    unfold_phi_naive
+    unfold_phi_backends
     linear_despeckle
     texture
+    moving_window_stats
 
 """
 
@@ -145,6 +150,174 @@ def process_raw_phidp_vulpiani(phidp, dr, N_despeckle=5, L=7,
     return phidp, kdp
 
 
+class VulpianiProcessor():
+    """
+    VulpianiProcessor(shape, dr, N_despeckle=5, L=7, niter=2, blocksize=256)
+
+    Reusable :math:`Phi_{DP}`/:math:`K_{DP}` processing chain for a fixed
+    sweep geometry.
+
+    Applies the same steps as :meth:`~wradlib.dp.process_raw_phidp_vulpiani`,
+    but precomputes the convolution kernel and the moving window indices
+    once, keeps float32 scratch buffers between calls and processes the beams
+    in blocks of *blocksize* beams. This avoids the allocation of several
+    full-size float64 arrays per processing step and should be used whenever
+    many sweeps of the same geometry are to be processed.
+
+    .. versionadded:: 0.12.0
+
+    Parameters
+    ----------
+    shape : tuple
+        shape of the sweeps to be processed, e.g.
+        (n azimuth angles, n range gates). The range dimension must be the
+        last dimension.
+    dr : gate length in km
+    N_despeckle : integer
+        *N* parameter of function dp.linear_despeckle
+    L : integer
+        *L* parameter of :meth:`~wradlib.dp.kdp_from_phidp_convolution`
+    niter : integer
+        Number of iterations in which phidp is retrieved from kdp
+        and vice versa
+    blocksize : integer
+        Number of beams which are processed at once
+
+    Examples
+    --------
+    >>> import wradlib
+    >>> import numpy as np
+    >>> proc = wradlib.dp.VulpianiProcessor((360, 100), dr=1.)
+    >>> sweep = np.cumsum(np.random.uniform(0, 1, (360, 100)), axis=-1)
+    >>> phidp, kdp = proc(sweep)
+    >>> phidp.shape
+    (360, 100)
+    >>> phidp.dtype
+    dtype('float32')
+
+    """
+
+    def __init__(self, shape, dr, N_despeckle=5, L=7, niter=2,
+                 blocksize=256):
+        assert N_despeckle in (3, 5), \
+            "Window size N for function linear_despeckle must be 3 or 5."
+        assert (L % 2) == 1, \
+            "Window size N for function kdp_from_phidp must be an odd number."
+        self.shape = tuple(shape)
+        self.nbins = self.shape[-1]
+        self.nbeams = util._shape2size(self.shape[:-1])
+        self.dr = dr
+        self.N_despeckle = N_despeckle
+        self.L = int(L)
+        self.niter = niter
+        self.blocksize = max(1, min(int(blocksize), self.nbeams))
+        # precompute kernel and window indices
+        self.window = _kdp_convolution_window(self.L)
+        self._bounds = _kdp_window_bounds(self.nbins, self.L)
+        # normalisation of the convolution kernel
+        self._scale = 1. / (self.L / 3.0)
+        # scratch buffers, reused for every block
+        bufshape = (self.blocksize, self.nbins)
+        self._phidp = np.empty(bufshape, dtype=np.float32)
+        self._kdp = np.empty(bufshape, dtype=np.float32)
+
+    def __call__(self, phidp):
+        """
+        Process one sweep.
+
+        Parameters
+        ----------
+        phidp : array
+            raw :math:`Phi_{DP}` of shape :attr:`shape`. The input array is
+            not changed.
+
+        Returns
+        -------
+        phidp : float32 array of shape :attr:`shape`
+            reconstructed phidp
+        kdp : float32 array of shape :attr:`shape`
+            kdp estimate corresponding to phidp output
+
+        """
+        phidp = np.asanyarray(phidp)
+        assert phidp.shape == self.shape, \
+            ('Shape of phidp %s does not correspond to shape of processor %s'
+             % (phidp.shape, self.shape))
+        phidp = phidp.reshape((-1, self.nbins))
+        phidp_out = np.empty(phidp.shape, dtype=np.float32)
+        kdp_out = np.empty(phidp.shape, dtype=np.float32)
+        for start in range(0, self.nbeams, self.blocksize):
+            stop = min(start + self.blocksize, self.nbeams)
+            self._process_block(phidp[start:stop],
+                                phidp_out[start:stop],
+                                kdp_out[start:stop])
+        return phidp_out.reshape(self.shape), kdp_out.reshape(self.shape)
+
+    def iter_sweeps(self, sweeps):
+        """
+        Generator processing a sequence of sweeps.
+
+        Parameters
+        ----------
+        sweeps : iterable of arrays of shape :attr:`shape`
+
+        Returns
+        -------
+        output : generator yielding tuples (phidp, kdp) for each sweep
+
+        """
+        for sweep in sweeps:
+            yield self(sweep)
+
+    def _kdp_convolution(self, phidp, kdp):
+        """Convolution :math:`K_{DP}` with precomputed kernel (in place)."""
+        convolve1d(phidp, self.window, axis=-1, output=kdp)
+        kdp *= self._scale
+        _kdp_fill_linregress(phidp, kdp, self.L, bounds=self._bounds)
+        kdp /= 2. * self.dr
+        return kdp
+
+    def _process_block(self, block, phidp_out, kdp_out):
+        n = len(block)
+        phidp = self._phidp[:n]
+        kdp = self._kdp[:n]
+        phidp[:] = block
+
+        # despeckle
+        linear_despeckle(phidp, self.N_despeckle)
+        # kdp retrieval first guess
+        self._kdp_convolution(phidp, kdp)
+        # remove extreme values
+        kdp[kdp > 20] = 0
+        kdp[np.logical_and(kdp < -2, kdp > -20)] = 0
+
+        # unfold phidp
+        unfold_phi_vulpiani(phidp, kdp)
+
+        # clean up unfolded PhiDP
+        phidp[phidp > 360] = np.nan
+
+        # kdp retrieval second guess
+        self._kdp_convolution(phidp, kdp)
+        np.nan_to_num(kdp, copy=False)
+
+        # remove remaining extreme values
+        kdp[kdp > 20] = 0
+        kdp[kdp < -2] = 0
+
+        # start the actual phidp/kdp iteration
+        for i in range(self.niter):
+            # phidp from kdp through integration
+            np.cumsum(kdp, axis=-1, out=phidp)
+            phidp *= 2 * self.dr
+            # kdp from phidp by convolution
+            self._kdp_convolution(phidp, kdp)
+            np.nan_to_num(kdp, copy=False)
+
+        phidp_out[:] = phidp
+        kdp_out[:] = kdp
+
+
 def unfold_phi_vulpiani(phidp, kdp):
     """Alternative phase unfolding which completely relies on Kdp.
 
@@ -519,22 +692,69 @@ def kdp_from_phidp_convolution(phidp, L=7, dr=1.):
     # Make really sure L is an integer
     L = int(L)
 
+    window = _kdp_convolution_window(L)
+    kdp = convolve1d(phidp, window, axis=1) / (len(window) / 3.0)
+
+    # find remaining NaN values with valid neighbours and fill them
+    # using the slow moving window linear regression
+    _kdp_fill_linregress(phidp, kdp, L)
+
+    # accounting for forward/backward propagation AND gate length
+    return kdp.reshape(shape) / 2. / dr
+
+
+def _kdp_convolution_window(L):
+    """Returns the convolution kernel used in
+    :meth:`~wradlib.dp.kdp_from_phidp_convolution`.
+
+    Parameters
+    ----------
+    L : integer
+        Width of the window (as number of range gates)
+
+    """
     window = 2. * np.arange(L) / (L - 1.0) - 1.0
     window = window / (abs(window).sum())
-    window = window[::-1]
-    kdp = convolve1d(phidp, window, axis=1) / (len(window) / 3.0)
+    return window[::-1]
 
-    # find remaining NaN values with valid neighbours
+
+def _kdp_window_bounds(nbins, L):
+    """Returns start and stop indices of the moving windows of width *L*
+    centered at each of *nbins* range gates, clipped to the beam.
+    """
+    r = np.arange(nbins)
+    return (np.maximum(0, r - int(L / 2)),
+            np.minimum(r + int(L / 2) + 1, nbins))
+
+
+def _kdp_fill_linregress(phidp, kdp, L, bounds=None):
+    """Fills NaN values in unscaled convolution :math:`K_{DP}` by moving window
+    linear regression (in place).
+
+    Parameters
+    ----------
+    phidp : array of shape (n beams, n range gates)
+    kdp : array of shape (n beams, n range gates)
+        unscaled :math:`K_{DP}` as returned by the convolution,
+        will be changed in place
+    L : integer
+        Width of the window (as number of range gates)
+    bounds : tuple
+        precomputed window bounds as returned by
+        :meth:`~wradlib.dp._kdp_window_bounds`
+
+    """
     invalidkdp = np.isnan(kdp)
     if not np.any(invalidkdp.ravel()):
-        # No NaN? Return KdP
-        return kdp.reshape(shape) / 2. / dr
+        return kdp
 
-    # Otherwise continue
-    x = np.arange(phidp.shape[-1])
+    nbins = phidp.shape[-1]
+    if bounds is None:
+        bounds = _kdp_window_bounds(nbins, L)
+    lo, hi = bounds
+    x = np.arange(nbins)
     validphidp = ~np.isnan(phidp)
     kernel = np.ones(L, dtype="i4")
-    # and do the slow moving window linear regression
     for beam in range(len(phidp)):
         # number of valid neighbours around one gate
         nvalid = np.convolve(validphidp[beam], kernel, "same") > L / 2
@@ -542,8 +762,7 @@ def kdp_from_phidp_convolution(phidp, L=7, dr=1.):
         nangates = np.where(invalidkdp[beam] & nvalid)[0]
         # now iterate over those
         for r in nangates:
-            ix = np.arange(max(0, r - int(L / 2)),
-                           min(r + int(L / 2) + 1, shape[-1]))
+            ix = np.arange(lo[r], hi[r])
             # check again (just to make sure...)
             if np.sum(validphidp[beam, ix]) < L / 2:
                 # not enough valid values inside our window
@@ -559,18 +778,16 @@ def kdp_from_phidp_convolution(phidp, L=7, dr=1.):
                                                        ix[validphidp[beam,
                                                                      ix]]])[0]
         # end
-        ix = np.arange(shape[-1] - L, shape[-1])
+        ix = np.arange(nbins - L, nbins)
         if np.sum(validphidp[beam, ix]) >= 2:
             kdp[beam, -int(L / 2):] = linregress(x[ix][validphidp[beam, ix]],
                                                  phidp[beam,
                                                        ix[validphidp[beam,
                                                                      ix]]])[0]
+    return kdp
 
-    # accounting for forward/backward propagation AND gate length
-    return kdp.reshape(shape) / 2. / dr
 
-
-def unfold_phi(phidp, rho, width=5, copy=False):
+def unfold_phi(phidp, rho, width=5, copy=False, backend=None):
     """
     Unfolds differential phase by adjusting values that exceeded maximum
     ambiguous range.
@@ -578,10 +795,14 @@ def unfold_phi(phidp, rho, width=5, copy=False):
     Accepts arbitrarily dimensioned arrays, but THE LAST DIMENSION MUST BE
     THE RANGE.
 
-    This is the fast Fortran-based implementation (RECOMMENDED).
-
     The algorithm is based on the paper of :cite:`Wang2009`.
 
+    By default, the fastest available implementation is used
+    (see :meth:`~wradlib.dp.unfold_phi_backends`): the Fortran-based
+    implementation from the optional speedup module if it has been built,
+    otherwise the vectorized NumPy implementation
+    (:meth:`~wradlib.dp.unfold_phi_vectorized`).
+
     Parameters
     ----------
     phidp : array of shape (...,nr) with nr being the number of range bins
@@ -590,6 +811,30 @@ def unfold_phi(phidp, rho, width=5, copy=False):
        Width of the analysis window
     copy : boolean
        Leaves original phidp array unchanged if set to True (default: False)
+    backend : string
+       One of 'fortran', 'numpy' or 'python'. Defaults to None, which selects
+       the first available backend returned by
+       :meth:`~wradlib.dp.unfold_phi_backends`.
+    """
+    if backend is None:
+        backend = unfold_phi_backends()[0]
+    for name, func, available in _UNFOLD_PHI_BACKENDS:
+        if name == backend:
+            break
+    else:
+        raise ValueError("Unknown unfold_phi backend '{0}', use one of {1}."
+                         .format(backend,
+                                 [b[0] for b in _UNFOLD_PHI_BACKENDS]))
+    return func(phidp, rho, width=width, copy=copy)
+
+
+def _unfold_phi_fortran(phidp, rho, width=5, copy=False):
+    """
+    Unfolds differential phase by adjusting values that exceeded maximum
+    ambiguous range.
+
+    This is the fast Fortran-based implementation, which requires the
+    optional speedup module.
     """
     # Check whether fast Fortran implementation is available
     speedup = util.import_optional("wradlib.speedup")
@@ -606,9 +851,7 @@ def unfold_phi(phidp, rho, width=5, copy=False):
     beams, rs = phidp.shape
 
     # Compute the standard deviation within windows of 9 range bins
-    stdarr = np.zeros(phidp.shape, dtype=np.float32)
-    for r in range(rs - 9):
-        stdarr[..., r] = np.std(phidp[..., r:r + 9], -1)
+    stdarr = _forward_window_std(phidp, 9)
 
     phidp = speedup.f_unfold_phi(phidp=phidp.astype("f4"),
                                  rho=rho.astype("f4"),
@@ -619,6 +862,88 @@ def unfold_phi(phidp, rho, width=5, copy=False):
     return phidp.reshape(shape)
 
 
+def unfold_phi_vectorized(phidp, rho, width=5, copy=False):
+    """
+    Unfolds differential phase by adjusting values that exceeded maximum
+    ambiguous range.
+
+    Accepts arbitrarily dimensioned arrays, but THE LAST DIMENSION MUST BE
+    THE RANGE.
+
+    This is the vectorized NumPy implementation of the algorithm used in
+    the Fortran-based speedup module. All beams are processed together,
+    keeping the reference phase of each beam in a state array, so it is
+    nearly as fast as the Fortran code and does not need a compiler.
+
+    The algorithm is based on the paper of :cite:`Wang2009`.
+
+    .. versionadded:: 0.12.0
+
+    Parameters
+    ----------
+    phidp : array of shape (...,nr) with nr being the number of range bins
+    rho : array of same shape as phidp
+    width : integer
+       Width of the analysis window
+    copy : boolean
+       Leaves original phidp array unchanged if set to True (default: False)
+
+    Note
+    ----
+    Beams without any signal (all values equal to zero) are left unchanged.
+    """
+    shape = phidp.shape
+    assert rho.shape == shape, "rho and phidp must have the same shape."
+
+    phidp = phidp.reshape((-1, shape[-1]))
+    if copy:
+        phidp = phidp.copy()
+    rho = rho.reshape((-1, shape[-1]))
+    gradphi = gradient_from_smoothed(phidp)
+
+    beams, rs = phidp.shape
+    width = int(width)
+
+    # Compute the standard deviation within windows of 9 range bins
+    stdarr = _forward_window_std(phidp, 9)
+
+    def _window_sum(arr):
+        # sums over the windows [j, j + width) for all j
+        csum = np.cumsum(arr, axis=-1, dtype=np.float64)
+        csum = np.concatenate([np.zeros((beams, 1)), csum], axis=-1)
+        return csum[:, width:] - csum[:, :-width]
+
+    # step 1: determine location where meaningful PhiDP profile begins
+    start = ((_window_sum(stdarr < 5) == width) &
+             (_window_sum(rho > 0.9) == width))
+    j = np.where(start.any(axis=-1), np.argmax(start, axis=-1),
+                 rs - width)
+    ix = j[:, np.newaxis] + np.arange(width)
+    ref = phidp[np.arange(beams)[:, np.newaxis], ix].mean(axis=-1)
+
+    # step 2: the reference phase is updated with the gradient at all gates
+    # where the slope and the standard deviation within the preceding window
+    # are acceptable
+    invalid = np.isnan(stdarr)
+    slope_ok = _window_sum((gradphi < -5) | (gradphi > 20)) == 0
+    std_ok = ((_window_sum(invalid) == 0) &
+              (_window_sum(np.where(invalid, 0, stdarr)) < 15.))
+    update = np.zeros((beams, rs), dtype=bool)
+    update[:, width - 1:] = slope_ok & std_ok
+    active = np.arange(rs) >= (j + width - 1)[:, np.newaxis]
+    # skip empty beams
+    active[np.all(phidp[:, :rs - width + 1] == 0, axis=-1)] = False
+    ref = ref[:, np.newaxis] + np.cumsum(
+        np.where(active & update, 0.5 * gradphi, 0.), axis=-1)
+
+    # step 3: unfold
+    with np.errstate(invalid='ignore'):
+        fold = active & (phidp - ref < -80) & (phidp < 0)
+    phidp[fold] += 360
+
+    return phidp.reshape(shape)
+
+
 def unfold_phi_naive(phidp, rho, width=5, copy=False):
     """
     Unfolds differential phase by adjusting values that exceeded maximum
@@ -653,9 +978,7 @@ def unfold_phi_naive(phidp, rho, width=5, copy=False):
     beams, rs = phidp.shape
 
     # Compute the standard deviation within windows of 9 range bins
-    stdarr = np.zeros(phidp.shape, dtype=np.float32)
-    for r in range(rs - 9):
-        stdarr[..., r] = np.std(phidp[..., r:r + 9], -1)
+    stdarr = _forward_window_std(phidp, 9)
 
     # phi_corr = np.zeros(phidp.shape)
     for beam in range(beams):
@@ -684,6 +1007,40 @@ def unfold_phi_naive(phidp, rho, width=5, copy=False):
     return phidp
 
 
+def _has_speedup():
+    """Checks whether the Fortran-based speedup module is available."""
+    speedup = util.import_optional("wradlib.speedup")
+    return not isinstance(speedup, util.OptionalModuleStub)
+
+
+# available unfold_phi implementations ordered by performance,
+# (name, function, availability check)
+_UNFOLD_PHI_BACKENDS = [("fortran", _unfold_phi_fortran, _has_speedup),
+                        ("numpy", unfold_phi_vectorized, lambda: True),
+                        ("python", unfold_phi_naive, lambda: True)]
+
+
+def unfold_phi_backends():
+    """Returns the names of the available implementations of
+    :meth:`~wradlib.dp.unfold_phi`, fastest first.
+
+    .. versionadded:: 0.12.0
+
+    Returns
+    -------
+    output : list of strings
+
+    Examples
+    --------
+    >>> import wradlib
+    >>> 'numpy' in wradlib.dp.unfold_phi_backends()
+    True
+
+    """
+    return [name for name, func, available in _UNFOLD_PHI_BACKENDS
+            if available()]
+
+
 def linear_despeckle(data, N=3, copy=False):
     """Remove floating pixels in between NaNs in a multi-dimensional array.
 
@@ -709,21 +1066,10 @@ def linear_despeckle(data, N=3, copy=False):
         "Window size N for function linear_despeckle must be 3 or 5."
     if copy:
         data = data.copy()
-    axis = data.ndim - 1
-    arr = np.ones(data.shape, dtype="i4")
-    arr[np.isnan(data)] = 0
-    arr_plus1 = np.roll(arr, shift=1, axis=axis)
-    arr_minus1 = np.roll(arr, shift=-1, axis=axis)
-    if N == 3:
-        # for a window of size 3
-        test = arr + arr_plus1 + arr_minus1
-        data[np.logical_and(np.logical_not(np.isnan(data)), test < 2)] = np.nan
-    else:
-        # for a window of size 5
-        arr_plus2 = np.roll(arr, shift=2, axis=axis)
-        arr_minus2 = np.roll(arr, shift=-2, axis=axis)
-        test = arr + arr_plus1 + arr_minus1 + arr_plus2 + arr_minus2
-        data[np.logical_and(np.logical_not(np.isnan(data)), test < 3)] = np.nan
+    valid = ~np.isnan(data)
+    # number of valid values within the window (wrapping around the beam)
+    test = _moving_window_sum(valid.astype("i4"), N, axis=-1, wrap=True)
+    data[np.logical_and(valid, test < int(N / 2) + 1)] = np.nan
     # remove isolated pixels at the first gate
     secondgate = np.squeeze(np.take(data, range(1, 2), data.ndim - 1))
     data[..., 0][np.isnan(secondgate)] = np.nan
@@ -746,39 +1092,115 @@ def texture(data):
     texture : array of textures with the same shape as data
 
     """
-    x1 = np.roll(data, 1, -2)  # center:2
-    x2 = np.roll(data, 1, -1)  # 4
-    x3 = np.roll(data, -1, -2)  # 8
-    x4 = np.roll(data, -1, -1)  # 6
-    x5 = np.roll(x1, 1, -1)  # 1
-    x6 = np.roll(x4, 1, -2)  # 3
-    x7 = np.roll(x3, -1, -1)  # 9
-    x8 = np.roll(x2, -1, -2)  # 7
+    data = np.asanyarray(data, dtype=np.float64)
+    valid = ~np.isnan(data)
+    x = np.where(valid, data, 0.)
 
-    # at least one NaN would give a sum of NaN
-    xa = np.array([x1, x2, x3, x4, x5, x6, x7, x8])
+    def _neighbour_sum(arr):
+        # sum over the 3x3 neighbourhood (wrapping around both axes)
+        # excluding the center pixel
+        out = _moving_window_sum(arr, 3, axis=-2, wrap=True)
+        out = _moving_window_sum(out, 3, axis=-1, wrap=True)
+        return out - arr
 
-    # get count of valid neighboring pixels
-    xa_valid = np.ones(np.shape(xa))
-    xa_valid[np.isnan(xa)] = 0
     # count number of valid neighbors
-    xa_valid_count = np.sum(xa_valid, axis=0)
-
-    num = np.zeros(data.shape)
-    for xarr in xa:
-        diff = data - xarr
-        # difference of NaNs will be converted to zero
-        # (to not affect the summation)
-        diff[np.isnan(diff)] = 0
-        # only those with valid values are considered in the summation
-        num += diff ** 2
+    xa_valid_count = _neighbour_sum(valid.astype(np.float64))
+    # sum((x - xn)**2) over the valid neighbours xn, expanded in terms of
+    # the windowed sums of xn and xn**2
+    num = (xa_valid_count * x ** 2 - 2. * x * _neighbour_sum(x) +
+           _neighbour_sum(x ** 2))
+    num = np.maximum(num, 0.)
 
     # reinforce that NaN values should have NaN textures
-    num[np.isnan(data)] = np.nan
+    num[~valid] = np.nan
 
     return np.sqrt(num / xa_valid_count)
 
 
+def moving_window_stats(data, N, axis=-1, wrap=False):
+    """Computes number, mean and standard deviation of valid (non-NaN) values
+    within moving windows along one axis of a multi-dimensional array.
+
+    The windows are centered on each element and the statistics are derived
+    from cumulative sums, so the computational cost does not depend on the
+    window size.
+
+    .. versionadded:: 0.12.0
+
+    Parameters
+    ----------
+    data : multi-dimensional array
+    N : integer
+        Width of the window (must be an odd number)
+    axis : integer
+        Axis along which the window is moved (defaults to the last axis)
+    wrap : boolean
+        If True, the windows wrap around the array edges (e.g. for the
+        azimuth dimension). Otherwise windows are truncated at the edges.
+
+    Returns
+    -------
+    count : array of the same shape as data
+        number of valid values within each window
+    mean : array of the same shape as data
+        mean of the valid values (NaN if there are no valid values)
+    std : array of the same shape as data
+        standard deviation of the valid values (NaN if there are no valid
+        values)
+
+    Examples
+    --------
+    >>> import wradlib
+    >>> import numpy as np
+    >>> data = np.array([1., 2., np.nan, 4., 5.])
+    >>> count, mean, std = wradlib.dp.moving_window_stats(data, 3)
+    >>> print(count)
+    [2. 2. 2. 2. 2.]
+    >>> print(mean)
+    [1.5 1.5 3.  4.5 4.5]
+
+    """
+    assert (N % 2) == 1, \
+        "Window size N for function moving_window_stats must be an odd number."
+    data = np.asanyarray(data, dtype=np.float64)
+    valid = ~np.isnan(data)
+    x = np.where(valid, data, 0.)
+    count = _moving_window_sum(valid.astype(np.float64), N, axis, wrap)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = _moving_window_sum(x, N, axis, wrap) / count
+        var = _moving_window_sum(x ** 2, N, axis, wrap) / count - mean ** 2
+    std = np.sqrt(np.maximum(var, 0.))
+    return count, mean, std
+
+
+def _moving_window_sum(data, N, axis=-1, wrap=False):
+    """Sum over centered moving windows of odd width *N* along *axis*,
+    computed from cumulative sums.
+    """
+    data = np.moveaxis(data, axis, -1)
+    half = int(N / 2)
+    width = [(0, 0)] * (data.ndim - 1) + [(half, half)]
+    csum = np.cumsum(np.pad(data, width, mode='wrap' if wrap else 'constant'),
+                     axis=-1)
+    csum = np.concatenate([np.zeros_like(csum[..., :1]), csum], axis=-1)
+    out = csum[..., N:] - csum[..., :-N]
+    return np.moveaxis(out, -1, axis)
+
+
+def _forward_window_std(data, N):
+    """Standard deviation of the windows [r, r + N) along the last axis,
+    as required by the :cite:`Wang2009` unfolding. Windows containing NaN
+    yield NaN, the last N gates are set to zero.
+    """
+    count, _, std = moving_window_stats(data, N, axis=-1)
+    stdarr = np.zeros(data.shape, dtype=np.float32)
+    rs = data.shape[-1]
+    half = int(N / 2)
+    std[count < N] = np.nan
+    stdarr[..., :max(rs - N, 0)] = std[..., half:half + max(rs - N, 0)]
+    return stdarr
+
+
 def contiguous_regions(condition):
     """Finds contiguous True regions of the boolean array "condition".
 
@@ -836,8 +1258,7 @@ def gradient_along_axis(x):
     diff_begin = (x[..., 1] - x[..., 0]).reshape(newshape)
     diff_end = (x[..., -1] - x[..., -2]).reshape(newshape)
     diffs = ((x - np.roll(x, 2, axis)) / 2.)
-    diffs = np.append(diffs[..., 2:], diff_end, axis=axis)
-    return np.insert(diffs, 0, diff_begin, axis=axis)
+    return np.concatenate([diff_begin, diffs[..., 2:], diff_end], axis=axis)
 
 
 # TO UTILS
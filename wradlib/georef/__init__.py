@@ -38,7 +38,8 @@ from .raster import (pixel_coordinates, pixel_to_map, pixel_to_map3d,
                      read_gdal_coordinates, read_gdal_values,
                      read_gdal_projection, create_raster_dataset,
                      set_raster_origin, extract_raster_dataset,
-                     reproject_raster_dataset)
+                     reproject_raster_dataset, raster_bilinear_weights,
+                     DemSampler)
 
 from .satellite import (correct_parallax, sat2pol, dist_from_orbit)
 
@@ -21,12 +21,16 @@ Raster Functions
    create_raster_dataset
    set_raster_origin
    extract_raster_dataset
+   raster_bilinear_weights
+   DemSampler
 """
 
 import numpy as np
 from osgeo import gdal, osr, gdal_array
 
 from .projection import reproject
+from .polar import spherical_to_proj
+from ..ipol import _LRUCache
 
 
 def pixel_coordinates(nx, ny, mode="centers"):
@@ -478,3 +482,261 @@ def reproject_raster_dataset(src_ds, **kwargs):
     gdal.ReprojectImage(src_ds, dst_ds, src_srs, dst_srs, resample)
 
     return dst_ds
+
+
+def raster_bilinear_weights(geotransform, coords, shape):
+    """Pixel indices and weights for bilinear interpolation of a raster.
+
+    .. versionadded:: 0.12.0
+
+    Parameters
+    ----------
+    geotransform : :class:`numpy:numpy.ndarray`
+        geographical transformation vector
+        (see :meth:`~wradlib.georef.pixel_to_map`)
+    coords : :class:`numpy:numpy.ndarray`
+        Array of shape (..., 2) with map coordinates x,y of the target points
+    shape : tuple
+        shape (rows, cols) of the raster
+
+    Returns
+    -------
+    rows : :class:`numpy:numpy.ndarray`
+        Array of shape (4, ...) with the row indices of the four pixels
+        surrounding each target point
+    cols : :class:`numpy:numpy.ndarray`
+        Array of shape (4, ...) with the column indices
+    weights : :class:`numpy:numpy.ndarray`
+        Array of shape (4, ...) with the bilinear weights, NaN for target
+        points outside the raster
+    """
+    gt = np.asarray(geotransform, dtype=float)
+    coords = np.asanyarray(coords, dtype=float)
+    dx = coords[..., 0] - gt[0]
+    dy = coords[..., 1] - gt[3]
+    # invert the affine transformation (pixel rotation included)
+    det = gt[1] * gt[5] - gt[2] * gt[4]
+    col = (gt[5] * dx - gt[2] * dy) / det
+    row = (gt[1] * dy - gt[4] * dx) / det
+    nrows, ncols = shape
+    outside = (col < 0) | (col > ncols) | (row < 0) | (row > nrows)
+    # fractional positions relative to the pixel centers, clamped at the
+    # raster edges
+    col = np.clip(col - 0.5, 0, ncols - 1)
+    row = np.clip(row - 0.5, 0, nrows - 1)
+    col0 = np.minimum(np.floor(col).astype(np.intp), max(ncols - 2, 0))
+    row0 = np.minimum(np.floor(row).astype(np.intp), max(nrows - 2, 0))
+    wc = col - col0
+    wr = row - row0
+    col1 = np.minimum(col0 + 1, ncols - 1)
+    row1 = np.minimum(row0 + 1, nrows - 1)
+    rows = np.stack([row0, row0, row1, row1])
+    cols = np.stack([col0, col1, col0, col1])
+    weights = np.stack([(1 - wr) * (1 - wc), (1 - wr) * wc,
+                        wr * (1 - wc), wr * wc])
+    weights[:, outside] = np.nan
+    return rows, cols, weights
+
+
+class DemSampler():
+    """
+    DemSampler(dataset, sites=None, azimuths=None, band=1, re=None, ke=4./3.,
+               cache_size=64, cache_memory=2**30)
+
+    Samples a digital elevation model at the bins of polar radar sweeps.
+
+    .. versionadded:: 0.12.0
+
+    For each sweep geometry (site, ranges, azimuths and elevation angle) the
+    bin coordinates are computed once in the projection of the DEM with
+    :meth:`~wradlib.georef.spherical_to_proj`, and translated to the DEM
+    pixel indices and bilinear weights of every bin. These are cached, as
+    are the DEM windows, so neither the DEM is reprojected nor more than the
+    window covering the radar coverage is read from the (possibly huge)
+    raster file. Both caches are bounded, the least recently used entries
+    are discarded first.
+
+    An instance can be used as `terrain` callable of
+    :class:`wradlib.qual.BeamBlockage`.
+
+    Parameters
+    ----------
+    dataset : gdal.Dataset
+        raster dataset of the DEM with georeferencing
+    sites : dict
+        maps site identifiers to site coordinates (lon, lat, alt), needed
+        for calls with site identifiers
+    azimuths : :class:`numpy:numpy.ndarray`
+        azimuth angles [degrees] of the beams, defaults to 360 beams of 1
+        degree
+    band : int
+        raster band containing the terrain heights
+    re : float
+        earth's radius [m], see :meth:`~wradlib.georef.spherical_to_proj`
+    ke : float
+        adjustment factor to account for the refractivity gradient
+    cache_size : integer
+        Defaults to 64. Maximum number of sweep geometries and of DEM
+        windows which are kept in order to be reused.
+    cache_memory : integer
+        Defaults to 2**30 (1 GiB). Maximum memory (in bytes) of the cached
+        weights and of the cached DEM windows each, None for no limit.
+
+    Examples
+    --------
+    >>> import wradlib
+    >>> dem = wradlib.io.open_raster("dem.tif") #doctest: +SKIP
+    >>> sampler = wradlib.georef.DemSampler(dem, #doctest: +SKIP
+    ...     sites={'site': (7.07, 50.73, 99.5)})
+    >>> bb = wradlib.qual.BeamBlockage(sampler) #doctest: +SKIP
+    >>> pbb, cbb = bb('site', ranges, [0.5, 1.5], 99.5) #doctest: +SKIP
+
+    """
+
+    def __init__(self, dataset, sites=None, azimuths=None, band=1, re=None,
+                 ke=4. / 3., cache_size=64, cache_memory=2 ** 30):
+        self.dataset = dataset
+        self.sites = {} if sites is None else dict(sites)
+        if azimuths is None:
+            azimuths = np.arange(0.5, 360., 1.)
+        self.azimuths = np.asarray(azimuths, dtype=float)
+        self.band = band
+        self.re = re
+        self.ke = ke
+        self.geotransform = dataset.GetGeoTransform()
+        self.projection = read_gdal_projection(dataset)
+        self.shape = (dataset.RasterYSize, dataset.RasterXSize)
+        self.nodata = dataset.GetRasterBand(band).GetNoDataValue()
+        self._weights = _LRUCache(cache_size, cache_memory)
+        self._windows = _LRUCache(cache_size, cache_memory)
+
+    def coordinates(self, sitecoords, ranges, azimuths, elevation):
+        """
+        Projected coordinates of the bins of a sweep.
+
+        Returns
+        -------
+        coords : :class:`numpy:numpy.ndarray`
+            Array of shape (num azimuths, num ranges, 2) with the map
+            coordinates in the projection of the DEM
+        """
+        ranges = np.asarray(ranges, dtype=float)
+        azimuths = np.asarray(azimuths, dtype=float)
+        r = np.broadcast_to(ranges, azimuths.shape + ranges.shape)
+        coords = spherical_to_proj(r, azimuths[:, np.newaxis], elevation,
+                                   sitecoords, proj=self.projection,
+                                   re=self.re, ke=self.ke)
+        return coords[..., :2]
+
+    def weights(self, sitecoords, ranges, azimuths, elevation):
+        """
+        Cached DEM window, pixel indices and bilinear weights of a sweep.
+
+        Returns
+        -------
+        window : tuple
+            (xoff, yoff, xsize, ysize) of the DEM window
+        index : :class:`numpy:numpy.ndarray`
+            Array of shape (4, num azimuths, num ranges) with flat pixel
+            indices into the window
+        weights : :class:`numpy:numpy.ndarray`
+            Array of shape (4, num azimuths, num ranges) with the bilinear
+            weights
+        """
+        ranges = np.asarray(ranges, dtype=float)
+        azimuths = np.asarray(azimuths, dtype=float)
+        key = (tuple(sitecoords), float(elevation), ranges.tobytes(),
+               azimuths.tobytes())
+
+        def compute():
+            coords = self.coordinates(sitecoords, ranges, azimuths,
+                                      elevation)
+            rows, cols, weights = raster_bilinear_weights(self.geotransform,
+                                                          coords, self.shape)
+            inside = np.isfinite(weights[0])
+            if inside.any():
+                yoff, xoff = rows[:, inside].min(), cols[:, inside].min()
+                ysize = rows[:, inside].max() - yoff + 1
+                xsize = cols[:, inside].max() - xoff + 1
+            else:
+                yoff = xoff = 0
+                ysize = xsize = 1
+            rows = np.clip(rows - yoff, 0, ysize - 1)
+            cols = np.clip(cols - xoff, 0, xsize - 1)
+            window = (int(xoff), int(yoff), int(xsize), int(ysize))
+            return window, rows * xsize + cols, weights
+
+        return self._weights.get(key, compute)
+
+    def read_window(self, window):
+        """
+        Reads (or returns the cached) DEM window.
+
+        Parameters
+        ----------
+        window : tuple
+            (xoff, yoff, xsize, ysize) of the DEM window
+
+        Returns
+        -------
+        values : :class:`numpy:numpy.ndarray`
+            Array of shape (ysize, xsize), nodata values are set to NaN
+        """
+        xoff, yoff, xsize, ysize = window
+        # use a cached window which contains the requested one
+        for cached in list(self._windows._items):
+            cx, cy, cxs, cys = cached
+            if cx <= xoff and cy <= yoff and xoff + xsize <= cx + cxs and \
+                    yoff + ysize <= cy + cys:
+                values = self._windows.get(cached, None)
+                return values[yoff - cy:yoff - cy + ysize,
+                              xoff - cx:xoff - cx + xsize]
+
+        def read():
+            band = self.dataset.GetRasterBand(self.band)
+            values = band.ReadAsArray(xoff, yoff, xsize, ysize).astype(float)
+            if self.nodata is not None:
+                values[values == self.nodata] = np.nan
+            return values
+
+        return self._windows.get(window, read)
+
+    def sample(self, sitecoords, ranges, azimuths, elevation):
+        """
+        Terrain heights at the bins of a sweep.
+
+        Parameters
+        ----------
+        sitecoords : a sequence of three floats
+            the lon / lat coordinates of the radar location and its altitude
+        ranges : :class:`numpy:numpy.ndarray`
+            distances of the bins from the radar [m]
+        azimuths : :class:`numpy:numpy.ndarray`
+            azimuth angles of the beams [degrees]
+        elevation : float
+            elevation angle [degrees]
+
+        Returns
+        -------
+        terrain : :class:`numpy:numpy.ndarray`
+            Array of shape (num azimuths, num ranges), NaN outside the DEM
+        """
+        window, index, weights = self.weights(sitecoords, ranges, azimuths,
+                                              elevation)
+        values = np.ascontiguousarray(self.read_window(window))
+        return np.sum(values.ravel()[index] * weights, axis=0)
+
+    def __call__(self, site, ranges, elevation):
+        """
+        Terrain heights at the bins of a sweep of a registered site with
+        the default azimuths, see :meth:`sample`.
+        """
+        return self.sample(self.sites[site], ranges, self.azimuths,
+                           elevation)
+
+    def clear(self):
+        """
+        Clear the caches.
+        """
+        self._weights.clear()
+        self._windows.clear()
@@ -23,19 +23,27 @@ This includes for example:
    Nearest
    Idw
    Linear
+   RegularGrid
+   PolarGrid
    OrdinaryKriging
    ExternalDriftKriging
+   SparseInterpolator
+   NanInterpolator
+   TiledInterpolator
    interpolate
    interpolate_polar
+   leave_one_out
    cart2irregular_interp
    cart2irregular_spline
 
 """
 
+from collections import OrderedDict
 from functools import reduce
 import re
 import scipy
-from scipy.spatial import cKDTree
+from scipy import sparse
+from scipy.spatial import cKDTree, Delaunay
 from scipy.interpolate import LinearNDInterpolator
 from scipy.ndimage.interpolation import map_coordinates
 from scipy.interpolate import griddata
@@ -96,6 +104,45 @@ class IpolBase():
         self._check_shape(vals)
         return None
 
+    def to_sparse(self):
+        """
+        Export the interpolator as sparse matrix.
+
+        The interpolated values are the product of this matrix with the
+        values at the source points, see :class:`SparseInterpolator`.
+        Rows without any entry correspond to target points which cannot be
+        interpolated.
+
+        This base implementation evaluates the interpolator for the unit
+        vectors of the source points (a block of them at a time), which is
+        valid for all interpolators which are linear in the source values.
+        Targets with non-finite results get no entry.
+
+        .. versionadded:: 0.12.0
+
+        Returns
+        -------
+        matrix : :class:`scipy:scipy.sparse.csr_matrix`
+            interpolation weights of shape (numtargets, numsources)
+        """
+        blocksize = 2 ** 20 // max(self.numsources, self.numtargets, 1)
+        blocksize = max(blocksize, 1)
+        invalid = np.zeros(self.numtargets, dtype=bool)
+        blocks = []
+        for start in range(0, self.numsources, blocksize):
+            cols = np.arange(start, min(start + blocksize, self.numsources))
+            unit = np.zeros((self.numsources, len(cols)))
+            unit[cols, np.arange(len(cols))] = 1.
+            weights = np.asarray(self(unit), dtype=float)
+            weights = weights.reshape(self.numtargets, len(cols))
+            finite = np.isfinite(weights)
+            invalid |= ~finite.all(axis=1)
+            blocks.append(sparse.csr_matrix(np.where(finite, weights, 0.)))
+        matrix = sparse.hstack(blocks, format='csr')
+        matrix = sparse.diags((~invalid).astype(float)).dot(matrix).tocsr()
+        matrix.eliminate_zeros()
+        return matrix
+
     def _check_shape(self, vals):
         """
         Checks whether the values correspond to the source points
@@ -121,7 +168,9 @@ class IpolBase():
             the length of the ndarray corresponding to the number of points
 
         """
-        if type(x) in [list, tuple]:
+        if isinstance(x, cKDTree):
+            x = x.data
+        elif type(x) in [list, tuple]:
             x = [item.ravel() for item in x]
             x = np.array(x).transpose()
         elif type(x) == np.ndarray:
@@ -133,6 +182,15 @@ class IpolBase():
                 raise Exception('Cannot deal wih 3-d arrays, yet.')
         return x
 
+    def _make_tree(self, src):
+        """
+        Returns a kd-tree of the source points, unless `src` is a
+        :class:`scipy:scipy.spatial.cKDTree` already.
+        """
+        if isinstance(src, cKDTree):
+            return src
+        return cKDTree(self._make_coord_arrays(src))
+
     def _make_2d(self, vals):
         """Reshape increase number of dimensions of vals if smaller than 2,
         appending additional dimensions (as opposed to the atleast_nd methods
@@ -160,16 +218,21 @@ class IpolBase():
 
 class Nearest(IpolBase):
     """
-    Nearest(src, trg)
+    Nearest(src, trg, workers=1)
 
     Nearest-neighbour interpolation in N dimensions.
 
     Parameters
     ----------
     src : ndarray of floats, shape (npoints, ndims)
-        Data point coordinates of the source points.
+        Data point coordinates of the source points, or a
+        :class:`scipy:scipy.spatial.cKDTree` of the source points in order
+        to share it among several interpolators.
     trg : ndarray of floats, shape (npoints, ndims)
         Data point coordinates of the target points.
+    workers : int
+        number of parallel workers of the neighbour query, -1 means all
+        processors
 
     Examples
     --------
@@ -182,8 +245,10 @@ class Nearest(IpolBase):
 
     """
 
-    def __init__(self, src, trg):
-        src = self._make_coord_arrays(src)
+    def __init__(self, src, trg, workers=1):
+        # plant a tree
+        self.tree = self._make_tree(src)
+        src = self.tree.data
         trg = self._make_coord_arrays(trg)
         # remember some things
         self.numtargets = len(trg)
@@ -192,9 +257,12 @@ class Nearest(IpolBase):
         self.numsources = len(src)
         if self.numsources == 0:
             raise MissingSourcesError
-        # plant a tree
-        self.tree = cKDTree(src)
-        self.dists, self.ix = self.tree.query(trg, k=1)
+        self._set_neighbours(*_query(self.tree, trg, 1, workers))
+
+    def _set_neighbours(self, dists, ix):
+        """Sets the nearest neighbours of the target points."""
+        self.dists = dists.reshape(-1)
+        self.ix = ix.reshape(-1)
 
     def __call__(self, vals, maxdist=None):
         """
@@ -220,21 +288,46 @@ class Nearest(IpolBase):
         else:
             return np.where(self.dists > maxdist, np.nan, out)
 
+    def to_sparse(self, maxdist=None):
+        """
+        Export the interpolator as sparse matrix, see
+        :meth:`IpolBase.to_sparse`.
+
+        Parameters
+        ----------
+        maxdist : the maximum distance up to which an interpolated values is
+            assigned, rows of targets exceeding maxdist are left empty
+        """
+        weights = np.ones(self.ix.shape)
+        if maxdist is not None:
+            weights[self.dists > maxdist] = np.nan
+        return _sparse_weights(self.ix, weights, self.numsources)
+
 
 class Idw(IpolBase):
     """
-    Idw(src, trg, nnearest=4, p=2.)
+    Idw(src, trg, nnearest=4, p=2., workers=1)
 
     Inverse distance weighting interpolation in N dimensions.
 
+    The normalized weights of the `nnearest` neighbours of all target points
+    are computed once on initialisation (attribute `weights`, shape
+    (numtargets, nnearest)), so that repeated calls for many fields only
+    gather and sum the weighted source values.
+
     Parameters
     ----------
     src : ndarray of floats, shape (npoints, ndims)
-        Data point coordinates of the source points.
+        Data point coordinates of the source points, or a
+        :class:`scipy:scipy.spatial.cKDTree` of the source points in order
+        to share it among several interpolators.
     trg : ndarray of floats, shape (npoints, ndims)
         Data point coordinates of the target points.
     nnearest : integer - max. number of neighbours to be considered
     p : float - inverse distance power used in 1/dist**p
+    workers : int
+        number of parallel workers of the neighbour query, -1 means all
+        processors
 
     Examples
     --------
@@ -246,8 +339,10 @@ class Idw(IpolBase):
 
     """
 
-    def __init__(self, src, trg, nnearest=4, p=2.):
-        src = self._make_coord_arrays(src)
+    def __init__(self, src, trg, nnearest=4, p=2., workers=1):
+        # plant a tree
+        self.tree = self._make_tree(src)
+        src = self.tree.data
         trg = self._make_coord_arrays(trg)
         # remember some things
         self.numtargets = len(trg)
@@ -267,15 +362,56 @@ class Idw(IpolBase):
         else:
             self.nnearest = nnearest
         self.p = p
-        # plant a tree
-        self.tree = cKDTree(src)
-        self.dists, self.ix = self.tree.query(trg, k=self.nnearest)
+        self.trg = trg
+        self.workers = workers
+        self._set_neighbours(*_query(self.tree, trg, self.nnearest, workers))
+
+    def _set_neighbours(self, dists, ix):
+        """Sets the neighbours of the target points and computes their
+        weights."""
         # avoid bug, if there is only one neighbor at all
-        if self.dists.ndim == 1:
-            self.dists = self.dists[:, np.newaxis]
-            self.ix = self.ix[:, np.newaxis]
+        if dists.ndim == 1:
+            dists = dists[:, np.newaxis]
+            ix = ix[:, np.newaxis]
+        self.dists, self.ix = dists, ix
+        self.nnearest = ix.shape[1]
+        self.weights, self._wix = self._idw_weights(self.dists, self.ix)
+
+    def _idw_weights(self, dists, ix):
+        """
+        Normalized inverse distance weights of the neighbours.
 
-    def __call__(self, vals):
+        Neighbours with non-finite distance get zero weight, a target point
+        which coincides with a source point gets the value of that source
+        point and target points without any valid neighbour get NaN weights.
+        The indices of zero weight neighbours are redirected to the nearest
+        neighbour, so that they do not introduce NaNs.
+
+        Returns
+        -------
+        weights : ndarray of float, shape (numtargets, nnearest)
+        ix : ndarray of int, shape (numtargets, nnearest)
+        """
+        valid = np.isfinite(dists)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            if dists.shape[1] == 1:
+                # defaults to nearest neighbour
+                weights = np.ones(dists.shape)
+            else:
+                # weight z values by (1/dist)**p --
+                weights = 1. / dists ** self.p
+            weights[~valid] = 0.
+            # if a target point coincides with a source point
+            coincident = dists[:, 0] < 1e-10
+            weights[coincident] = 0.
+            weights[coincident, 0] = 1.
+            weights /= weights.sum(axis=1, keepdims=True)
+        # neighbours without weight point to the nearest neighbour
+        ix = np.where(valid & ~coincident[:, np.newaxis], ix, ix[:, :1])
+        ix = np.minimum(ix, self.numsources - 1)
+        return weights, ix
+
+    def __call__(self, vals, out=None, dtype=None):
         """
         Evaluate interpolator for values given at the source points.
 
@@ -283,51 +419,75 @@ class Idw(IpolBase):
         ----------
         vals : ndarray of float, shape (numsourcepoints, ...)
             Values at the source points which to interpolate
-        maxdist : the maximum distance up to which an interpolated values is
-            assigned - if maxdist is exceeded, np.nan will be assigned
-            If maxdist==None, values will be assigned everywhere
+        out : ndarray of float, shape (numtargetpoints, ...)
+            Array to place the result in, optional
+        dtype : numpy dtype
+            Data type of the output, if `out` is not given, defaults to the
+            floating point type of `vals`
 
         Returns
         -------
         output : ndarray of float with shape (numtargetpoints,...)
 
         """
-
-        # self distances: a list of arrays of distances of the nearest points
-        # which are indicated by self.ix
         self._check_shape(vals)
-        outshape = list(vals.shape)
-        outshape[0] = len(self.dists)
-        interpol = (np.repeat(np.nan, util._shape2size(outshape)).
-                    reshape(tuple(outshape)).astype('f4'))
-        # weights is the container for the weights (a list)
-        weights = list(range(len(self.dists)))
-        # sources is the container for the source point indices
-        src_ix = list(range(len(self.dists)))
-        # jinterpol is the jth element of interpol
-        jinterpol = 0
-        for dist, ix in zip(self.dists, self.ix):
-            valid_dists = np.where(np.isfinite(dist))[0]
-            dist = dist[valid_dists]
-            ix = ix[valid_dists]
-            if self.nnearest == 1:
-                # defaults to nearest neighbour
-                wz = vals[ix]
-                w = 1.
-            elif dist[0] < 1e-10:
-                # if a target point coincides with a source point
-                wz = vals[ix[0]]
-                w = 1.
-            else:
-                # weight z values by (1/dist)**p --
-                w = 1. / dist ** self.p
-                w /= np.sum(w)
-                wz = np.dot(w, vals[ix])
-            interpol[jinterpol] = wz.ravel()
-            weights[jinterpol] = w
-            src_ix[jinterpol] = ix
-            jinterpol += 1
-        return interpol  # if self.qdim > 1  else interpol[0]
+        return _weighted_sum(np.asanyarray(vals), self._wix, self.weights,
+                             out=out, dtype=dtype)
+
+    def to_sparse(self):
+        """
+        Export the interpolator as sparse matrix, see
+        :meth:`IpolBase.to_sparse`.
+        """
+        return _sparse_weights(self._wix, self.weights, self.numsources)
+
+    def subset(self, ix):
+        """
+        Returns the interpolator from a subset of the source points.
+
+        The neighbours of the target points are taken from the neighbour
+        table of this interpolator. Only target points with neighbours
+        outside of the subset are queried again.
+
+        .. versionadded:: 0.12.0
+
+        Parameters
+        ----------
+        ix : ndarray of int
+            indices of the source points of the subset
+
+        Returns
+        -------
+        output : :class:`Idw`
+
+        """
+        ix = np.asarray(ix, dtype=np.intp)
+        if len(ix) == 0:
+            raise MissingSourcesError
+        new = Idw.__new__(Idw)
+        new.tree = cKDTree(self.tree.data[ix])
+        new.trg = self.trg
+        new.workers = self.workers
+        new.numsources = len(ix)
+        new.numtargets = self.numtargets
+        new.p = self.p
+        nnearest = min(self.nnearest, len(ix))
+        if nnearest < self.nnearest:
+            new._set_neighbours(*_query(new.tree, new.trg, nnearest,
+                                        new.workers))
+            return new
+        # map the neighbours to the subset
+        subset_ix = np.full(self.numsources, -1, dtype=np.intp)
+        subset_ix[ix] = np.arange(len(ix))
+        nbrs = subset_ix[self.ix]
+        dists = self.dists.copy()
+        affected = np.flatnonzero((nbrs < 0).any(axis=1))
+        if len(affected):
+            d, i = _query(new.tree, new.trg[affected], nnearest, new.workers)
+            dists[affected] = d.reshape(len(affected), nnearest)
+            nbrs[affected] = i.reshape(len(affected), nnearest)
+        new._set_neighbours(dists, nbrs)
+        return new
 
 
 class Linear(IpolBase):
@@ -381,10 +541,297 @@ class Linear(IpolBase):
         ip = LinearNDInterpolator(self.src, vals, fill_value=fill_value)
         return ip(self.trg)
 
+    def to_sparse(self):
+        """
+        Export the interpolator as sparse matrix of barycentric weights,
+        see :meth:`IpolBase.to_sparse`.
+        """
+        tri = Delaunay(self.src)
+        simplex = tri.find_simplex(self.trg)
+        ndim = self.src.shape[1]
+        trans = tri.transform[simplex]
+        bary = np.einsum('ijk,ik->ij', trans[:, :ndim],
+                         self.trg - trans[:, ndim])
+        weights = np.hstack([bary, 1. - bary.sum(axis=1, keepdims=True)])
+        weights[simplex == -1] = np.nan
+        return _sparse_weights(tri.simplices[simplex], weights,
+                               self.numsources)
+
+
+class RegularGrid(IpolBase):
+    """
+    RegularGrid(src, trg, method='linear', fill_value=np.nan)
+
+    Interpolation from a regular cartesian grid in two dimensions.
+
+    The fractional grid indices of the target points and the weights of
+    their interpolation stencils are computed once on initialisation
+    (attributes `ix` and `weights`, shape (numtargets, stencil size)), so
+    that any number of fields can be interpolated with a few gathers and
+    sums, without a triangulation or a kd-tree.
+
+    .. versionadded:: 0.12.0
+
+    Parameters
+    ----------
+    src : ndarray of floats, shape (ny, nx, 2)
+        Coordinates (x, y) of the regular source grid with x varying along
+        the second and y along the first axis, with origin 'lower' or
+        'upper'.
+    trg : ndarray of floats, shape (..., 2)
+        Data point coordinates of the target points.
+    method : string
+        'nearest', 'linear' (bilinear, 2x2 stencil) or 'cubic' (cubic
+        convolution, 4x4 stencil)
+    fill_value : float
+        value of target points outside of the source grid
+
+    See Also
+    --------
+    PolarGrid
+    cart2irregular_interp
+    cart2irregular_spline
+
+    Note
+    ----
+    The cubic method uses the local cubic convolution kernel of Keys (1981),
+    which differs from the Clough-Tocher scheme of
+    :func:`scipy:scipy.interpolate.griddata` and from the spline
+    interpolation of :func:`scipy:scipy.ndimage.map_coordinates`.
+
+    Examples
+    --------
+    >>> x, y = np.meshgrid(np.arange(4.), np.arange(3.))
+    >>> grid = np.dstack((x, y))
+    >>> ip = RegularGrid(grid, np.array([[0.5, 0.5], [2.5, 1.], [5., 0.]]))
+    >>> ip(x + 10. * y)
+    array([ 5.5, 12.5,  nan])
+
+    """
+
+    def __init__(self, src, trg, method='linear', fill_value=np.nan):
+        src = np.asanyarray(src)
+        assert src.ndim == 3 and src.shape[-1] == 2, \
+            'Source grid must be of shape (ny, nx, 2).'
+        self.shape = src.shape[:2]
+        assert min(self.shape) > 1, 'Source grid must be two dimensional.'
+        trg = np.asanyarray(trg).reshape(-1, 2)
+        ny, nx = self.shape
+        x0 = src[0, 0, 0]
+        y0 = src[0, 0, 1]
+        fx = (trg[:, 0] - x0) * (nx - 1) / (src[0, -1, 0] - x0)
+        fy = (trg[:, 1] - y0) * (ny - 1) / (src[-1, 0, 1] - y0)
+        self._set_stencils(fy, fx, method, fill_value)
+
+    def _set_stencils(self, fy, fx, method, fill_value, periodic=False):
+        """Sets up the stencils of the fractional indices `fy` and `fx`,
+        with the first axis being periodic optionally.
+        """
+        self.method = method
+        self.fill_value = fill_value
+        self.numsources = self.shape[0] * self.shape[1]
+        self.numtargets = len(fx)
+        if self.numtargets == 0:
+            raise MissingTargetsError
+        iy, wy = _grid_stencil(fy, self.shape[0], method, periodic)
+        ix, wx = _grid_stencil(fx, self.shape[1], method)
+        self.ix = (iy[:, :, np.newaxis] * self.shape[1] +
+                   ix[:, np.newaxis, :]).reshape(self.numtargets, -1)
+        self.weights = (wy[:, :, np.newaxis] *
+                        wx[:, np.newaxis, :]).reshape(self.numtargets, -1)
+        self.outside = np.isnan(self.weights[:, 0])
+        self.weights[self.outside] = 0.
+
+    def __call__(self, vals, out=None, dtype=None):
+        """
+        Evaluate interpolator for values given at the source points.
+
+        Parameters
+        ----------
+        vals : ndarray of float, shape (ny, nx, ...) or (ny * nx, ...)
+            Values at the source grid which to interpolate
+        out : ndarray of float, shape (numtargetpoints, ...)
+            Array to place the result in, optional
+        dtype : numpy dtype
+            Data type of the output, if `out` is not given, defaults to the
+            floating point type of `vals`
+
+        Returns
+        -------
+        output : ndarray of float with shape (numtargetpoints,...)
+
+        """
+        vals = np.asanyarray(vals)
+        if vals.shape[:2] == self.shape:
+            vals = vals.reshape((self.numsources,) + vals.shape[2:])
+        self._check_shape(vals)
+        out = _weighted_sum(vals, self.ix, self.weights, out=out,
+                            dtype=dtype)
+        out[self.outside] = self.fill_value
+        return out
+
+    def to_sparse(self):
+        """
+        Export the interpolator as sparse matrix, see
+        :meth:`IpolBase.to_sparse`.
+        """
+        weights = self.weights.copy()
+        weights[self.outside] = np.nan
+        return _sparse_weights(self.ix, weights, self.numsources)
+
+
+class PolarGrid(RegularGrid):
+    """
+    PolarGrid(azimuths, ranges, trg, method='linear', fill_value=np.nan)
+
+    Interpolation from the polar grid of a radar sweep in two dimensions.
+
+    The regular (azimuth, range) structure of the sweep is exploited like in
+    :class:`RegularGrid`, and the stencils wrap around in azimuth. This is
+    e.g. suitable to remap sweeps onto cartesian grids.
+
+    .. versionadded:: 0.12.0
+
+    Parameters
+    ----------
+    azimuths : ndarray of floats, shape (nazimuths,)
+        equidistant azimuth angles of the beams of the full sweep in degrees
+        (clockwise from north)
+    ranges : ndarray of floats, shape (nranges,)
+        equidistant ranges of the range bins
+    trg : ndarray of floats, shape (..., 2)
+        Cartesian coordinates (x, y) of the target points relative to the
+        radar site, in the units of `ranges`.
+    method : string
+        'nearest', 'linear' or 'cubic', see :class:`RegularGrid`
+    fill_value : float
+        value of target points outside of the range of the sweep
+
+    See Also
+    --------
+    RegularGrid
+
+    Examples
+    --------
+    >>> az = np.arange(0., 360., 90.)
+    >>> r = np.arange(1., 4.)
+    >>> ip = PolarGrid(az, r, np.array([[0., 2.], [1., 1.], [0., 5.]]))
+    >>> ip(np.arange(12.).reshape(4, 3))
+    array([1.        , 1.91421356,        nan])
+
+    """
+
+    def __init__(self, azimuths, ranges, trg, method='linear',
+                 fill_value=np.nan):
+        azimuths = np.asanyarray(azimuths)
+        ranges = np.asanyarray(ranges)
+        self.shape = (len(azimuths), len(ranges))
+        assert min(self.shape) > 1, 'Sweep must be two dimensional.'
+        trg = np.asanyarray(trg).reshape(-1, 2)
+        fr = ((np.hypot(trg[:, 0], trg[:, 1]) - ranges[0]) *
+              (len(ranges) - 1) / (ranges[-1] - ranges[0]))
+        az = np.degrees(np.arctan2(trg[:, 0], trg[:, 1]))
+        fa = np.mod((az - azimuths[0]) * len(azimuths) / 360., len(azimuths))
+        self._set_stencils(fa, fr, method, fill_value, periodic=True)
+
 
 # -----------------------------------------------------------------------------
 # Covariance routines needed for Kriging
 # -----------------------------------------------------------------------------
+def _check_chunksize(chunksize):
+    """Returns `chunksize` as positive integer."""
+    step = int(chunksize)
+    if step < 1:
+        raise ValueError('chunksize must be a positive integer, got %r.' %
+                         (chunksize,))
+    return step
+
+
+def _chunks(n, chunksize):
+    """Yields slices of at most `chunksize` out of `n` items."""
+    step = _check_chunksize(chunksize)
+    for start in range(0, n, step):
+        yield slice(start, start + step)
+
+
+def _neighbour_sets(ix):
+    """Unique sets of neighbours of the targets.
+
+    Parameters
+    ----------
+    ix : ndarray of int, shape (ntargets, nnearest)
+        indices of the neighbours of each target
+
+    Returns
+    -------
+    sets : ndarray of int, shape (nsets, nnearest)
+        unique sets of neighbours, in ascending order
+    inverse : ndarray of int, shape (ntargets,)
+        index of the set of each target
+    order : ndarray of int, shape (ntargets, nnearest)
+        order of the neighbours of each target within its set
+    """
+    order = np.argsort(ix, axis=-1, kind='mergesort')
+    sets, inverse = np.unique(_take_rows(ix, order), axis=0,
+                              return_inverse=True)
+    return sets, inverse.ravel(), order
+
+
+def _take_rows(arr, order):
+    """Reorders the columns of each row of `arr`."""
+    return arr[np.arange(len(arr))[:, np.newaxis], order]
+
+
+def _untake_rows(arr, order):
+    """Reverts :func:`_take_rows` for the first columns of `arr`, further
+    columns (e.g. lagrange multipliers) are kept."""
+    out = arr.copy()
+    out[np.arange(len(arr))[:, np.newaxis], order] = arr[:, :order.shape[1]]
+    return out
+
+
+def _distance_matrix(src):
+    """Euclidean distance matrices of stacks of points of shape
+    (..., npoints, ndims)."""
+    diff = src[..., :, np.newaxis, :] - src[..., np.newaxis, :, :]
+    return np.sqrt(np.sum(diff ** 2, axis=-1))
+
+
+def _solve_kriging_systems(matrix, inverse, rhs, singular=None):
+    """Solves a stack of kriging systems at once.
+
+    Parameters
+    ----------
+    matrix : ndarray of float, shape (nsystems, n, n)
+        kriging matrices of the unique neighbour configurations
+    inverse : ndarray of int, shape (ntargets,)
+        index of the kriging matrix of each target
+    rhs : ndarray of float, shape (ntargets, n)
+        right hand sides of the targets
+    singular : float
+        value of the weights of singular systems, by default a
+        :class:`numpy:numpy.linalg.LinAlgError` is raised
+
+    Returns
+    -------
+    weights : ndarray of float, shape (ntargets, n)
+    """
+    matrix = matrix[inverse]
+    try:
+        return np.linalg.solve(matrix, rhs[..., np.newaxis])[..., 0]
+    except np.linalg.LinAlgError:
+        if singular is None:
+            raise
+    # solve one by one to find the singular systems
+    weights = np.empty(rhs.shape)
+    for i in range(len(rhs)):
+        try:
+            weights[i] = np.linalg.solve(matrix[i], rhs[i])
+        except np.linalg.LinAlgError:
+            weights[i] = singular
+    return weights
+
+
 def parse_covariogram(cov_model):
     """"""
     patterns = [re.compile('([\d\.]+) Nug\(([\d\.]+)\)'),  # nugget
@@ -511,7 +958,8 @@ def cov_cau(h, sill=1., rng=1., alpha=1., beta=1.0):
 class OrdinaryKriging(IpolBase):
     """Interpolate using Ordinary Kriging.
 
-    OrdinaryKriging(src, trg, cov='1.0 Exp(10000.)', nnearest=12)
+    OrdinaryKriging(src, trg, cov='1.0 Exp(10000.)', nnearest=12,
+                    chunksize=10000, workers=1)
 
     (Co-)Variogram definitions are given in the syntax that ``gstat`` uses.
     It allows nesting of different basic variogram types using linear
@@ -542,18 +990,28 @@ class OrdinaryKriging(IpolBase):
     Parameters
     ----------
     src : ndarray of floats, shape (npoints, ndims)
-        Data point coordinates of the source points.
+        Data point coordinates of the source points, or a
+        :class:`scipy:scipy.spatial.cKDTree` of the source points in order
+        to share it among several interpolators.
     trg : ndarray of floats, shape (npoints, ndims)
         Data point coordinates of the target points.
     cov : string
         covariance (variogram) model string in the syntax ``gstat``
         uses.
     nnearest : integer - max. number of neighbours to be considered
+    chunksize : int
+        number of target points whose kriging systems are set up and solved
+        at once, must be positive
+    workers : int
+        number of parallel workers of the neighbour query, -1 means all
+        processors
 
     Note
     ----
     The class calculates the Kriging weights during initialization, because
-    these only depend on the configuration of the points.
+    these only depend on the configuration of the points. The kriging
+    systems of `chunksize` targets are solved at once, and are only set up
+    once for targets sharing the same neighbours (e.g. on regular grids).
 
     The call method is then only used to calculate estimated values at the
     target points based on those at the source points. Therefore the main
@@ -568,15 +1026,18 @@ class OrdinaryKriging(IpolBase):
     See :ref:`notebooks/interpolation/wradlib_ipol_example.ipynb`.
     """
 
-    def __init__(self, src, trg, cov='1.0 Exp(10000.)', nnearest=12):
+    def __init__(self, src, trg, cov='1.0 Exp(10000.)', nnearest=12,
+                 chunksize=10000, workers=1):
         """"""
-        self.src = self._make_coord_arrays(src)
+        # plant a tree
+        self.tree = self._make_tree(src)
+        self.src = self.tree.data
         self.trg = self._make_coord_arrays(trg)
         # remember some things
-        self.numtargets = len(trg)
+        self.numtargets = len(self.trg)
         if self.numtargets == 0:
             raise MissingTargetsError
-        self.numsources = len(src)
+        self.numsources = len(self.src)
         if self.numsources == 0:
             raise MissingSourcesError
         if nnearest > self.numsources:
@@ -590,52 +1051,62 @@ class OrdinaryKriging(IpolBase):
             self.nnearest = self.numsources
         else:
             self.nnearest = nnearest
-        # plant a tree
-        self.tree = cKDTree(src)
-        self.dists, self.ix = self.tree.query(trg, k=self.nnearest)
-        # avoid bug, if there is only one neighbor at all
-        if self.dists.ndim == 1:
-            self.dists = self.dists[:, np.newaxis]
-            self.ix = self.ix[:, np.newaxis]
         # parse covariogram function string
         self.cov_func = parse_covariogram(cov)
-        self.weights = []
-        self.estimation_variance = []
+        self.chunksize = _check_chunksize(chunksize)
+        self._set_neighbours(*_query(self.tree, self.trg, self.nnearest,
+                                     workers))
+
+    def _set_neighbours(self, dists, ix):
+        """Sets the neighbours of the target points and does the
+        kriging."""
+        # avoid bug, if there is only one neighbor at all
+        if dists.ndim == 1:
+            dists = dists[:, np.newaxis]
+            ix = ix[:, np.newaxis]
+        self.dists, self.ix = dists, ix
+        self.nnearest = ix.shape[1]
         # do the kriging
-        self._krige()
+        self.weights, self.estimation_variance = self._krige()
 
     def _krig_matrix(self, src):
-        """Sets up the kriging system for a configuration of source points.
+        """Sets up the kriging systems for stacks of configurations of source
+        points of shape (..., nnearest, ndims).
         """
-        var_matrix = self.cov_func(scipy.spatial.distance_matrix(src, src))
+        var_matrix = self.cov_func(_distance_matrix(src))
 
-        ok_matrix = np.ones((len(src) + 1, len(src) + 1))
+        n = src.shape[-2]
+        ok_matrix = np.ones(src.shape[:-2] + (n + 1, n + 1))
 
-        ok_matrix[:-1, :-1] = var_matrix
-        ok_matrix[-1, -1] = 0.
+        ok_matrix[..., :-1, :-1] = var_matrix
+        ok_matrix[..., -1, -1] = 0.
 
         return ok_matrix
 
     def _krig_rhs(self, dists):
-        """Sets up a right hand side of the kriging system given the distances
-        of the target to the source points. To be used in conjunction with
-        `_krig_matrix`."""
+        """Sets up the right hand sides of the kriging systems given the
+        distances of the targets to the source points. To be used in
+        conjunction with `_krig_matrix`."""
         rhs = self.cov_func(dists)
-        ok_rhs = np.concatenate([rhs, [1.]])
+        ok_rhs = np.ones(rhs.shape[:-1] + (rhs.shape[-1] + 1,))
+        ok_rhs[..., :-1] = rhs
 
         return ok_rhs
 
     def _krige(self):
-        """Sets up the kriging system and solves it in order to obtain the
+        """Sets up the kriging systems and solves them in order to obtain the
         interpolation weights of ordinary kriging.
         Also calculates the kriging estimation variance from the results"""
-        for dist, ix in zip(self.dists, self.ix):
-            matrix = self._krig_matrix(self.src[ix, :])
-            rhs = self._krig_rhs(dist)
-            weights = np.linalg.solve(matrix, rhs)
-            self.weights.append(weights)
-            self.estimation_variance.append(self.cov_func(0.) -
-                                            np.sum(weights * rhs))
+        weights = np.empty((self.numtargets, self.nnearest + 1))
+        variances = np.empty(self.numtargets)
+        for sl in _chunks(self.numtargets, self.chunksize):
+            ix, inverse, order = _neighbour_sets(self.ix[sl])
+            matrix = self._krig_matrix(self.src[ix])
+            rhs = self._krig_rhs(_take_rows(self.dists[sl], order))
+            wght = _solve_kriging_systems(matrix, inverse, rhs)
+            variances[sl] = self.cov_func(0.) - np.sum(wght * rhs, axis=-1)
+            weights[sl] = _untake_rows(wght, order)
+        return weights, variances
 
     def __call__(self, vals):
         """
@@ -664,18 +1135,29 @@ class OrdinaryKriging(IpolBase):
 
         return ip
 
+    def to_sparse(self):
+        """
+        Export the interpolator as sparse matrix, see
+        :meth:`IpolBase.to_sparse`.
+        """
+        weights = np.array(self.weights)[:, :-1]
+        return _sparse_weights(self.ix, weights, self.numsources)
+
 
 class ExternalDriftKriging(IpolBase):
     """
     ExternalDriftKriging(src, trg, cov='1.0 Exp(10000.)', nnearest=12,
-                         drift_src=None, drift_trg=None)
+                         src_drift=None, trg_drift=None, chunksize=10000,
+                         workers=1)
 
     Kriging with external drift
 
     Parameters
     ----------
     src : ndarray of floats, shape (nsrcpoints, ndims)
-        Data point coordinates of the source points.
+        Data point coordinates of the source points, or a
+        :class:`scipy:scipy.spatial.cKDTree` of the source points in order
+        to share it among several interpolators.
     trg : ndarray of floats, shape (ntrgpoints, ndims)
         Data point coordinates of the target points.
     cov : string
@@ -687,6 +1169,12 @@ class ExternalDriftKriging(IpolBase):
         values of the external drift at each source point
     trg_drift : ndarray of floats, shape (ntrgpoints,)
         values of the external drift at each target point
+    chunksize : int
+        number of target points whose kriging systems are set up and solved
+        at once, must be positive
+    workers : int
+        number of parallel workers of the neighbour query, -1 means all
+        processors
 
     See Also
     --------
@@ -707,17 +1195,19 @@ class ExternalDriftKriging(IpolBase):
     """
 
     def __init__(self, src, trg, cov='1.0 Exp(10000.)', nnearest=12,
-                 src_drift=None, trg_drift=None):
+                 src_drift=None, trg_drift=None, chunksize=10000, workers=1):
         """"""
-        self.src = self._make_coord_arrays(src)
+        # plant a tree
+        self.tree = self._make_tree(src)
+        self.src = self.tree.data
         self.trg = self._make_coord_arrays(trg)
         self.src_drift = src_drift
         self.trg_drift = trg_drift
         # remember some things
-        self.numtargets = len(trg)
+        self.numtargets = len(self.trg)
         if self.numtargets == 0:
             raise MissingTargetsError
-        self.numsources = len(src)
+        self.numsources = len(self.src)
         if self.numsources == 0:
             raise MissingSourcesError
         if nnearest > self.numsources:
@@ -731,66 +1221,75 @@ class ExternalDriftKriging(IpolBase):
             self.nnearest = self.numsources
         else:
             self.nnearest = nnearest
-        # plant a tree
-        self.tree = cKDTree(src)
-        self.dists, self.ix = self.tree.query(trg, k=self.nnearest)
-        # avoid bug, if there is only one neighbor at all
-        if self.dists.ndim == 1:
-            self.dists = self.dists[:, np.newaxis]
-            self.ix = self.ix[:, np.newaxis]
         # parse covariogram function string
         self.cov_func = parse_covariogram(cov)
+        self.chunksize = _check_chunksize(chunksize)
+        self._set_neighbours(*_query(self.tree, self.trg, self.nnearest,
+                                     workers))
+
+    def _set_neighbours(self, dists, ix):
+        """Sets the neighbours of the target points."""
+        # avoid bug, if there is only one neighbor at all
+        if dists.ndim == 1:
+            dists = dists[:, np.newaxis]
+            ix = ix[:, np.newaxis]
+        self.dists, self.ix = dists, ix
+        self.nnearest = ix.shape[1]
         self.weights = []
         self.estimation_variance = []
 
     def _krig_matrix(self, src, drift):
-        """Sets up the kriging system for a configuration of source points.
+        """Sets up the kriging systems for stacks of configurations of source
+        points of shape (..., nnearest, ndims) and their drift values of
+        shape (..., nnearest).
         """
         # the basic covariance matrix
-        var_matrix = self.cov_func(scipy.spatial.distance_matrix(src, src))
+        var_matrix = self.cov_func(_distance_matrix(src))
         # the extended matrix, initialized to ones
-        edk_matrix = np.ones((len(src) + 2, len(src) + 2))
+        n = src.shape[-2]
+        edk_matrix = np.ones(src.shape[:-2] + (n + 2, n + 2))
 
         # adding entries for the first lagrange multiplier for the ordinary
         # kriging part
-        edk_matrix[:-2, :-2] = var_matrix
-        edk_matrix[-2, -2] = 0.
+        edk_matrix[..., :-2, :-2] = var_matrix
+        edk_matrix[..., -2, -2] = 0.
 
         # adding entries for the second lagrange multiplier for the  edk part
-        edk_matrix[:-2, -1] = drift
-        edk_matrix[-1, :-2] = drift
-        edk_matrix[-2:, -1] = 0.
-        edk_matrix[-1, -2:] = 0.
+        edk_matrix[..., :-2, -1] = drift
+        edk_matrix[..., -1, :-2] = drift
+        edk_matrix[..., -2:, -1] = 0.
+        edk_matrix[..., -1, -2:] = 0.
 
         return edk_matrix
 
     def _krig_rhs(self, dists, drift):
-        """Sets up a right hand side of the kriging system given the distances
-        of the target to the source points. To be used in conjunction with
-        `_krig_matrix`."""
+        """Sets up the right hand sides of the kriging systems given the
+        distances of the targets to the source points and the drift values
+        at the targets. To be used in conjunction with `_krig_matrix`."""
         rhs = self.cov_func(dists)
-        edk_rhs = np.concatenate([rhs, np.array([1., drift])])
+        edk_rhs = np.ones(rhs.shape[:-1] + (rhs.shape[-1] + 2,))
+        edk_rhs[..., :-2] = rhs
+        edk_rhs[..., -1] = drift
 
         return edk_rhs
 
     def _krige(self, src_drift, trg_drift):
-        """Sets up the kriging system and solves it in order to obtain the
-        interpolation weights of ordinary kriging.
+        """Sets up the kriging systems and solves them in order to obtain the
+        interpolation weights of external drift kriging.
         Also calculates the kriging estimation variance from the results"""
-        all_weights = []
-        estimation_variances = []
-        for dist, ix, td in zip(self.dists, self.ix, trg_drift):
-            matrix = self._krig_matrix(self.src[ix, :], src_drift[ix])
-            rhs = self._krig_rhs(dist, td)
-            try:
-                weights = np.linalg.solve(matrix, rhs)
-            except np.linalg.LinAlgError:
-                weights = np.repeat(np.nan, len(rhs))
-            all_weights.append(weights)
-            estimation_variances.append(self.cov_func(0.) -
-                                        np.sum(weights * rhs))
-
-        return all_weights, estimation_variances
+        trg_drift = np.broadcast_to(trg_drift, (self.numtargets,))
+        weights = np.empty((self.numtargets, self.nnearest + 2))
+        variances = np.empty(self.numtargets)
+        for sl in _chunks(self.numtargets, self.chunksize):
+            ix, inverse, order = _neighbour_sets(self.ix[sl])
+            matrix = self._krig_matrix(self.src[ix], src_drift[ix])
+            rhs = self._krig_rhs(_take_rows(self.dists[sl], order),
+                                 trg_drift[sl])
+            wght = _solve_kriging_systems(matrix, inverse, rhs,
+                                          singular=np.nan)
+            variances[sl] = self.cov_func(0.) - np.sum(wght * rhs, axis=-1)
+            weights[sl] = _untake_rows(wght, order)
+        return weights, variances
 
     def __call__(self, vals, src_drift=None, trg_drift=None):
         """
@@ -813,25 +1312,7 @@ class ExternalDriftKriging(IpolBase):
         assert vals.ndim <= 2
         v = self._make_2d(vals)
         self._check_shape(v)
-
-        if src_drift is None:
-            # check if we have data from __init__
-            if self.src_drift is None:
-                raise ValueError('src_drift must be specified either on '
-                                 'initialization or when calling '
-                                 'the interpolator.')
-            src_drift = self.src_drift
-        if trg_drift is None:
-            # check if we have data from __init__
-            if self.trg_drift is None:
-                raise ValueError('trg_drift must be specified either on '
-                                 'initialization or when calling the '
-                                 'interpolator.')
-            trg_drift = self.trg_drift
-
-        src_d = self._make_2d(src_drift)
-        trg_d = self._make_2d(trg_drift)
-        self._check_shape(src_d)
+        src_d, trg_d = self._get_drift(src_drift, trg_drift)
 
         # re-initialize weights and variances to ensure that these only reflect
         # the results of the current call and not any previous call
@@ -865,6 +1346,576 @@ class ExternalDriftKriging(IpolBase):
 
         return ip
 
+    def _get_drift(self, src_drift, trg_drift):
+        """Returns the drift terms given on call or on initialization as 2-d
+        arrays."""
+        if src_drift is None:
+            # check if we have data from __init__
+            if self.src_drift is None:
+                raise ValueError('src_drift must be specified either on '
+                                 'initialization or when calling '
+                                 'the interpolator.')
+            src_drift = self.src_drift
+        if trg_drift is None:
+            # check if we have data from __init__
+            if self.trg_drift is None:
+                raise ValueError('trg_drift must be specified either on '
+                                 'initialization or when calling the '
+                                 'interpolator.')
+            trg_drift = self.trg_drift
+
+        src_d = self._make_2d(src_drift)
+        trg_d = self._make_2d(trg_drift)
+        self._check_shape(src_d)
+        return src_d, trg_d
+
+    def to_sparse(self, src_drift=None, trg_drift=None):
+        """
+        Export the interpolator as sparse matrix, see
+        :meth:`IpolBase.to_sparse`.
+
+        This is only possible for drift terms which are constant over
+        multiple fields.
+
+        Parameters
+        ----------
+        src_drift : ndarray of floats, shape (nsrcpoints,)
+            values of the external drift at each source point
+        trg_drift : ndarray of floats, shape (ntrgpoints,)
+            values of the external drift at each target point
+        """
+        src_d, trg_d = self._get_drift(src_drift, trg_drift)
+        assert src_d.shape[1] == 1, \
+            'Drift terms varying over multiple fields cannot be exported.'
+        weights, variances = self._krige(src_d.squeeze(), trg_d.squeeze())
+        weights = np.array(weights)[:, :-2]
+        return _sparse_weights(self.ix, weights, self.numsources)
+
+
+class SparseInterpolator(IpolBase):
+    """
+    SparseInterpolator(matrix, fill_value=np.nan)
+
+    Interpolation by a precomputed sparse matrix of weights.
+
+    All interpolators of this module compute the target values as weighted
+    sums of the source values. Once exported with their `to_sparse` method,
+    the same geometry can be applied to many fields with a single sparse
+    matrix product. Further linear steps (e.g. the zonal means of
+    :meth:`wradlib.zonalstats.ZonalStatsBase.to_sparse`) can be combined
+    into one operator with :meth:`chain`.
+
+    .. versionadded:: 0.12.0
+
+    Parameters
+    ----------
+    matrix : :class:`scipy:scipy.sparse.spmatrix` or interpolator
+        weights of shape (numtargets, numsources) or an interpolator object
+        providing a `to_sparse` method. Rows without any entry mark target
+        points which cannot be interpolated.
+    fill_value : float
+        value of target points which cannot be interpolated
+
+    Examples
+    --------
+    >>> src = np.random.uniform(0, 10, (20, 2))
+    >>> trg = np.random.uniform(0, 10, (100, 2))
+    >>> ip = SparseInterpolator(Idw(src, trg))
+    >>> ip(np.random.uniform(size=(20, 288))).shape
+    (100, 288)
+
+    """
+
+    def __init__(self, matrix, fill_value=np.nan):
+        if isinstance(matrix, IpolBase):
+            matrix = matrix.to_sparse()
+        self.matrix = sparse.csr_matrix(matrix)
+        self.numtargets, self.numsources = self.matrix.shape
+        self.fill_value = fill_value
+        self.empty = np.diff(self.matrix.indptr) == 0
+
+    def __call__(self, vals):
+        """
+        Evaluate interpolator for values given at the source points.
+
+        Parameters
+        ----------
+        vals : ndarray of float, shape (numsourcepoints, ...)
+            Values at the source points which to interpolate
+
+        Returns
+        -------
+        output : ndarray of float with shape (numtargetpoints,...)
+
+        """
+        self._check_shape(vals)
+        vals = np.asanyarray(vals)
+        out = self.matrix.dot(vals.reshape(self.numsources, -1))
+        out[self.empty] = self.fill_value
+        return out.reshape((self.numtargets,) + vals.shape[1:])
+
+    def to_sparse(self):
+        """
+        Export the interpolator as sparse matrix, see
+        :meth:`IpolBase.to_sparse`.
+        """
+        return self.matrix
+
+    def chain(self, other):
+        """
+        Combine this interpolator with a subsequent linear step.
+
+        Parameters
+        ----------
+        other : :class:`scipy:scipy.sparse.spmatrix` or interpolator
+            weights of shape (num final targets, numtargets) or an
+            interpolator object providing a `to_sparse` method, which is
+            applied to the output of this interpolator
+
+        Returns
+        -------
+        output : :class:`SparseInterpolator`
+            applying both steps with a single matrix product. Final targets
+            depending on a target point of this interpolator which cannot be
+            interpolated cannot be interpolated either.
+        """
+        if isinstance(other, IpolBase):
+            other = other.to_sparse()
+        other = sparse.csr_matrix(other)
+        assert other.shape[1] == self.numtargets, \
+            ('Number of columns %d does not correspond to number '
+             'of target points %d' % (other.shape[1], self.numtargets))
+        matrix = other.dot(self.matrix).tocsr()
+        # propagate the targets which cannot be interpolated
+        invalid = abs(other).dot(self.empty.astype(float)) > 0
+        matrix = sparse.diags((~invalid).astype(float)).dot(matrix)
+        matrix.eliminate_zeros()
+        return SparseInterpolator(matrix, fill_value=self.fill_value)
+
+
+class NanInterpolator(IpolBase):
+    """
+    NanInterpolator(src, trg, Interpolator, *args, **kwargs)
+
+    Interpolation of many fields with missing values at the source points.
+
+    The fields (e.g. time steps) along the trailing dimensions of the values
+    are interpolated at once with an `Interpolator` using all source points.
+    Targets which are affected by missing (non-finite) source values are
+    then interpolated again, using only the valid source points. This is done
+    once for all fields sharing the same pattern of valid source points. The
+    interpolators of the most recently used patterns are cached, see
+    attribute `maxsize`.
+
+    .. versionadded:: 0.12.0
+
+    Parameters
+    ----------
+    src : ndarray of floats, shape (npoints, ndims)
+        Data point coordinates of the source points.
+    trg : ndarray of floats, shape (npoints, ndims)
+        Data point coordinates of the target points.
+    Interpolator : a class which inherits from IpolBase
+
+    Other Parameters
+    ----------------
+    *args : arguments of Interpolator (see class documentation)
+
+    Keyword Arguments
+    -----------------
+    **kwargs : keyword arguments of Interpolator (see class documentation),
+        `src_drift` and `trg_drift` of :class:`ExternalDriftKriging` are
+        subset accordingly
+
+    Examples
+    --------
+    >>> src = np.arange(10)[:, None]
+    >>> trg = np.linspace(0, 20, 40)[:, None]
+    >>> vals = np.random.uniform(size=(10, 24, 2))
+    >>> vals[3, ::2] = np.nan
+    >>> vals[5, 1::2] = np.nan
+    >>> ip = NanInterpolator(src, trg, Idw, nnearest=2)
+    >>> ip(vals).shape
+    (40, 24, 2)
+    >>> len(ip.cache)
+    2
+
+    """
+    maxsize = 32
+
+    def __init__(self, src, trg, Interpolator, *args, **kwargs):
+        self.src = self._make_coord_arrays(src)
+        self.trg = self._make_coord_arrays(trg)
+        self.numsources = len(self.src)
+        self.numtargets = len(self.trg)
+        self.Interpolator = Interpolator
+        self.args = args
+        self.kwargs = kwargs
+        self.ip = Interpolator(self.src, self.trg, *args, **kwargs)
+        self.cache = _LRUCache(self.maxsize)
+
+    def _interpolator(self, valid, broken):
+        """Returns the (cached) interpolator from the valid source points to
+        the broken target points of a pattern.
+        """
+        def fit():
+            kwargs = dict(self.kwargs)
+            if kwargs.get('src_drift') is not None:
+                kwargs['src_drift'] = np.asanyarray(kwargs['src_drift'])[valid]
+            if kwargs.get('trg_drift') is not None:
+                trg_drift = np.asanyarray(kwargs['trg_drift'])
+                kwargs['trg_drift'] = trg_drift[broken]
+            return self.Interpolator(self.src[valid], self.trg[broken],
+                                     *self.args, **kwargs)
+        key = np.packbits(valid).tobytes() + np.packbits(broken).tobytes()
+        self.cache.maxsize = self.maxsize
+        return self.cache.get(key, fit)
+
+    def __call__(self, vals):
+        """
+        Evaluate interpolator for values given at the source points.
+
+        Parameters
+        ----------
+        vals : ndarray of float, shape (numsourcepoints, ...)
+            Values at the source points which to interpolate
+
+        Returns
+        -------
+        output : ndarray of float with shape (numtargetpoints,...)
+
+        """
+        self._check_shape(vals)
+        vals = np.asanyarray(vals)
+        v = vals.reshape((self.numsources, -1))
+        result = self.ip(v).reshape((self.numtargets, -1))
+        valid = np.isfinite(v)
+        patterns, inverse = np.unique(valid.T, axis=0, return_inverse=True)
+        inverse = inverse.ravel()
+        # fields with missing values, but at least one valid source point
+        for i in np.flatnonzero(patterns.any(axis=1) &
+                                ~patterns.all(axis=1)):
+            cols = np.flatnonzero(inverse == i)
+            broken = np.isnan(result[:, cols]).any(axis=1)
+            if not broken.any():
+                continue
+            ip = self._interpolator(patterns[i], broken)
+            tmp = ip(v[patterns[i]][:, cols])
+            result[np.ix_(broken, cols)] = tmp.reshape((-1, len(cols)))
+        return result.reshape((self.numtargets,) + vals.shape[1:])
+
+
+class TiledInterpolator(IpolBase):
+    """
+    TiledInterpolator(src, trg, Interpolator, *args, **kwargs)
+
+    Interpolation to large sets of target points, tile by tile.
+
+    Instead of querying the neighbours and computing the weights of all
+    target points at once, an `Interpolator` is set up for one tile of
+    `tilesize` target points at a time, and its results are written into the
+    output array. Thus, the memory consumption is bounded by the tile size,
+    and the output may as well be a :class:`numpy:numpy.memmap`. The kd-tree
+    of the source points is planted only once and shared by all tiles.
+
+    As the interpolators of the tiles are not kept, the values of many
+    fields (e.g. time steps) should be interpolated within one call.
+
+    .. versionadded:: 0.12.0
+
+    Parameters
+    ----------
+    src : ndarray of floats, shape (npoints, ndims)
+        Data point coordinates of the source points.
+    trg : ndarray of floats, shape (npoints, ndims)
+        Data point coordinates of the target points.
+    Interpolator : a class which inherits from IpolBase
+
+    Other Parameters
+    ----------------
+    *args : arguments of Interpolator (see class documentation)
+
+    Keyword Arguments
+    -----------------
+    tilesize : int
+        number of target points per tile, defaults to 100000
+    **kwargs : keyword arguments of Interpolator (see class documentation),
+        `trg_drift` of :class:`ExternalDriftKriging` is tiled accordingly.
+        Use `workers` of the tree based interpolators for parallel queries.
+
+    Examples
+    --------
+    >>> src = np.random.uniform(size=(100, 2))
+    >>> trg = np.random.uniform(size=(250000, 2))
+    >>> vals = np.random.uniform(size=(100, 3))
+    >>> ip = TiledInterpolator(src, trg, Idw, nnearest=4, tilesize=50000)
+    >>> ip(vals).shape
+    (250000, 3)
+
+    """
+
+    def __init__(self, src, trg, Interpolator, *args, **kwargs):
+        self.tilesize = kwargs.pop('tilesize', 100000)
+        self.tree = self._make_tree(src)
+        self.trg = self._make_coord_arrays(trg)
+        self.numsources = len(self.tree.data)
+        self.numtargets = len(self.trg)
+        if self.numtargets == 0:
+            raise MissingTargetsError
+        if self.numsources == 0:
+            raise MissingSourcesError
+        self.Interpolator = Interpolator
+        self.args = args
+        self.kwargs = kwargs
+
+    def tiles(self):
+        """Yields the slices of the target points of all tiles."""
+        return _chunks(self.numtargets, self.tilesize)
+
+    def interpolator(self, tile):
+        """
+        Returns the interpolator of the target points of a tile.
+
+        Parameters
+        ----------
+        tile : slice or ndarray of int
+            target points of the tile, see :meth:`tiles`
+
+        Returns
+        -------
+        output : instance of Interpolator
+
+        """
+        kwargs = dict(self.kwargs)
+        if kwargs.get('trg_drift') is not None:
+            kwargs['trg_drift'] = np.asanyarray(kwargs['trg_drift'])[tile]
+        return self.Interpolator(self.tree, self.trg[tile], *self.args,
+                                 **kwargs)
+
+    def __call__(self, vals, *args, **kwargs):
+        """
+        Evaluate interpolator for values given at the source points.
+
+        Parameters
+        ----------
+        vals : ndarray of float, shape (numsourcepoints, ...)
+            Values at the source points which to interpolate
+
+        Other Parameters
+        ----------------
+        *args : further arguments of the call of Interpolator, e.g.
+            `maxdist` of :class:`Nearest`
+
+        Keyword Arguments
+        -----------------
+        out : ndarray, optional
+            preallocated output array (e.g. :class:`numpy:numpy.memmap`) of
+            shape (numtargetpoints, ...), which is filled tile by tile
+        **kwargs : further keyword arguments of the call of Interpolator,
+            `trg_drift` of :class:`ExternalDriftKriging` is tiled
+            accordingly.
+
+        Returns
+        -------
+        output : ndarray of float with shape (numtargetpoints,...)
+
+        """
+        out = kwargs.pop('out', None)
+        self._check_shape(vals)
+        trg_drift = kwargs.get('trg_drift')
+        if trg_drift is not None:
+            trg_drift = np.asanyarray(trg_drift)
+        for tile in self.tiles():
+            if trg_drift is not None:
+                kwargs['trg_drift'] = trg_drift[tile]
+            result = self.interpolator(tile)(vals, *args, **kwargs)
+            if out is None:
+                out = np.empty((self.numtargets,) + result.shape[1:],
+                               dtype=result.dtype)
+            out[tile] = result
+        return out
+
+
+class _LRUCache(object):
+    """Least recently used cache of at most `maxsize` items, which hold
+    at most `maxbytes` bytes of arrays, if given."""
+
+    def __init__(self, maxsize=32, maxbytes=None):
+        self.maxsize = maxsize
+        self.maxbytes = maxbytes
+        self.nbytes = 0
+        self._items = OrderedDict()
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, key):
+        return key in self._items
+
+    def get(self, key, factory):
+        """Returns the cached item of `key`, or creates and caches it by
+        calling `factory`."""
+        try:
+            item, nbytes = self._items.pop(key)
+            self.nbytes -= nbytes
+        except KeyError:
+            item = factory()
+            nbytes = _nbytes(item)
+        self._items[key] = (item, nbytes)
+        self.nbytes += nbytes
+        while self._items and (
+                len(self._items) > max(self.maxsize, 0) or
+                (self.maxbytes is not None and self.nbytes > self.maxbytes)):
+            self.nbytes -= self._items.popitem(last=False)[1][1]
+        return item
+
+    def clear(self):
+        self._items.clear()
+        self.nbytes = 0
+
+
+def _nbytes(obj, depth=2):
+    """Estimates the memory of the arrays held by `obj` and its
+    attributes."""
+    if isinstance(obj, np.ndarray):
+        return obj.nbytes
+    if sparse.issparse(obj):
+        return sum(getattr(obj, name).nbytes
+                   for name in ['data', 'indices', 'indptr', 'row', 'col']
+                   if hasattr(obj, name))
+    if isinstance(obj, cKDTree):
+        return obj.data.nbytes + obj.indices.nbytes
+    if depth == 0:
+        return 0
+    if isinstance(obj, (list, tuple)):
+        return sum(_nbytes(item, depth - 1) for item in obj)
+    return sum(_nbytes(item, depth - 1)
+               for item in getattr(obj, '__dict__', {}).values())
+
+
+def _query(tree, x, k, workers=1):
+    """Queries the `k` nearest neighbours of `x` in `tree`, in parallel
+    for `workers` other than 1.
+    """
+    if workers == 1:
+        return tree.query(x, k=k)
+    try:
+        return tree.query(x, k=k, workers=workers)
+    except TypeError:
+        # scipy < 1.6
+        return tree.query(x, k=k, n_jobs=workers)
+
+
+def _drop_self(dists, ix):
+    """Drops the neighbour tables of the source points queried at
+    themselves by the point itself (or by the farthest neighbour, if the
+    point itself is not found due to duplicates).
+    """
+    n, k = ix.shape
+    is_self = ix == np.arange(n)[:, np.newaxis]
+    col = np.where(is_self.any(axis=1), is_self.argmax(axis=1), k - 1)
+    keep = np.ones(ix.shape, dtype=bool)
+    keep[np.arange(n), col] = False
+    return dists[keep].reshape(n, k - 1), ix[keep].reshape(n, k - 1)
+
+
+def _grid_stencil(f, n, method='linear', periodic=False):
+    """Indices and weights of the one-dimensional interpolation stencils of
+    the fractional indices `f` into an axis of length `n`.
+
+    Stencils exceeding the axis are clamped to its edges (or wrap around if
+    `periodic`), targets outside of the axis get NaN weights.
+
+    Returns
+    -------
+    ix : ndarray of int, shape (len(f), stencil size)
+    weights : ndarray of float, shape (len(f), stencil size)
+    """
+    f = np.asanyarray(f, dtype=float)
+    if method == 'nearest':
+        ix = np.floor(f + 0.5)[:, np.newaxis]
+        weights = np.ones(ix.shape)
+    else:
+        i0 = np.floor(f)
+        t = (f - i0)[:, np.newaxis]
+        if method == 'linear':
+            ix = i0[:, np.newaxis] + np.arange(2)
+            weights = np.hstack((1. - t, t))
+        elif method == 'cubic':
+            # cubic convolution (Keys, 1981) with a = -0.5
+            ix = i0[:, np.newaxis] + np.arange(-1, 3)
+            weights = np.hstack((((-0.5 * t + 1.) * t - 0.5) * t,
+                                 (1.5 * t - 2.5) * t * t + 1.,
+                                 ((-1.5 * t + 2.) * t + 0.5) * t,
+                                 (0.5 * t - 0.5) * t * t))
+        else:
+            raise ValueError("wradlib: unknown interpolation method "
+                             "'%s'." % method)
+    if periodic:
+        ix = np.mod(ix, n)
+    else:
+        outside = ~((f > -1e-6) & (f < n - 1 + 1e-6))
+        weights[outside] = np.nan
+        ix = np.clip(ix, 0, n - 1)
+    return ix.astype(np.intp), weights
+
+
+def _weighted_sum(vals, ix, weights, out=None, dtype=None):
+    """Sums up the weighted source values `vals` (numsources, ...) of the
+    neighbours `ix` (numtargets, k) of each target point.
+    """
+    outshape = (len(ix),) + vals.shape[1:]
+    if out is None:
+        if dtype is None:
+            dtype = np.result_type(vals.dtype, np.float32)
+        out = np.empty(outshape, dtype=dtype)
+    assert out.shape == outshape, \
+        ('Shape of output array %s does not correspond to %s'
+         % (out.shape, outshape))
+    wshape = (-1,) + (1,) * (vals.ndim - 1)
+    tmp = None
+    for k in range(ix.shape[1]):
+        w = weights[:, k].reshape(wshape)
+        wz = vals.take(ix[:, k], axis=0)
+        if k == 0:
+            np.multiply(wz, w, out=out)
+        else:
+            if tmp is None:
+                tmp = np.empty_like(out)
+            np.multiply(wz, w, out=tmp)
+            out += tmp
+    return out
+
+
+def _sparse_weights(ix, weights, numsources):
+    """Builds a sparse interpolation matrix from the source indices and
+    weights of the neighbours of each target point.
+
+    Rows with non-finite weights are left empty.
+
+    Parameters
+    ----------
+    ix : ndarray of int, shape (numtargets, nnearest)
+    weights : ndarray of float, shape (numtargets, nnearest)
+    numsources : int
+
+    Returns
+    -------
+    matrix : :class:`scipy:scipy.sparse.csr_matrix`
+    """
+    weights = np.asarray(weights, dtype=float).reshape(len(weights), -1)
+    ix = np.asarray(ix).reshape(weights.shape)
+    valid = np.isfinite(weights).all(axis=1)
+    weights = np.where(valid[:, np.newaxis], weights, 0.)
+    ix = np.where(valid[:, np.newaxis], ix, 0)
+    ntrg, k = weights.shape
+    matrix = sparse.csr_matrix((weights.ravel(), ix.ravel(),
+                                np.arange(0, ntrg * k + 1, k)),
+                               shape=(ntrg, numsources))
+    matrix.sum_duplicates()
+    matrix.eliminate_zeros()
+    return matrix
+
 
 # -----------------------------------------------------------------------------
 # Wrapper functions
@@ -895,9 +1946,9 @@ def interpolate(src, trg, vals, Interpolator, *args, **kwargs):
     contain any *np.nan* values OR you have to post-process missing values in
     your interpolation result in another way.
 
-    Warning
-    -------
-    Works only for one- and two-dimensional *vals* arrays, yet.
+    For multi-dimensional *vals* this is done by :class:`NanInterpolator`,
+    which should be used directly in order to reuse the interpolators over
+    several calls.
 
     Parameters
     ----------
@@ -938,32 +1989,9 @@ def interpolate(src, trg, vals, Interpolator, *args, **kwargs):
         ix_valid = np.where(np.isfinite(vals))[0]
         ip = Interpolator(src[ix_valid], trg, *args, **kwargs)
         result = ip(vals[ix_valid])
-    elif vals.ndim == 2:
-        # this implementation for 2 dimensions needs generalization
-        ip = Interpolator(src, trg, *args, **kwargs)
-        result = ip(vals)
-        nan_in_result = np.where(np.isnan(result))
-        # nan_in_vals = np.where(np.isnan(vals))
-        for i in np.unique(nan_in_result[-1]):
-            ix_good = np.where(np.isfinite(vals[..., i]))[0]
-            ix_broken_targets = (nan_in_result[0]
-                                 [np.where(nan_in_result[-1] == i)[0]])
-            ip = Interpolator(src[ix_good],
-                              trg[nan_in_result[0]
-                              [np.where(nan_in_result[-1] == i)[0]]],
-                              *args, **kwargs)
-            tmp = ip(vals[ix_good, i].reshape((len(ix_good), -1)))
-            result[ix_broken_targets, i] = tmp.ravel()
     else:
-        if not np.any(np.isnan(vals.ravel())):
-            raise Exception(
-                'At the moment, <interpolate> can only deal with NaN values '
-                'in <vals> if vals has less than 3 dimension.')
-        else:
-            # if no NaN value are in <vals> we can safely apply the
-            # Interpolator as is
-            ip = Interpolator(src, trg, *args, **kwargs)
-            result = ip(vals[ix_valid])
+        ip = NanInterpolator(src, trg, Interpolator, *args, **kwargs)
+        result = ip(vals)
     return result
 
 
@@ -1048,6 +2076,98 @@ def interpolate_polar(data, mask=None, Interpolator=Nearest):
     return filled_data.reshape(data.shape[0], data.shape[1])
 
 
+def leave_one_out(src, Interpolator, *args, **kwargs):
+    """
+    Leave-one-out interpolation to the source points.
+
+    Returns an interpolator which estimates the value at each source point
+    from all other source points, e.g. for the cross validation of
+    interpolation methods.
+
+    The neighbour based interpolators (:class:`Nearest`, :class:`Idw`,
+    :class:`OrdinaryKriging` and :class:`ExternalDriftKriging`) query their
+    neighbour tables once with one additional neighbour and drop the source
+    point itself. Kriging with all other source points as neighbours
+    directly uses the inverse of the kriging matrix of all source points
+    :cite:`Dubrule1983`. Any other `Interpolator` is set up for each source
+    point separately and exported with its `to_sparse` method, which
+    requires an interpolator linear in the source values (see
+    :meth:`IpolBase.to_sparse`).
+
+    .. versionadded:: 0.12.0
+
+    Parameters
+    ----------
+    src : ndarray of floats, shape (npoints, ndims)
+        Data point coordinates of the source points.
+    Interpolator : a class which inherits from IpolBase
+
+    Other Parameters
+    ----------------
+    *args : arguments of Interpolator (see class documentation)
+
+    Keyword Arguments
+    -----------------
+    **kwargs : keyword arguments of Interpolator (see class documentation),
+        `src_drift` of :class:`ExternalDriftKriging` also serves as target
+        drift
+
+    Returns
+    -------
+    output : :class:`SparseInterpolator`
+        interpolator of shape (npoints, npoints) with empty diagonal
+
+    Examples
+    --------
+    >>> src = np.array([[0., 0.], [1., 0.], [3., 0.]])
+    >>> loo = leave_one_out(src, Idw, nnearest=1)
+    >>> loo(np.array([1., 2., 3.]))
+    array([2., 1., 2.])
+
+    """
+    src = np.asanyarray(src, dtype=float)
+    if src.ndim == 1:
+        src = src.reshape(-1, 1)
+    n = len(src)
+    if n < 2:
+        return SparseInterpolator(sparse.csr_matrix((n, n)))
+    if issubclass(Interpolator, ExternalDriftKriging):
+        kwargs = dict(kwargs)
+        if kwargs.get('trg_drift') is None:
+            kwargs['trg_drift'] = kwargs.get('src_drift')
+    ip = Interpolator(src, src, *args, **kwargs)
+    if not hasattr(ip, '_set_neighbours'):
+        # set up the interpolator for each source point
+        rows = []
+        for i in range(n):
+            others = np.delete(np.arange(n), i)
+            row = Interpolator(src[others], src[i:i + 1], *args,
+                               **kwargs).to_sparse().tocoo()
+            rows.append(sparse.csr_matrix((row.data, (row.row,
+                                                      others[row.col])),
+                                          shape=(1, n)))
+        return SparseInterpolator(sparse.vstack(rows, format='csr'))
+    k = min(getattr(ip, 'nnearest', 1) + 1, n)
+    if k == n and isinstance(ip, (OrdinaryKriging, ExternalDriftKriging)):
+        # closed form of global kriging
+        if isinstance(ip, ExternalDriftKriging):
+            src_d, trg_d = ip._get_drift(None, None)
+            assert src_d.shape[1] == 1, \
+                'Drift terms varying over multiple fields are not supported.'
+            matrix = ip._krig_matrix(ip.src, src_d[:, 0])
+        else:
+            matrix = ip._krig_matrix(ip.src)
+        try:
+            inv = np.linalg.inv(matrix)[:n, :n]
+        except np.linalg.LinAlgError:
+            return SparseInterpolator(sparse.csr_matrix((n, n)))
+        weights = -inv / np.diag(inv)[:, np.newaxis]
+        np.fill_diagonal(weights, 0.)
+        return SparseInterpolator(sparse.csr_matrix(weights))
+    ip._set_neighbours(*_drop_self(*_query(ip.tree, ip.tree.data, k)))
+    return SparseInterpolator(ip)
+
+
 def cart2irregular_interp(cartgrid, values, newgrid, **kwargs):
     """
     Interpolate array ``values`` defined by cartesian coordinate array
@@ -1056,7 +2176,8 @@ def cart2irregular_interp(cartgrid, values, newgrid, **kwargs):
 
     .. versionadded:: 0.6.0
 
-    Slow for large arrays
+    Slow for large arrays, see :class:`RegularGrid` for the repeated
+    interpolation from regular grids.
 
     Keyword arguments are fed to :func:`scipy:scipy.interpolate.griddata`
 
@@ -1105,6 +2226,9 @@ def cart2irregular_spline(cartgrid, values, newgrid, **kwargs):
     Keyword arguments are fed through to
     :func:`scipy:scipy.ndimage.map_coordinates`
 
+    See :class:`RegularGrid` for the repeated interpolation of several
+    fields with the same grids.
+
     Parameters
     ----------
     cartgrid : numpy ndarray
@@ -27,12 +27,16 @@ fields except that they exhibit the numpy ndarray interface.
     beam_height_ft_doviak
     pulse_volume
     beam_block_frac
+    cum_beam_block_frac
+    BeamBlockage
     get_bb_ratio
 
 """
 
 import numpy as np
 
+from . import util as util
+
 
 def beam_height_ft(ranges, elevations, degrees=True, re=6371000):
     """Calculates the height of a radar beam above the antenna according to
@@ -226,6 +230,8 @@ def cum_beam_block_frac(pbb):
     pbb : :class:`numpy:numpy.ndarray`
         2-D array of floats of shape (num beams, num range bins)
         Partial beam blockage fraction of a bin along a beam [m]
+        Stacks of sweeps with shape (..., num beams, num range bins) are
+        supported, too.
 
     Returns
     -------
@@ -241,27 +247,165 @@ def cum_beam_block_frac(pbb):
     See :ref:`notebooks/beamblockage/wradlib_beamblock.ipynb`.
 
     """
-
-    # This is the index of the maximum PBB along each beam
-    maxindex = np.nanargmax(pbb, axis=1)
-    cbb = np.copy(pbb)
-
-    # Iterate over all beams
-    for ii, index in enumerate(maxindex):
-        premax = 0.
-        for jj in range(index):
-            # Only iterate to max index to make this faster
-            if pbb[ii, jj] > premax:
-                cbb[ii, jj] = pbb[ii, jj]
-                premax = pbb[ii, jj]
-            else:
-                cbb[ii, jj] = premax
-        # beyond max index, everything is max anyway
-        cbb[ii, index:] = pbb[ii, index]
+    # running maximum along the beams, NaNs are skipped
+    cbb = np.fmax.accumulate(pbb, axis=-1)
+    # bins before the (first) maximum of a beam, where the running maximum
+    # starts at zero
+    pbbmax = cbb[..., -1:]
+    with np.errstate(invalid='ignore'):
+        before = ~(cbb >= pbbmax) & ~np.isnan(pbbmax)
+    np.fmax(cbb, 0., out=cbb, where=before)
 
     return cbb
 
 
+class BeamBlockage():
+    """
+    BeamBlockage(terrain, beamwidth=1., re=6371000.)
+
+    Beam blockage maps for several sites and sweeps.
+
+    Computes partial (:meth:`beam_block_frac`) and cumulative
+    (:meth:`cum_beam_block_frac`) beam blockage for all elevation angles
+    of a site in one call. The maps are cached per site, elevation angle and
+    range geometry, so only sweeps with new elevation angles are computed
+    when a scan strategy changes.
+
+    .. versionadded:: 0.12.0
+
+    Parameters
+    ----------
+    terrain : callable
+        `terrain(site, ranges, elevation)` returns the terrain heights [m]
+        below the bins of the sweep with the given elevation angle [degrees]
+        of `site` as array of shape (num beams, num range bins), e.g.
+        sampled from a DEM.
+    beamwidth : float
+        Half-power beam width [degrees], see :meth:`util.half_power_radius`
+    re : float
+        Earth radius [m], see :meth:`beam_height_ft_doviak`
+
+    Examples
+    --------
+    >>> import wradlib
+    >>> import numpy as np
+    >>> def terrain(site, ranges, elevation):
+    ...     return np.full((360, len(ranges)), 300.)
+    >>> bb = wradlib.qual.BeamBlockage(terrain)
+    >>> pbb, cbb = bb('site', np.arange(500., 100000., 1000.), [0.5, 1.5],
+    ...               sitealt=100.)
+    >>> print(cbb.shape)
+    (2, 360, 100)
+
+    """
+
+    def __init__(self, terrain, beamwidth=1., re=6371000.):
+        self.terrain = terrain
+        self.beamwidth = beamwidth
+        self.re = re
+        self._cache = {}
+
+    def sweep(self, site, ranges, elevation, sitealt=0.):
+        """
+        Partial and cumulative beam blockage of one sweep.
+
+        Parameters
+        ----------
+        site : hashable
+            site identifier, passed to `terrain`
+        ranges : :class:`numpy:numpy.ndarray`
+            distances of the bins from the radar [m]
+        elevation : float
+            elevation angle [degrees]
+        sitealt : float
+            altitude of the radar [m]
+
+        Returns
+        -------
+        pbb : :class:`numpy:numpy.ndarray`
+            partial beam blockage fraction, clipped to [0, 1]
+        cbb : :class:`numpy:numpy.ndarray`
+            cumulative beam blockage fraction
+
+        Note
+        ----
+        The returned arrays are the cached maps and read-only, copy them
+        before modifying them.
+        """
+        ranges = np.asanyarray(ranges, dtype=float)
+        key = (site, float(elevation), float(sitealt), ranges.shape,
+               ranges.tobytes())
+        if key not in self._cache:
+            terrain = np.asanyarray(self.terrain(site, ranges, elevation))
+            height = beam_height_ft_doviak(ranges, elevation,
+                                           re=self.re) + sitealt
+            radius = util.half_power_radius(ranges, self.beamwidth)
+            with np.errstate(invalid='ignore'):
+                pbb = beam_block_frac(terrain, height, radius)
+            # terrain above/below the beam blocks it completely/not at all
+            pbb[terrain - height >= radius] = 1.
+            pbb[terrain - height <= -radius] = 0.
+            np.clip(pbb, 0., 1., out=pbb)
+            cbb = cum_beam_block_frac(pbb)
+            # protect the cache from modifications by the caller
+            pbb.flags.writeable = False
+            cbb.flags.writeable = False
+            self._cache[key] = (pbb, cbb)
+        return self._cache[key]
+
+    def __call__(self, site, ranges, elevations, sitealt=0.):
+        """
+        Partial and cumulative beam blockage of several sweeps of one site.
+
+        Parameters
+        ----------
+        site : hashable
+            site identifier, passed to `terrain`
+        ranges : :class:`numpy:numpy.ndarray`
+            distances of the bins from the radar [m]
+        elevations : sequence of floats
+            elevation angles [degrees]
+        sitealt : float
+            altitude of the radar [m]
+
+        Returns
+        -------
+        pbb : :class:`numpy:numpy.ndarray`
+            partial beam blockage fraction of shape
+            (num sweeps, num beams, num range bins)
+        cbb : :class:`numpy:numpy.ndarray`
+            cumulative beam blockage fraction of the same shape
+        """
+        maps = [self.sweep(site, ranges, elevation, sitealt)
+                for elevation in elevations]
+        return (np.stack([pbb for pbb, cbb in maps]),
+                np.stack([cbb for pbb, cbb in maps]))
+
+    def sites(self, scans):
+        """
+        Cumulative beam blockage of several sites.
+
+        Parameters
+        ----------
+        scans : dict
+            maps site identifiers to tuples (ranges, elevations, sitealt)
+
+        Returns
+        -------
+        cbb : dict
+            maps site identifiers to the cumulative beam blockage fractions
+            of shape (num sweeps, num beams, num range bins)
+        """
+        return dict((site, self(site, *scan)[1])
+                    for site, scan in scans.items())
+
+    def clear(self):
+        """
+        Clear the cache of blockage maps.
+        """
+        self._cache.clear()
+
+
 def get_bb_ratio(bb_height, bb_width, quality, zp_r):
     """Returns the Bright Band ratio of each PR bin
 
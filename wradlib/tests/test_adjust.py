@@ -4,25 +4,101 @@
 
 import unittest
 
+import numpy as np
+
+import wradlib.adjust as adjust
+import wradlib.ipol as ipol
+
 
 class AdjustBaseTest(unittest.TestCase):
     def test___init__(self):
         pass
 
     def test__checkip(self):
-        pass
+        np.random.seed(42)
+        raw_coords = np.random.uniform(0, 20, size=(500, 2))
+        obs_coords = np.random.uniform(0, 20, size=(10, 2))
+        for Ipclass in [ipol.Idw, ipol.Nearest]:
+            adjuster = adjust.AdjustAdd(obs_coords, raw_coords,
+                                        Ipclass=Ipclass, cache_size=2)
+            self.assertTrue(adjuster._checkip(np.arange(10), None) is
+                            adjuster.ip)
+            ips = [adjuster._checkip(ix, None) for ix in
+                   [np.arange(1, 10), np.arange(2, 10), np.arange(1, 10)]]
+            self.assertTrue(ips[2] is ips[0])
+            vals = np.random.uniform(size=9)
+            np.testing.assert_allclose(
+                ips[0](vals), Ipclass(obs_coords[1:], raw_coords)(vals))
+            adjuster._checkip(np.arange(3, 10), None)
+            self.assertEqual(len(adjuster.ipcache), 2)
+            self.assertFalse(adjuster._checkip(np.arange(2, 10), None) is
+                             ips[1])
+            # memory limit
+            adjuster = adjust.AdjustAdd(obs_coords, raw_coords,
+                                        Ipclass=Ipclass, cache_memory=0)
+            adjuster._checkip(np.arange(1, 10), None)
+            self.assertEqual(len(adjuster.ipcache), 0)
 
     def test__check_shape(self):
         pass
 
     def test___call__(self):
-        pass
+        np.random.seed(42)
+        raw_coords = np.dstack(np.meshgrid(np.arange(20.),
+                                           np.arange(20.))).reshape(-1, 2)
+        obs_coords = np.random.uniform(1, 18, size=(12, 2))
+        raw = np.random.uniform(0., 5, size=(6, 400))
+        obs = np.random.uniform(0., 5, size=(6, 12))
+        obs[[1, 4], 3] = np.nan
+        obs[2, :10] = np.nan
+        obs[5, 5] = 0.2
+        for cls in [adjust.AdjustAdd, adjust.AdjustMultiply,
+                    adjust.AdjustMixed, adjust.AdjustMFB, adjust.GageOnly,
+                    adjust.AdjustNone]:
+            for Ipclass, ipargs in [(ipol.Idw, {}),
+                                    (ipol.Nearest, dict(stat='best'))]:
+                adjuster = cls(obs_coords, raw_coords, Ipclass=Ipclass,
+                               minval=0.5, **ipargs)
+                res = adjuster(obs, raw)
+                self.assertEqual(res.shape, (6, 400))
+                # compare with adjusting each time step
+                for i in range(6):
+                    np.testing.assert_allclose(res[i],
+                                               adjuster(obs[i], raw[i]))
 
     def test__get_valid_pairs(self):
         pass
 
     def test_xvalidate(self):
-        pass
+        np.random.seed(42)
+        raw_coords = np.dstack(np.meshgrid(np.arange(20.),
+                                           np.arange(20.))).reshape(-1, 2)
+        obs_coords = np.random.uniform(1, 18, size=(12, 2))
+        raw = np.random.uniform(0.1, 5, size=(3, 400))
+        obs = np.random.uniform(0.1, 5, size=(3, 12))
+        obs[1, 3] = np.nan
+        obs[2, :8] = np.nan
+        for cls in [adjust.AdjustAdd, adjust.AdjustMultiply,
+                    adjust.AdjustMixed, adjust.GageOnly, adjust.AdjustNone]:
+            for Ipclass, ipargs in [(ipol.Idw, {}),
+                                    (ipol.OrdinaryKriging,
+                                     dict(cov='1.0 Exp(5.)', nnearest=4))]:
+                adjuster = cls(obs_coords, raw_coords, Ipclass=Ipclass,
+                               **ipargs)
+                res = adjuster.xvalidate(obs, raw)[1]
+                self.assertEqual(res.shape, (3, 12))
+                # compare with adjusting at each left out gauge
+                adjuster._pointwise = False
+                for i in range(3):
+                    ref = adjuster.xvalidate(obs[i], raw[i])[1]
+                    np.testing.assert_allclose(res[i], ref)
+        # not enough gauges for cross validation
+        self.assertTrue(np.isnan(res[2]).all())
+        # not enough gauges for adjustment when leaving one out
+        obs[2, 7] = 1.
+        res = adjust.AdjustAdd(obs_coords, raw_coords).xvalidate(obs, raw)[1]
+        ref = adjust.Raw_at_obs(obs_coords, raw_coords, nnear=1)(raw[2])
+        np.testing.assert_allclose(res[2, 7:], ref[7:])
 
 
 class AdjustAddTest(unittest.TestCase):
@@ -66,7 +142,14 @@ class AdjustHelperTest(unittest.TestCase):
         pass
 
     def test_best(self):
-        pass
+        x = np.array([1., 2., 3.])
+        y = np.array([[0., 1.5], [4., 2.5], [2., 2.9]])
+        np.testing.assert_allclose(adjust.best(x, y), [1.5, 2.5, 2.9])
+        # trailing dimensions
+        xs = np.stack([x, x + 2.], axis=-1)
+        ys = np.stack([y, y], axis=-1)
+        np.testing.assert_allclose(adjust.best(xs, ys),
+                                   [[1.5, 1.5], [2.5, 4.], [2.9, 2.9]])
 
 
 if __name__ == '__main__':
@@ -6,6 +6,7 @@
 import numpy as np
 import wradlib.clutter as cl
 import unittest
+import tempfile
 
 
 # -------------------------------------------------------------------------------
@@ -37,7 +38,48 @@ class TestClutter(unittest.TestCase):
         pass
 
     def test_filter_gabella_a(self):
-        pass
+        self.filter_setup()
+        result = cl.filter_gabella_a(self.img, wsize=5, tr1=4)
+        # isolated pixel, only the pixel itself is within the threshold
+        self.assertEqual(result[2, 2], 0)
+        # center of the 3x3 precip field
+        self.assertEqual(result[10, 5], 8)
+        # range edges are excluded
+        self.assertTrue((result[:, :2] == 25).all())
+        self.assertTrue((result[:, -2:] == 25).all())
+        # neighbourhood wraps around in azimuth
+        img = np.zeros((36, 10))
+        img[0, 5] = 10
+        img[35, 5] = 10
+        result = cl.filter_gabella_a(img, wsize=3, tr1=4)
+        self.assertEqual(result[0, 5], 1)
+        result = cl.filter_gabella_a(img, wsize=3, tr1=4, radial=True)
+        self.assertEqual(result[0, 5], 0)
+
+    def test_filter_gabella_a_stack(self):
+        self.filter_setup()
+        stack = np.array([self.img, self.img[::-1], self.img * 2])
+        result = cl.filter_gabella_a(stack, wsize=5, tr1=4, cartesian=True)
+        for res, img in zip(result, stack):
+            np.testing.assert_array_equal(
+                res, cl.filter_gabella_a(img, wsize=5, tr1=4, cartesian=True))
+
+    def test_classify_echo_fuzzy(self):
+        shape = (2, 36, 40)
+        dat = {"zdr": np.random.normal(0.5, 1, shape),
+               "rho": np.random.uniform(0.7, 1, shape),
+               "phi": np.random.normal(50, 8, shape),
+               "dop": np.random.normal(0, 3, shape),
+               "map": np.zeros(shape[-2:])}
+        dat["map"][10:20, 10:20] = 1
+        dat["rho"][:, 0:5] = np.nan
+        dat["dop"][:, :, 20:] = np.nan
+        clutter, nanmask = cl.classify_echo_fuzzy(dict(dat))
+        self.assertEqual(clutter.shape, shape)
+        self.assertTrue(clutter.any())
+        clutter2, nanmask2 = cl.classify_echo_fuzzy(dict(dat), fused=True)
+        np.testing.assert_array_equal(clutter2, clutter)
+        np.testing.assert_array_equal(nanmask2, nanmask)
 
     def test_filter_window_distance(self):
         self.filter_setup()
@@ -52,3 +94,41 @@ class TestClutter(unittest.TestCase):
         result = similar < 0.3
         np.set_printoptions(precision=3)
         self.assertTrue((result == clutter).all())
+
+    def test_filter_window_distance_stack(self):
+        np.random.seed(42)
+        img = np.random.uniform(0, 30, (36, 40))
+        img[img < 3] = np.nan
+        stack = np.stack([img, np.nan_to_num(img)])
+        similar = cl.filter_window_distance(stack, 250, fsize=500, tr1=4)
+        self.assertEqual(similar.shape, stack.shape)
+        for sweep, res in zip(stack, similar):
+            np.testing.assert_allclose(
+                res, cl.filter_window_distance(sweep, 250, fsize=500, tr1=4))
+
+    def test_clutter_map(self):
+        np.random.seed(42)
+        data = np.random.gamma(2, 1, (20, 36, 40))
+        data[:, :5, :5] = 50.
+        data[data < 0.3] = np.nan
+        cmap = cl.ClutterMap((36, 40), threshold=1.,
+                             edges=np.linspace(0, 10, 11))
+        for sweep in data[:10]:
+            cmap.update(sweep)
+        cmap.update(data[10:])
+        self.assertEqual(cmap.nsweeps, 20)
+        accum = np.nansum(data, axis=0)
+        np.testing.assert_allclose(cmap.accumulation, accum)
+        np.testing.assert_allclose(cmap.mean, np.nanmean(data, axis=0))
+        np.testing.assert_allclose(cmap.frequency,
+                                   np.sum(data > 1., axis=0) /
+                                   np.sum(np.isfinite(data), axis=0))
+        np.testing.assert_array_equal(cmap.histo_cut(), cl.histo_cut(accum))
+        self.assertTrue(cmap.histo_cut()[:5, :5].all())
+        self.assertTrue((cmap.quantile(0.5)[:5, :5] >= 9.).all())
+        with tempfile.NamedTemporaryFile(suffix='.npz') as f:
+            cmap.save(f.name)
+            cmap2 = cl.ClutterMap.load(f.name)
+        self.assertEqual(cmap2.nsweeps, 20)
+        np.testing.assert_array_equal(cmap2.quantile(0.9),
+                                      cmap.quantile(0.9))
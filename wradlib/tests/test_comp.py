@@ -4,6 +4,10 @@
 
 import unittest
 
+import numpy as np
+import wradlib.comp as comp
+import wradlib.ipol as ipol
+
 
 class ComposeTest(unittest.TestCase):
     def test_extract_circle(self):
@@ -12,6 +16,66 @@ class ComposeTest(unittest.TestCase):
     def test_togrid(self):
         pass
 
+    def test_togrid_sparse(self):
+        rng = np.random.RandomState(42)
+        src = rng.uniform(-50., 50., (400, 2))
+        x, y = np.meshgrid(np.arange(-60., 60., 5.), np.arange(-60., 60., 5.))
+        trg = np.column_stack([x.ravel(), y.ravel()])
+        center = np.array([0., 0.])
+        data = rng.uniform(size=400)
+        ip = comp.togrid_sparse(src, trg, 40., center, ipol.Idw, nnearest=4)
+        self.assertIsInstance(ip, ipol.SparseInterpolator)
+        np.testing.assert_allclose(ip(data),
+                                   comp.togrid(src, trg, 40., center, data,
+                                               ipol.Idw, nnearest=4))
+        data = rng.uniform(size=(400, 3))
+        res = ip(data)
+        self.assertEqual(res.shape, (len(trg), 3))
+        np.testing.assert_allclose(res[:, 1], ip(data[:, 1]))
+
+    def test_Compositor(self):
+        rng = np.random.RandomState(42)
+        x, y = np.meshgrid(np.arange(-60., 60., 5.), np.arange(-60., 60., 5.))
+        trg = np.column_stack([x.ravel(), y.ravel()])
+        centers = [np.array([-20., 0.]), np.array([20., 10.]),
+                   np.array([0., -30.])]
+        srcs = [rng.uniform(-40., 40., (400, 2)) + c for c in centers]
+        data = [rng.uniform(size=400) for c in centers]
+        for d in data:
+            d[rng.uniform(size=400) < 0.1] = np.nan
+        quality = [rng.uniform(size=400) for c in centers]
+        compositor = comp.Compositor(trg)
+        for src, center in zip(srcs, centers):
+            compositor.add_site(src, 35., center, ipol.Idw, nnearest=4)
+        self.assertEqual(len(compositor), 3)
+        grids = [comp.togrid(src, trg, 35., center, d, ipol.Idw, nnearest=4)
+                 for src, center, d in zip(srcs, centers, data)]
+        qgrids = [comp.togrid(src, trg, 35., center, q, ipol.Idw, nnearest=4)
+                  for src, center, q in zip(srcs, centers, quality)]
+        np.testing.assert_allclose(compositor.togrid(1, data[1]), grids[1])
+        np.testing.assert_allclose(compositor.compose_weighted(data, quality),
+                                   comp.compose_weighted(grids, qgrids))
+        np.testing.assert_allclose(compositor.compose_ko(data, quality),
+                                   comp.compose_ko(grids, qgrids))
+        # equal weights
+        np.testing.assert_allclose(
+            compositor.compose_weighted(iter(data)),
+            comp.compose_weighted(grids, [np.ones(len(trg))] * 3))
+        # static quality and stacks of fields
+        compositor = comp.Compositor(trg)
+        for src, center, q in zip(srcs, centers, quality):
+            compositor.add_site(src, 35., center, ipol.Idw, nnearest=4,
+                                quality=q)
+        stacks = [np.stack([d, 2 * d], axis=-1) for d in data]
+        out = np.empty((len(trg), 2))
+        res = compositor.compose_ko(stacks, out=out)
+        self.assertTrue(res is out)
+        np.testing.assert_allclose(res[:, 1],
+                                   2 * comp.compose_ko(grids, qgrids))
+        res = compositor.compose_weighted(stacks)
+        np.testing.assert_allclose(res[:, 0],
+                                   comp.compose_weighted(grids, qgrids))
+
     def test_compose_ko(self):
         pass
 
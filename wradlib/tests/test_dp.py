@@ -39,9 +39,101 @@ class KDPFromPHIDPTest(unittest.TestCase):
         pass
 
 
+class VulpianiProcessorTest(unittest.TestCase):
+    def setUp(self):
+        np.random.seed(42)
+        kdp_true = np.abs(np.sin(np.arange(0, 10, 0.05)))
+        phidp_true = np.cumsum(np.tile(kdp_true, (36, 1)), axis=-1)
+        self.phidp_raw = phidp_true + np.random.uniform(-1, 1,
+                                                        phidp_true.shape)
+        self.phidp_raw[:, 50:60] = np.nan
+        self.phidp_raw[::5, 100:103] = np.nan
+
+    def test_processor(self):
+        phidp, kdp = dp.process_raw_phidp_vulpiani(self.phidp_raw, dr=0.5,
+                                                   copy=True)
+        proc = dp.VulpianiProcessor(self.phidp_raw.shape, dr=0.5,
+                                    blocksize=10)
+        phidp2, kdp2 = proc(self.phidp_raw)
+        self.assertEqual(phidp2.dtype, np.float32)
+        np.testing.assert_allclose(phidp2, phidp, rtol=1e-4, atol=1e-3)
+        np.testing.assert_allclose(kdp2, kdp, rtol=1e-4, atol=1e-3)
+
+    def test_iter_sweeps(self):
+        proc = dp.VulpianiProcessor(self.phidp_raw.shape, dr=0.5)
+        res = list(proc.iter_sweeps([self.phidp_raw, self.phidp_raw]))
+        self.assertEqual(len(res), 2)
+        np.testing.assert_array_equal(res[0][1], res[1][1])
+
+
+class UnfoldPhiTest(unittest.TestCase):
+    def setUp(self):
+        np.random.seed(42)
+        kdp = np.abs(np.random.normal(0.5, 0.2, (10, 400)))
+        self.phidp_true = np.cumsum(kdp, axis=-1) + 10.
+        self.phidp = ((self.phidp_true + 180) % 360) - 180
+        self.rho = np.full(self.phidp.shape, 0.95)
+
+    def test_unfold_phi_vectorized(self):
+        phidp = dp.unfold_phi_vectorized(self.phidp, self.rho, copy=True)
+        np.testing.assert_allclose(phidp, self.phidp_true)
+        phidp = dp.unfold_phi_vectorized(self.phidp.reshape(2, 5, -1),
+                                         self.rho.reshape(2, 5, -1),
+                                         copy=True)
+        np.testing.assert_allclose(phidp.reshape(10, -1), self.phidp_true)
+
+    def test_unfold_phi_backends(self):
+        backends = dp.unfold_phi_backends()
+        self.assertEqual(backends[-2:], ['numpy', 'python'])
+        res = dp.unfold_phi(self.phidp, self.rho, copy=True,
+                            backend='numpy')
+        np.testing.assert_allclose(res, self.phidp_true)
+        res = dp.unfold_phi(self.phidp, self.rho, copy=True)
+        np.testing.assert_allclose(res, self.phidp_true, rtol=1e-5)
+        self.assertRaises(ValueError,
+                          lambda: dp.unfold_phi(self.phidp, self.rho,
+                                                backend='cuda'))
+
+    def test_gradient_along_axis(self):
+        x = np.arange(12.).reshape(3, 4) ** 2
+        grad = dp.gradient_along_axis(x)
+        self.assertEqual(grad.shape, x.shape)
+        np.testing.assert_allclose(grad[1], [9., 10., 12., 13.])
+
+
 class TextureTest(unittest.TestCase):
     def test_texture(self):
-        pass
+        data = np.ones((5, 6))
+        data[2, 3] = 4.
+        data[0, 0] = np.nan
+        tex = dp.texture(data)
+        self.assertTrue(np.isnan(tex[0, 0]))
+        np.testing.assert_allclose(tex[2, 3], 3.)
+        np.testing.assert_allclose(tex[1, 2], np.sqrt(9. / 8.))
+        np.testing.assert_allclose(tex[1, 1], 0.)
+        np.testing.assert_allclose(tex[1, 0], 0.)
+
+
+class MovingWindowStatsTest(unittest.TestCase):
+    def test_moving_window_stats(self):
+        data = np.array([[1., 2., np.nan, 4., 5.]])
+        count, mean, std = dp.moving_window_stats(data, 3)
+        np.testing.assert_array_equal(count, [[2., 2., 2., 2., 2.]])
+        np.testing.assert_allclose(mean, [[1.5, 1.5, 3., 4.5, 4.5]])
+        np.testing.assert_allclose(std, [[0.5, 0.5, 1., 0.5, 0.5]])
+        count, mean, std = dp.moving_window_stats(data, 3, wrap=True)
+        np.testing.assert_array_equal(count, [[3., 2., 2., 2., 3.]])
+        np.testing.assert_allclose(mean[0, [0, 4]], [8. / 3, 10. / 3])
+
+    def test_moving_window_stats_axis(self):
+        data = np.random.uniform(0, 10, (20, 3))
+        count, mean, std = dp.moving_window_stats(data, 5, axis=0)
+        np.testing.assert_allclose(mean[2:-2],
+                                   [data[i - 2:i + 3].mean(axis=0)
+                                    for i in range(2, 18)])
+        np.testing.assert_allclose(std[2:-2],
+                                   [data[i - 2:i + 3].std(axis=0)
+                                    for i in range(2, 18)])
 
 
 if __name__ == '__main__':
@@ -465,6 +465,63 @@ class GdalTests(unittest.TestCase):
         data, coords, proj = georef.extract_raster_dataset(self.ds)
 
 
+class DemSamplerTest(unittest.TestCase):
+    def setUp(self):
+        # linear ramp in longitude on a 0.01 degree grid around Bonn
+        x = np.arange(6.5, 7.7, 0.01)
+        y = np.arange(51.2, 50.3, -0.01)
+        coords = np.dstack(np.meshgrid(x, y))
+        self.data = np.broadcast_to(x[:-1] + 0.005,
+                                    (len(y) - 1, len(x) - 1)).copy()
+        self.ds = georef.create_raster_dataset(
+            self.data, coords, projection=georef.get_default_projection())
+        self.site = (7.071663, 50.73052, 99.5)
+        self.ranges = np.arange(125., 30000., 250.)
+
+    def test_raster_bilinear_weights(self):
+        gt = (0., 1., 0., 10., 0., -1.)
+        rows, cols, weights = georef.raster_bilinear_weights(
+            gt, np.array([[2., 7.5], [2.75, 7.5], [11., 5.]]), (10, 10))
+        np.testing.assert_array_equal(rows[:, 0], [2, 2, 3, 3])
+        np.testing.assert_array_equal(cols[:, 0], [1, 2, 1, 2])
+        np.testing.assert_allclose(weights[:, 0], [0.5, 0.5, 0., 0.])
+        np.testing.assert_allclose(weights[:, 1], [0.75, 0.25, 0., 0.])
+        self.assertTrue(np.isnan(weights[:, 2]).all())
+
+    def test_dem_sampler(self):
+        sampler = georef.DemSampler(self.ds, sites={'bonn': self.site})
+        terrain = sampler('bonn', self.ranges, 0.5)
+        self.assertEqual(terrain.shape, (360, len(self.ranges)))
+        # bilinear sampling reproduces the linear ramp
+        coords = sampler.coordinates(self.site, self.ranges,
+                                     sampler.azimuths, 0.5)
+        np.testing.assert_allclose(terrain, coords[..., 0])
+        # cached weights and windows
+        self.assertIs(sampler.weights(self.site, self.ranges,
+                                      sampler.azimuths, 0.5),
+                      sampler.weights(self.site, self.ranges,
+                                      sampler.azimuths, 0.5))
+        self.assertEqual(len(sampler._windows), 1)
+        sampler.sample(self.site, self.ranges[:10], sampler.azimuths, 1.5)
+        self.assertEqual(len(sampler._windows), 1)
+        # bins outside the DEM
+        terrain = sampler.sample(self.site, np.arange(125., 60000., 250.),
+                                 [0.5, 90.5], 0.5)
+        self.assertTrue(np.isnan(terrain[:, -1]).all())
+        self.assertFalse(np.isnan(terrain[:, 0]).any())
+        sampler.clear()
+        self.assertEqual(len(sampler._windows), 0)
+        # bounded caches
+        sampler = georef.DemSampler(self.ds, sites={'bonn': self.site},
+                                    cache_size=2)
+        for elev in [0.5, 1.5, 2.5, 3.5]:
+            sampler('bonn', self.ranges, elev)
+        self.assertEqual(len(sampler._weights), 2)
+        sampler.sample(self.site, self.ranges, [0.5, 90.5, 180.5], 0.5)
+        sampler.sample(self.site, self.ranges, [270.5], 0.5)
+        self.assertTrue(len(sampler._windows) <= 2)
+
+
 class GetGridsTest(unittest.TestCase):
     def setUp(self):
         # calculate xy and lonlat grids with georef function
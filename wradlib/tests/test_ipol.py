@@ -8,6 +8,7 @@ import wradlib.ipol as ipol
 import wradlib.georef as georef
 import unittest
 import warnings
+import tempfile
 
 
 class InterpolationTest(unittest.TestCase):
@@ -90,6 +91,65 @@ class InterpolationTest(unittest.TestCase):
             ipol.cov_cau([0., 5., 10.], sill=2., rng=10., alpha=0.5, beta=1.5),
             np.array([2., 0.40202025, 0.25])))
 
+    def test_Idw_1(self):
+        """testing the basic behaviour of the Idw class"""
+
+        ip = ipol.Idw(self.src, self.trg, nnearest=2)
+        res = ip(self.vals)
+        self.assertEqual(res.dtype, np.float64)
+        np.testing.assert_allclose(res, np.array([[1., 2., 3.],
+                                                  [2., 2., 2.],
+                                                  [1.2, 2., 2.8],
+                                                  [3., 2., 1.]]))
+        np.testing.assert_allclose(ip.weights.sum(axis=1), 1.)
+        np.testing.assert_allclose(ip(self.vals[:, 0]), res[:, 0])
+        # the value of a coincident source point is kept, even if the
+        # other neighbours are missing
+        vals = self.vals.copy()
+        vals[1, 0] = np.nan
+        res = ip(vals)
+        self.assertEqual(res[0, 0], 1.)
+        self.assertTrue(np.isnan(res[1:, 0]).all())
+        # output buffer and dtype
+        out = np.empty((4, 3), dtype=np.float32)
+        self.assertIs(ip(self.vals, out=out), out)
+        np.testing.assert_allclose(out, ip(self.vals, dtype=np.float32))
+        # nearest neighbour
+        ip = ipol.Idw(self.src, self.trg, nnearest=1)
+        np.testing.assert_array_equal(ip(self.vals),
+                                      self.vals[[0, 0, 0, 1]])
+
+    def test_Idw_subset(self):
+        np.random.seed(42)
+        src = np.random.uniform(0, 10, size=(30, 2))
+        trg = np.random.uniform(0, 10, size=(200, 2))
+        vals = np.random.uniform(size=30)
+        ip = ipol.Idw(src, trg, nnearest=4)
+        for ix in [np.arange(30), np.arange(0, 30, 2), np.array([3, 7, 11])]:
+            sub = ip.subset(ix)
+            ref = ipol.Idw(src[ix], trg, nnearest=4)
+            np.testing.assert_allclose(sub(vals[ix]), ref(vals[ix]))
+            np.testing.assert_array_equal(sub.ix, ref.ix)
+        self.assertRaises(ipol.MissingSourcesError,
+                          lambda: ip.subset(np.array([], dtype=int)))
+
+    def test_LRUCache(self):
+        cache = ipol._LRUCache(maxsize=3, maxbytes=2500)
+        for i in range(4):
+            cache.get(i, lambda: np.zeros(100))
+        self.assertEqual(len(cache), 3)
+        self.assertFalse(0 in cache)
+        # recently used items are kept
+        cache.get(1, None)
+        cache.get(4, lambda: np.zeros(100))
+        self.assertTrue(1 in cache)
+        self.assertFalse(2 in cache)
+        # memory limit
+        cache.get(5, lambda: np.zeros(200))
+        self.assertEqual((len(cache), cache.nbytes), (2, 2400))
+        cache.get(6, lambda: ipol.Idw(np.zeros((10, 2)), np.ones((30, 2))))
+        self.assertEqual((len(cache), cache.nbytes), (0, 0))
+
     def test_OrdinaryKriging_1(self):
         """testing the basic behaviour of the OrdinaryKriging class"""
 
@@ -101,6 +161,37 @@ class InterpolationTest(unittest.TestCase):
                                                 [1.5, 2., 2.5],
                                                 [3., 2., 1.]])))
 
+    def test_OrdinaryKriging_2(self):
+        """testing the batched kriging systems against the single systems"""
+        rng = np.random.RandomState(42)
+        src = rng.uniform(0., 10., (30, 2))
+        x, y = np.meshgrid(np.arange(0., 10., 0.5), np.arange(0., 10., 0.5))
+        trg = np.column_stack([x.ravel(), y.ravel()])
+        ip = ipol.OrdinaryKriging(src, trg, '1.0 Exp(5.)', nnearest=6)
+        ip2 = ipol.OrdinaryKriging(src, trg, '1.0 Exp(5.)', nnearest=6,
+                                   chunksize=7)
+        np.testing.assert_allclose(ip.weights, ip2.weights)
+        np.testing.assert_allclose(ip.estimation_variance,
+                                   ip2.estimation_variance)
+        for i in [0, 123, 399]:
+            ix = ip.ix[i]
+            dists = np.sqrt(np.sum((src[ix, None] - src[None, ix]) ** 2,
+                                   axis=-1))
+            matrix = np.ones((7, 7))
+            matrix[:-1, :-1] = ip.cov_func(dists)
+            matrix[-1, -1] = 0.
+            rhs = np.append(ip.cov_func(ip.dists[i]), 1.)
+            weights = np.linalg.solve(matrix, rhs)
+            np.testing.assert_allclose(ip.weights[i], weights)
+            np.testing.assert_allclose(ip.estimation_variance[i],
+                                       1. - np.sum(weights * rhs))
+        # chunks must not be empty
+        self.assertRaises(ValueError, ipol.OrdinaryKriging, src, trg,
+                          '1.0 Exp(5.)', nnearest=6, chunksize=0)
+        self.assertRaises(ValueError, ipol.ExternalDriftKriging, src, trg,
+                          '1.0 Exp(5.)', nnearest=6, src_drift=src[:, 0],
+                          trg_drift=trg[:, 0], chunksize=0)
+
     def test_ExternalDriftKriging_1(self):
         """testing the basic behaviour of the ExternalDriftKriging class
         with drift terms constant over multiple fields"""
@@ -135,6 +226,18 @@ class InterpolationTest(unittest.TestCase):
                                                 [5., 2., -1.],
                                                 [7., 2., -3.]])))
 
+    def test_ExternalDriftKriging_4(self):
+        """testing singular kriging systems of the ExternalDriftKriging
+        class"""
+        src = np.array([[0., 0.], [4., 0], [0., 4.]])
+        ip = ipol.ExternalDriftKriging(src, self.trg, '1.0 Lin(2.0)',
+                                       src_drift=np.ones(3),
+                                       trg_drift=np.ones(4),
+                                       chunksize=2)
+        res = ip(np.array([1., 2., 3.]))
+        self.assertTrue(np.isnan(res).all())
+        self.assertTrue(np.isnan(ip.weights).all())
+
     def test_ExternalDriftKriging_3(self):
         """testing the basic behaviour of the ExternalDriftKriging class
         with missing drift terms"""
@@ -144,6 +247,184 @@ class InterpolationTest(unittest.TestCase):
 
         self.assertRaises(ValueError, ip, self.vals)
 
+    def test_SparseInterpolator(self):
+        """testing the export of interpolators as sparse matrix"""
+        trg = np.vstack([self.trg, [[6., 0.]]])
+        ips = [ipol.Nearest(self.src, trg),
+               ipol.Idw(self.src, trg, nnearest=2),
+               ipol.OrdinaryKriging(self.src, trg, '1.0 Lin(2.0)'),
+               ipol.ExternalDriftKriging(self.src, trg, '1.0 Lin(2.0)',
+                                         src_drift=self.src_d,
+                                         trg_drift=np.arange(5.))]
+        for ip in ips:
+            sp = ipol.SparseInterpolator(ip)
+            self.assertEqual(sp.matrix.shape, (5, 2))
+            np.testing.assert_allclose(sp(self.vals), ip(self.vals))
+            np.testing.assert_allclose(sp(self.vals[:, 0]),
+                                       sp(self.vals)[:, 0])
+        # targets which cannot be interpolated
+        ip = ipol.Nearest(self.src, trg)
+        sp = ipol.SparseInterpolator(ip.to_sparse(maxdist=1.))
+        np.testing.assert_array_equal(sp(self.vals[:, 0]),
+                                      ip(self.vals[:, 0], maxdist=1.))
+        src = np.array([[0., 0.], [1., 0.], [0., 1.]])
+        trg = np.array([[0.25, 0.25], [0.5, 0.5], [1., 1.]])
+        vals = np.array([1., 2., 3.])
+        sp = ipol.SparseInterpolator(ipol.Linear(src, trg))
+        np.testing.assert_allclose(sp(vals), ipol.Linear(src, trg)(vals))
+        self.assertTrue(sp.empty[-1])
+        # chaining with a subsequent linear step
+        mean = np.array([[0.5, 0.5, 0.], [1., 0., 0.], [0., 0.5, 0.5]])
+        chain = sp.chain(mean)
+        np.testing.assert_allclose(chain(vals)[:2],
+                                   mean[:2, :2].dot(sp(vals)[:2]))
+        np.testing.assert_array_equal(chain.empty, [False, False, True])
+        # generic export of linear interpolators
+        ip = ipol.Idw(self.src, trg, nnearest=2)
+        np.testing.assert_allclose(ipol.IpolBase.to_sparse(ip).toarray(),
+                                   ip.to_sparse().toarray())
+        wrapper = ipol.NanInterpolator(self.src, trg, ipol.Idw, nnearest=2)
+        np.testing.assert_allclose(ipol.SparseInterpolator(wrapper)(self.vals),
+                                   ip(self.vals))
+        wrapper = ipol.TiledInterpolator(self.src, trg, ipol.Idw, nnearest=2,
+                                         tilesize=2)
+        np.testing.assert_allclose(ipol.SparseInterpolator(wrapper)(self.vals),
+                                   ip(self.vals))
+        ip = ipol.RegularGrid(np.dstack(np.meshgrid(np.arange(3.),
+                                                    np.arange(3.))),
+                              np.array([[0.5, 0.5], [1., 4.]]))
+        matrix = ipol.IpolBase.to_sparse(ip)
+        np.testing.assert_allclose(matrix.toarray(), ip.to_sparse().toarray())
+        self.assertEqual(matrix[1].nnz, 0)
+        # many sources and few targets
+        sizes = []
+
+        class RecordingIdw(ipol.Idw):
+            def __call__(self, vals):
+                sizes.append(np.size(vals))
+                return ipol.Idw.__call__(self, vals)
+
+        src = np.random.RandomState(42).uniform(size=(4000, 2))
+        ip = RecordingIdw(src, np.array([[0.5, 0.5]]))
+        matrix = ipol.IpolBase.to_sparse(ip)
+        self.assertEqual(matrix.nnz, 4)
+        np.testing.assert_allclose(matrix.toarray(), ip.to_sparse().toarray())
+        self.assertTrue(max(sizes) <= 2 ** 20)
+
+    def test_NanInterpolator(self):
+        """testing the interpolation of fields with missing values"""
+        np.random.seed(42)
+        src = np.random.uniform(0, 10, size=(20, 2))
+        trg = np.random.uniform(0, 10, size=(30, 2))
+        vals = np.random.uniform(size=(20, 6, 2))
+        vals[3, :3] = np.nan
+        vals[7, 1::2] = np.nan
+        vals[:, 5, 1] = np.nan
+        ip = ipol.NanInterpolator(src, trg, ipol.Idw, nnearest=4)
+        res = ip(vals)
+        self.assertEqual(res.shape, (30, 6, 2))
+        self.assertEqual(len(ip.cache), 3)
+        # compare with interpolations of the valid source points
+        for j in range(6):
+            for k in range(2):
+                valid = np.isfinite(vals[:, j, k])
+                if not valid.any():
+                    self.assertTrue(np.isnan(res[:, j, k]).all())
+                    continue
+                ref = ipol.Idw(src[valid], trg, nnearest=4)(vals[valid, j, k])
+                np.testing.assert_allclose(res[:, j, k], ref)
+        np.testing.assert_allclose(
+            ipol.interpolate(src, trg, vals, ipol.Idw, nnearest=4), res)
+        np.testing.assert_allclose(
+            ipol.interpolate(src, trg, vals[:, :, 0], ipol.Idw, nnearest=4),
+            res[:, :, 0])
+        # least recently used patterns are discarded
+        ip.maxsize = 2
+        ip(vals[:, :, 0])
+        self.assertEqual(len(ip.cache), 2)
+        # drifts are subset accordingly
+        src_d = src[:, 0]
+        trg_d = trg[:, 0]
+        ip = ipol.NanInterpolator(src, trg, ipol.ExternalDriftKriging,
+                                  '1.0 Exp(10.)', src_drift=src_d,
+                                  trg_drift=trg_d)
+        res = ip(vals[:, :, 0])
+        valid = np.isfinite(vals[:, 0, 0])
+        ref = ipol.ExternalDriftKriging(src[valid], trg, '1.0 Exp(10.)',
+                                        src_drift=src_d[valid],
+                                        trg_drift=trg_d)(vals[valid, 0, 0])
+        np.testing.assert_allclose(res[:, 0], ref.ravel())
+
+    def test_TiledInterpolator(self):
+        """testing the interpolation to target points tile by tile"""
+        np.random.seed(42)
+        src = np.random.uniform(0, 10, size=(20, 2))
+        trg = np.random.uniform(0, 10, size=(55, 2))
+        vals = np.random.uniform(size=(20, 3))
+        drift = np.random.uniform(size=75)
+        ips = [(ipol.Nearest, (), {}),
+               (ipol.Idw, (), dict(nnearest=4, workers=2)),
+               (ipol.OrdinaryKriging, ('1.0 Exp(5.)',), dict(nnearest=6)),
+               (ipol.ExternalDriftKriging, ('1.0 Exp(5.)',),
+                dict(nnearest=6, src_drift=drift[:20],
+                     trg_drift=drift[20:]))]
+        for Interpolator, args, kwargs in ips:
+            ref = Interpolator(src, trg, *args, **kwargs)(vals)
+            ip = ipol.TiledInterpolator(src, trg, Interpolator, *args,
+                                        tilesize=10, **kwargs)
+            self.assertEqual(len(list(ip.tiles())), 6)
+            np.testing.assert_allclose(ip(vals), ref)
+            # the tree of the source points is shared
+            self.assertTrue(ip.interpolator(slice(0, 10)).tree is ip.tree)
+        # arguments of the call of the interpolator
+        ip = ipol.TiledInterpolator(src, trg, ipol.Nearest, tilesize=10)
+        ref = ipol.Nearest(src, trg)(vals[:, 0], maxdist=0.5)
+        self.assertTrue(np.isnan(ref).any())
+        np.testing.assert_allclose(ip(vals[:, 0], 0.5), ref)
+        np.testing.assert_allclose(ip(vals[:, 0], maxdist=0.5), ref)
+        ip = ipol.TiledInterpolator(src, trg, ipol.ExternalDriftKriging,
+                                    '1.0 Exp(5.)', nnearest=6, tilesize=10)
+        ref = ipol.ExternalDriftKriging(src, trg, '1.0 Exp(5.)',
+                                        nnearest=6)(vals,
+                                                    src_drift=drift[:20],
+                                                    trg_drift=drift[20:])
+        np.testing.assert_allclose(ip(vals, src_drift=drift[:20],
+                                      trg_drift=drift[20:]), ref)
+        # streaming into a memory mapped output
+        tmp = tempfile.NamedTemporaryFile()
+        out = np.memmap(tmp, dtype='f4', mode='w+', shape=(55, 3))
+        ip = ipol.TiledInterpolator(src, trg, ipol.Idw, tilesize=7)
+        self.assertTrue(ip(vals, out=out) is out)
+        np.testing.assert_allclose(out, ipol.Idw(src, trg)(vals), rtol=1e-6)
+
+    def test_leave_one_out(self):
+        """testing the leave-one-out interpolation to the source points"""
+        np.random.seed(42)
+        src = np.random.uniform(0, 10, size=(15, 2))
+        vals = np.random.uniform(size=(15, 2))
+        drift = np.random.uniform(size=15)
+        ips = [(ipol.Nearest, (), {}),
+               (ipol.Idw, (), dict(nnearest=4)),
+               (ipol.OrdinaryKriging, ('1.0 Exp(5.)',), dict(nnearest=6)),
+               (ipol.OrdinaryKriging, ('1.0 Exp(5.)',), dict(nnearest=14)),
+               (ipol.ExternalDriftKriging, ('1.0 Exp(5.)',),
+                dict(nnearest=14, src_drift=drift)),
+               (ipol.Linear, (), {}),
+               (ipol.NanInterpolator, (ipol.Idw,), dict(nnearest=4))]
+        for Interpolator, args, kwargs in ips:
+            loo = ipol.leave_one_out(src, Interpolator, *args, **kwargs)
+            self.assertFalse(loo.matrix.diagonal().any())
+            res = loo(vals)
+            for i in range(15):
+                others = np.delete(np.arange(15), i)
+                kw = dict(kwargs)
+                if 'src_drift' in kw:
+                    kw.update(src_drift=drift[others],
+                              trg_drift=drift[i:i + 1])
+                ref = Interpolator(src[others], src[i:i + 1], *args,
+                                   **kw)(vals[others])
+                np.testing.assert_allclose(res[i], np.ravel(ref))
+
     def test_MissingErrors(self):
         self.assertRaises(ipol.MissingSourcesError,
                           ipol.Nearest, np.array([]), self.trg)
@@ -244,6 +525,57 @@ class Regular2IrregularTest(unittest.TestCase):
                                                    self.newgrid,
                                                    order=1, prefilter=False)))
 
+    def test_RegularGrid(self):
+        ip = ipol.RegularGrid(self.cartgrid, self.newgrid)
+        np.testing.assert_allclose(ip(self.values),
+                                   self.result.ravel())
+        # several fields at once, origin 'upper'
+        vals = np.dstack((self.values, self.values ** 2))
+        ip = ipol.RegularGrid(self.cartgrid[::-1], self.newgrid)
+        res = ip(vals[::-1])
+        self.assertEqual(res.shape, (8, 2))
+        np.testing.assert_allclose(res[:, 0], self.result.ravel())
+        np.testing.assert_allclose(ip(vals[::-1].reshape(16, 2)), res)
+        sp = ipol.SparseInterpolator(ip)
+        np.testing.assert_allclose(sp(vals[::-1].reshape(16, 2)), res)
+        # nearest neighbours and outside points
+        trg = np.array([[-1.4, 0.4], [0.4, -1.4], [3., 0.]])
+        ip = ipol.RegularGrid(self.cartgrid, trg, method='nearest',
+                              fill_value=-1.)
+        np.testing.assert_allclose(ip(self.values),
+                                   [self.values[2, 0], self.values[0, 2], -1.])
+        # cubic convolution reproduces quadratic fields
+        x, y = np.meshgrid(np.arange(10.), np.arange(8.))
+        trg = np.random.uniform(1, 6, size=(50, 2))
+        ip = ipol.RegularGrid(np.dstack((x, y)), trg, method='cubic')
+        np.testing.assert_allclose(ip(x ** 2 - 3 * x * y + y ** 2),
+                                   trg[:, 0] ** 2 - 3 * trg.prod(axis=1) +
+                                   trg[:, 1] ** 2)
+        self.assertRaises(ValueError,
+                          lambda: ipol.RegularGrid(self.cartgrid, trg,
+                                                   method='quintic'))
+
+    def test_PolarGrid(self):
+        np.random.seed(42)
+        az = np.arange(0.5, 360., 1.)
+        r = np.arange(0.5, 100.)
+        vals = np.cos(np.radians(az))[:, np.newaxis] * r
+        vals = np.dstack((vals, np.ones(vals.shape)))
+        trg = np.random.uniform(-90, 90, size=(200, 2))
+        trg = np.vstack((trg, [[0., 19.6], [-0.01, 19.6], [0., 0.2]]))
+        ip = ipol.PolarGrid(az, r, trg)
+        res = ip(vals)
+        self.assertEqual(res.shape, (203, 2))
+        # y = r * cos(az) is reproduced, also across north
+        dist = np.hypot(trg[:, 0], trg[:, 1])
+        valid = (dist > 0.5) & (dist < 99.5)
+        np.testing.assert_allclose(res[valid, 0], trg[valid, 1], rtol=1e-3)
+        np.testing.assert_allclose(res[valid, 1], 1.)
+        self.assertTrue(np.isnan(res[~valid]).all())
+        ip = ipol.PolarGrid(az, r, trg, method='nearest')
+        np.testing.assert_allclose(ip(vals)[-3:-1, 0],
+                                   [vals[0, 19, 0], vals[-1, 19, 0]])
+
 
 if __name__ == '__main__':
     unittest.main()
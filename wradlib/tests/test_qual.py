@@ -100,3 +100,37 @@ class BeamBlockFracTest(unittest.TestCase):
         """
         cbb = qual.cum_beam_block_frac(self.sample_pbb)
         self.assertTrue(np.allclose(cbb, self.sample_cbb))
+        # nans are skipped, values before the maximum are at least zero
+        pbb = np.array([[np.nan, -0.1, 0.2, np.nan, 0.1, 0.3, 0.1],
+                        [-0.2, -0.3, -0.1, -0.2, np.nan, -0.3, -0.4]])
+        cbb = np.array([[0., 0., 0.2, 0.2, 0.2, 0.3, 0.3],
+                        [0., 0., -0.1, -0.1, -0.1, -0.1, -0.1]])
+        np.testing.assert_allclose(qual.cum_beam_block_frac(pbb), cbb)
+        stack = np.stack([self.sample_pbb, pbb])
+        np.testing.assert_allclose(qual.cum_beam_block_frac(stack),
+                                   np.stack([self.sample_cbb, cbb]))
+
+    def test_beam_blockage(self):
+        calls = []
+
+        def terrain(site, ranges, elevation):
+            calls.append((site, elevation))
+            return np.tile(np.linspace(0., 2000., len(ranges)), (4, 1))
+
+        ranges = np.arange(500., 50000., 1000.)
+        bb = qual.BeamBlockage(terrain, beamwidth=1.)
+        pbb, cbb = bb('site', ranges, [0.5, 1.5], sitealt=100.)
+        self.assertEqual(pbb.shape, (2, 4, 50))
+        self.assertTrue(((pbb >= 0) & (pbb <= 1)).all())
+        np.testing.assert_array_equal(cbb, qual.cum_beam_block_frac(pbb))
+        self.assertTrue((cbb[1] <= cbb[0]).all())
+        # cached sweeps are not recomputed
+        maps = bb.sites({'site': (ranges, [0.5, 2.5], 100.)})
+        np.testing.assert_array_equal(maps['site'][0], cbb[0])
+        self.assertEqual(calls, [('site', 0.5), ('site', 1.5),
+                                 ('site', 2.5)])
+        # the cached maps are read-only
+        pbb, cbb = bb.sweep('site', ranges, 0.5, sitealt=100.)
+        self.assertRaises(ValueError, pbb.__setitem__, 0, 1.)
+        self.assertRaises(ValueError, cbb.__setitem__, 0, 1.)
+        self.assertTrue(bb('site', ranges, [0.5])[0].flags.writeable)
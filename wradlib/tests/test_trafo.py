@@ -3,6 +3,7 @@
 # Distributed under the MIT License. See LICENSE.txt for more info.
 
 import unittest
+import tempfile
 import numpy as np
 import wradlib.trafo as trafo
 
@@ -39,6 +40,32 @@ class TransformationTest(unittest.TestCase):
         self.assertTrue(
             np.allclose(trafo.r2depth(self.r, 360), np.array([0.5, 1., 2.])))
 
+    def test_running_accumulation(self):
+        np.random.seed(42)
+        rate = np.random.uniform(0, 10, (30, 3, 4))
+        rate[np.random.uniform(0, 1, rate.shape) < 0.1] = np.nan
+        acc = trafo.RunningAccumulation((3, 4), 300, [900, 3600],
+                                        minpercvalid=75.)
+        for i in range(30):
+            acc.update(None if i == 20 else rate[i])
+        rate[20] = np.nan
+        depth = trafo.r2depth(rate, 300)
+        for window, nsteps in zip([900, 3600], [3, 12]):
+            count = np.sum(np.isfinite(depth[-nsteps:]), axis=0)
+            res = np.where(count >= 0.75 * nsteps,
+                           np.nansum(depth[-nsteps:], axis=0), np.nan)
+            np.testing.assert_array_equal(acc.count(window), count)
+            np.testing.assert_allclose(acc.accumulation(window), res,
+                                       rtol=1e-5)
+        with tempfile.NamedTemporaryFile(suffix='.npz') as f:
+            acc.save(f.name)
+            acc2 = trafo.RunningAccumulation.load(f.name)
+        acc.update(rate[0])
+        acc2.update(rate[0])
+        self.assertEqual(acc2.nframes, 31)
+        np.testing.assert_array_equal(acc2.accumulation(3600),
+                                      acc.accumulation(3600))
+
     def test_kdp2r(self):
         self.assertTrue(np.allclose(trafo.kdp2r(self.kdp, 9.45), np.array(
             [0., 19.11933017, 34.46261032, 75.09260608])))
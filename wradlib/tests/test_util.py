@@ -45,6 +45,33 @@ class HelperFunctionsTest(unittest.TestCase):
         self.assertEqual(util._get_tdelta(tstart_str, tend_str, as_secs=True),
                          366 * 24 * 60 * 60 + 3600)
 
+    @fail_if_not_removed
+    def test_aggregate_equidistant_tseries(self):
+        tends_src = ["2000-01-01 02:00:00", "2000-01-01 03:00:00",
+                     "2000-01-01 04:00:00", "2000-01-01 05:00:00",
+                     "2000-01-01 12:00:00"]
+        src = np.array([[1, 1, 1, 1, 1],
+                        [1, 2, np.nan, 4, 5]]).T
+        tstarts, tends, agg = util.aggregate_equidistant_tseries(
+            "2000-01-01 00:00:00", "2000-01-02 00:00:00", 3600 * 6,
+            tends_src, 3600, src, minpercvalid=50.)
+        self.assertEqual(len(tstarts), 4)
+        self.assertEqual(tends[0], dt.datetime(2000, 1, 1, 6))
+        np.testing.assert_array_equal(agg, [[4., 7.], [np.nan, np.nan],
+                                            [np.nan, np.nan],
+                                            [np.nan, np.nan]])
+        agg = util.aggregate_equidistant_tseries(
+            "2000-01-01 00:00:00", "2000-01-02 00:00:00", 3600 * 6,
+            tends_src, 3600, src, method="mean", minpercvalid=10.)[2]
+        np.testing.assert_array_equal(agg[[0, 1], 1], [7. / 3., 5.])
+        # source time steps which are not aligned with the target windows
+        tends_src[1] = "2000-01-01 03:30:00"
+        agg = util.aggregate_equidistant_tseries(
+            "2000-01-01 00:00:00", "2000-01-02 00:00:00", 3600 * 6,
+            tends_src, 3600, src, minpercvalid=10.)[2]
+        self.assertTrue(np.isnan(agg[0]).all())
+        self.assertEqual(agg[1, 0], 1.)
+
     def test__idvalid(self):
         data = np.array(
             [np.inf, np.nan, -99., 99, -9999., -9999, -10., -5., 0., 5., 10.])
@@ -89,6 +116,62 @@ class HelperFunctionsTest(unittest.TestCase):
                     dt.datetime(2000, 1, 2, 0, 0)]
         self.assertEqual(out, shouldbe)
 
+    def test_to_datetime64(self):
+        out = util.to_datetime64(["2000-01-01 00:00:00",
+                                  "2000-01-01T01:00:00",
+                                  dt.datetime(2000, 1, 1, 2)], unit='s')
+        shouldbe = np.array(['2000-01-01T00:00', '2000-01-01T01:00',
+                             '2000-01-01T02:00'], dtype='datetime64[s]')
+        np.testing.assert_array_equal(out, shouldbe)
+        aware = dt.datetime(2000, 1, 1, 1, tzinfo=util.UTC())
+        self.assertEqual(util.to_datetime64(aware),
+                         np.datetime64('2000-01-01T01:00'))
+
+    def test_time_axis(self):
+        out = util.time_axis("2000-01-01 00:00:00", "2000-01-02 00:00:00",
+                             3600 * 6)
+        shouldbe = util.from_to("2000-01-01 00:00:00",
+                                "2000-01-02 00:00:00", 3600 * 6)
+        self.assertEqual(out.tolist(), shouldbe)
+        out = util.time_axis("2000-01-01 00:00:00", "2000-01-01 00:59:00",
+                             900, unit='s')
+        self.assertEqual(len(out), 4)
+
+    def test_time_index(self):
+        taxis = util.time_axis("2000-01-01 00:00:00", "2000-01-01 03:00:00",
+                               3600)
+        times = ["1999-12-31 23:00:00", "2000-01-01 00:00:00",
+                 "2000-01-01 00:00:01", "2000-01-01 01:00:00",
+                 "2000-01-01 02:30:00", "2000-01-01 03:00:01"]
+        np.testing.assert_array_equal(util.time_index(times, taxis),
+                                      [-1, -1, 0, 0, 2, 3])
+
+    def test_average_over_time_windows(self):
+        # linear time series, 0.01 per second
+        dt_src = util.time_axis("2000-01-01 00:00:00", "2000-01-01 00:20:01",
+                                600, unit='s')
+        src = np.array([[0., 0.], [6., 12.], [12., 24.]])
+        dt_trg = ["1999-12-31 23:55:00", "2000-01-01 00:05:00",
+                  "2000-01-01 00:25:00"]
+        out = util.average_over_time_windows(src, dt_src, dt_trg)
+        # helpers at -300 (extrapolated by nearest neighbour), 0, 300 and
+        # 300, 600, 900, 1200 seconds, including the window limits
+        np.testing.assert_allclose(out, [[1., 2.], [7.5, 15.]])
+        # helpers farther than maxdist from the next source time step
+        dt_trg[0] = "1999-12-31 23:50:00"
+        out = util.average_over_time_windows(src[:, 0], dt_src, dt_trg)
+        np.testing.assert_allclose(out, [0.75, 7.5])
+        out = util.average_over_time_windows(src[:, 0], dt_src, dt_trg,
+                                             maxdist=450)
+        np.testing.assert_allclose(out, [np.nan, 7.5])
+        # helper interval larger than the target windows
+        dt_trg = ["1999-12-31 23:55:00", "2000-01-01 00:05:00",
+                  "2000-01-01 00:06:00"]
+        out = util.average_over_time_windows(src[:, 0], dt_src, dt_trg,
+                                             helper_interval=400)
+        # helpers at -300 and 100 seconds, none in the second window
+        np.testing.assert_allclose(out, [0.5, np.nan])
+
     def test_calculate_polynomial(self):
         data = np.arange(0, 10, 1)
         w = np.arange(0, 5, 1)
@@ -203,6 +286,26 @@ class TestUtil(unittest.TestCase):
                                          np.array([250., 250])),
             correct))
 
+    def test_maximum_intensity_projection(self):
+        r = np.arange(10) * 1000.
+        az = np.arange(36) * 10.
+        data = np.zeros((36, 10))
+        data[9, 5] = 10.  # gate at 90 degrees, 5 km
+        xs, ys, mip = util.maximum_intensity_projection(data, r=r, az=az,
+                                                        angle=0., elev=0.5)
+        self.assertEqual(xs.shape, (11, 21))
+        self.assertEqual(ys.shape, (11, 21))
+        self.assertEqual(mip.shape, (10, 20))
+        self.assertEqual(np.nanmax(mip), 10.)
+        self.assertEqual(np.nanmin(mip), 0.)
+        j, i = np.unravel_index(np.nanargmax(mip), mip.shape)
+        self.assertTrue(xs[0, i] <= 5000. < xs[0, i + 1])
+        self.assertTrue(ys[j, 0] <= ys[j + 1, 0])
+        # interpolated gaps keep the constant value
+        xs, ys, mip = util.maximum_intensity_projection(np.ones((36, 10)),
+                                                        r=r, az=az)
+        np.testing.assert_array_equal(mip[np.isfinite(mip)], 1.)
+
 
 class FindBboxIndicesTest(unittest.TestCase):
     def setUp(self):
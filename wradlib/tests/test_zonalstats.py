@@ -233,7 +233,17 @@ class ZonalDataTest(unittest.TestCase):
 
 class ZonalStatsTest(unittest.TestCase):
     # TODO: create tests for ZonalStatsBase class and descendants
-    pass
+    def test_to_sparse(self):
+        ix = [np.array([0, 1, 2]), np.array([3]), np.array([4, 5])]
+        w = [np.array([1., 2., 1.]), np.array([0.]), np.array([3., 2.])]
+        zs = zonalstats.ZonalStatsBase(ix=ix, w=w)
+        vals = np.arange(6.)
+        matrix = zs.to_sparse()
+        self.assertEqual(matrix.shape, (3, 6))
+        self.assertEqual(matrix.getrow(1).nnz, 0)
+        np.testing.assert_allclose(matrix.dot(vals)[[0, 2]],
+                                   zs.mean(vals)[[0, 2]])
+        self.assertEqual(zs.to_sparse(numsources=10).shape, (3, 10))
 
 
 class ZonalStatsUtilTest(unittest.TestCase):
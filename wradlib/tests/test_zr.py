@@ -66,6 +66,44 @@ class ZRConversionTest(unittest.TestCase):
         self.assertTrue(np.allclose(rr, res_rr))
         self.assertTrue(np.allclose(si, res_si))
 
+    def test_z2rEnhanced_stack(self):
+        z = trafo.idecibel(np.stack([self.img, self.img[::-1]] * 3))
+        res_rr, res_si = zr.z2rEnhanced(z, chunksize=4)
+        self.assertEqual(res_rr.shape, z.shape)
+        for i in range(len(z)):
+            rr, si = zr.z2rEnhanced(z[i])
+            np.testing.assert_allclose(res_rr[i], rr)
+            np.testing.assert_allclose(res_si[i], si)
+        out = np.empty(z.shape, dtype=np.float32)
+        res_rr32, res_si32 = zr.z2rEnhanced(z, out=out)
+        self.assertIs(res_rr32, out)
+        self.assertEqual(res_si32.dtype, np.float32)
+        np.testing.assert_allclose(res_si32, res_si, atol=1e-5)
+        np.testing.assert_array_equal(
+            res_rr32, zr.z2rEnhanced(z, dtype=np.float32)[0])
+
+    def test_z2r_lookup_table(self):
+        table = zr.z2r_lookup_table(nodata=255, undetect=0)
+        self.assertEqual(table.shape, (256,))
+        self.assertEqual(table.dtype, np.float32)
+        code = np.arange(256, dtype=np.uint8).reshape(16, 16)
+        rr = zr.code2r(code, table)
+        self.assertTrue(np.isnan(rr[-1, -1]))
+        self.assertEqual(rr[0, 0], 0.)
+        res = zr.z2r(trafo.idecibel(trafo.rvp2dBZ(code.astype(float))))
+        np.testing.assert_allclose(rr.ravel()[1:-1], res.ravel()[1:-1],
+                                   rtol=1e-6)
+        out = np.empty(code.shape, dtype=np.float32)
+        self.assertIs(zr.code2r(code, table, out=out), out)
+        table = zr.z2r_lookup_table(gain=0.01, offset=-327.68, nbits=16,
+                                    dtype=np.float64)
+        self.assertEqual(table.shape, (65536,))
+        code = np.array([32768, 33768], dtype=np.uint16)
+        np.testing.assert_allclose(zr.code2r(code, table),
+                                   zr.z2r(trafo.idecibel(np.array([0., 10.]))))
+        self.assertRaises(IndexError, zr.code2r, np.array([65536]), table)
+        self.assertRaises(ValueError, zr.code2r, np.array([3, -1]), table)
+
 
 if __name__ == '__main__':
     unittest.main()
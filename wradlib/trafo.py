@@ -20,6 +20,7 @@ to dBZ-values to Z-values and vice versa.
    decibel
    idecibel
    r2depth
+   RunningAccumulation
    kdp2r
    si2kmh
    si2mph
@@ -168,6 +169,196 @@ def r2depth(x, interval):
     return x * interval / 3600.
 
 
+class RunningAccumulation():
+    """
+    RunningAccumulation(shape, interval, windows, minpercvalid=100.,
+    dtype=np.float32)
+
+    Rolling rainfall depths over several window lengths.
+
+    Rain rate frames of a fixed `interval` are folded in one at a time with
+    :meth:`update`. The depth of every frame (see :meth:`r2depth`) is kept in
+    a ring buffer covering the longest window, so the sum of each window is
+    updated by adding the new frame and subtracting the frame which falls
+    out of the window, independent of the window length. The number of valid
+    frames is tracked per window and bin, and sums which are not supported
+    by at least `minpercvalid` percent of the expected frames are set to
+    NaN, as in :meth:`~wradlib.util.aggregate_equidistant_tseries`.
+
+    The state can be stored with :meth:`save` and restored with :meth:`load`.
+
+    .. versionadded:: 0.12.0
+
+    Parameters
+    ----------
+    shape : tuple
+        shape of the rain rate frames
+    interval : int
+        time interval (s) each frame represents
+    windows : sequence of ints
+        window lengths (s), must be multiples of `interval`
+    minpercvalid : float
+        Minimum percentage of valid frames within a window that are required
+        to compute a sum.
+    dtype : data-type
+        data type of the ring buffer and the returned sums. The running sums
+        are kept in float64.
+
+    Examples
+    --------
+    >>> import wradlib
+    >>> import numpy as np
+    >>> acc = wradlib.trafo.RunningAccumulation((2, 2), 300, [3600, 86400])
+    >>> for i in range(12):
+    ...     acc = acc.update(np.ones((2, 2)))
+    >>> print(acc.accumulation(3600))
+    [[1. 1.]
+     [1. 1.]]
+
+    """
+
+    def __init__(self, shape, interval, windows, minpercvalid=100.,
+                 dtype=np.float32):
+        self.shape = tuple(shape)
+        self.interval = interval
+        self.windows = tuple(windows)
+        for window in self.windows:
+            assert window % interval == 0, \
+                "Window %d is not a multiple of interval %d." % (window,
+                                                                 interval)
+        self.nsteps = [int(window // interval) for window in self.windows]
+        self.minpercvalid = minpercvalid
+        self.dtype = np.dtype(dtype)
+        self.nframes = 0
+        nbuf = max(self.nsteps)
+        self._buffer = np.full((nbuf,) + self.shape, np.nan, dtype=self.dtype)
+        self._sum = np.zeros((len(self.windows),) + self.shape)
+        self._count = np.zeros((len(self.windows),) + self.shape,
+                               dtype=np.int32)
+
+    def _window_index(self, window):
+        assert window in self.windows, \
+            "Window %s is not accumulated, use one of %s." % (window,
+                                                              self.windows)
+        return self.windows.index(window)
+
+    def update(self, rate):
+        """
+        Fold in the next frame.
+
+        Parameters
+        ----------
+        rate : array_like
+            rain rates (mm/h) of shape :attr:`shape`. NaNs mark invalid bins,
+            None marks a missing frame.
+
+        Returns
+        -------
+        self : :class:`RunningAccumulation`
+        """
+        slot = self.nframes % len(self._buffer)
+        if rate is None:
+            depth = np.full(self.shape, np.nan, dtype=self.dtype)
+        else:
+            depth = r2depth(np.asanyarray(rate, dtype=self.dtype),
+                            self.interval)
+            assert depth.shape == self.shape, \
+                "Shape of `rate` does not match the accumulation shape."
+        valid = np.isfinite(depth)
+        for k, nsteps in enumerate(self.nsteps):
+            if self.nframes >= nsteps:
+                # remove the frame which falls out of the window
+                old = self._buffer[(slot - nsteps) % len(self._buffer)]
+                expired = np.isfinite(old)
+                np.subtract(self._sum[k], old, out=self._sum[k],
+                            where=expired)
+                self._count[k] -= expired
+                # no rounding residues in empty windows
+                self._sum[k][self._count[k] == 0] = 0.
+            np.add(self._sum[k], depth, out=self._sum[k], where=valid)
+            self._count[k] += valid
+        self._buffer[slot] = depth
+        self.nframes += 1
+        return self
+
+    def count(self, window):
+        """
+        Number of valid frames per bin within `window`.
+
+        Parameters
+        ----------
+        window : int
+            window length (s), one of :attr:`windows`
+
+        Returns
+        -------
+        output : array
+        """
+        return self._count[self._window_index(window)].copy()
+
+    def accumulation(self, window):
+        """
+        Rainfall depth (mm) of the latest `window` seconds.
+
+        Parameters
+        ----------
+        window : int
+            window length (s), one of :attr:`windows`
+
+        Returns
+        -------
+        output : array
+            rainfall depth, NaN where less than :attr:`minpercvalid` percent
+            of the frames within the window are valid
+        """
+        k = self._window_index(window)
+        nvalid = self.minpercvalid / 100. * self.nsteps[k]
+        return np.where(self._count[k] >= nvalid, self._sum[k],
+                        np.nan).astype(self.dtype)
+
+    def save(self, filename):
+        """
+        Save the state to a numpy `.npz` file.
+
+        Parameters
+        ----------
+        filename : string
+            name of the output file
+        """
+        np.savez_compressed(filename, shape=np.array(self.shape),
+                            interval=self.interval,
+                            windows=np.array(self.windows),
+                            minpercvalid=self.minpercvalid,
+                            dtype=self.dtype.str, nframes=self.nframes,
+                            buffer=self._buffer, sum=self._sum,
+                            count=self._count)
+
+    @classmethod
+    def load(cls, filename):
+        """
+        Restore a state saved with :meth:`save`.
+
+        Parameters
+        ----------
+        filename : string
+            name of the `.npz` file
+
+        Returns
+        -------
+        output : :class:`RunningAccumulation`
+        """
+        with np.load(filename) as state:
+            acc = cls(tuple(state['shape']), state['interval'].item(),
+                      state['windows'].tolist(),
+                      minpercvalid=float(state['minpercvalid']),
+                      dtype=str(state['dtype']))
+            acc.nframes = int(state['nframes'])
+            acc._buffer[:] = state['buffer']
+            acc._sum[:] = state['sum']
+            acc._count[:] = state['count']
+        return acc
+
+
 def kdp2r(kdp, f, a=129., b=0.85):
     """Estimating rainfall intensity directly from specific differential phase.
 
@@ -17,6 +17,9 @@ attributable to the other modules
    aggregate_in_time
    aggregate_equidistant_tseries
    from_to
+   to_datetime64
+   time_axis
+   time_index
    filter_window_polar
    filter_window_cartesian
    find_bbox_indices
@@ -26,9 +29,9 @@ attributable to the other modules
 """
 import datetime as dt
 from datetime import tzinfo, timedelta
-from time import mktime
 import warnings
 import functools
+import importlib
 import os
 import deprecation
 from deprecation import deprecated
@@ -178,7 +181,7 @@ latest/gettingstarted.html#optional-dependencies
     for further instructions.
     """
     try:
-        mod = __import__(module)
+        mod = importlib.import_module(module)
     except ImportError:
         mod = OptionalModuleStub(module)
 
@@ -226,7 +229,8 @@ def aggregate_equidistant_tseries(tstart, tend, tdelta, tends_src, tdelta_src,
     tdelta_src : integer
         resolution of the source data (seconds)
     src : :class:`numpy:numpy.ndarray`
-        1-d array of floats source values
+        array of floats source values of shape (number of source time
+        steps, ...), e.g. (number of source time steps, number of series)
     method : string
         Method of aggregation (either "sum" or "mean")
     minpercvalid : float
@@ -247,7 +251,8 @@ def aggregate_equidistant_tseries(tstart, tend, tdelta, tends_src, tdelta_src,
         array of timestamps which defines the end of each target time
         step/window
     agg : :class:`numpy:numpy.ndarray`
-        Array of aggregated values
+        Array of aggregated values of shape (number of target time
+        steps, ...)
         aggregated values for each target time step
 
     Examples
@@ -269,7 +274,6 @@ def aggregate_equidistant_tseries(tstart, tend, tdelta, tends_src, tdelta_src,
     src = np.array(src)
     tstart = iso2datetime(tstart)
     tend = iso2datetime(tend)
-    tends_src = np.array([iso2datetime(item) for item in tends_src])
     twins = np.array(from_to(tstart, tend, tdelta))
     tstarts = twins[:-1]
     tends = twins[1:]
@@ -279,8 +283,12 @@ def aggregate_equidistant_tseries(tstart, tend, tdelta, tends_src, tdelta_src,
         "Length of source timestamps tends_src must " \
         "equal length of source data src."
 
+    # integer offsets [us] of the source time steps from tstart
+    offsets = (to_datetime64(tends_src) -
+               to_datetime64(tstart)).astype(np.int64)
+
     # Check that source time steps are sorted correctly
-    assert np.all(np.sort(tends_src) == tends_src), \
+    assert np.all(np.diff(offsets) >= 0), \
         "The source time steps are not in chronological order."
 
     # number of expected source time steps per target timestep
@@ -288,47 +296,46 @@ def aggregate_equidistant_tseries(tstart, tend, tdelta, tends_src, tdelta_src,
         "Target resolution %d is not a multiple of " \
         "source resolution %d." % (tdelta, tdelta_src)
     nexpected = tdelta / tdelta_src
-
-    # results container
-    agg = np.repeat(np.nan, len(tstarts))
-
-    inconsistencies = 0
-    # iterate over target time windows
-    for i, begin in enumerate(tstarts):
-        end = tends[i]
-        # select source data that is between start and end of this interval
-        ixinside = np.where((tends_src > begin) & (tends_src <= end))[0]
-        # Time steps and array shape in that interval sized as if
-        # it had no gaps
-        tends_src_expected = np.array(from_to(begin, end, tdelta_src)[1:])
-        srcfull = np.repeat(np.nan, len(tends_src_expected))
-        # These are the indices of srcfull which actually have
-        # data according to src
-        validix = np.where(np.in1d(tends_src_expected, tends_src[ixinside]))[0]
-        if not len(validix) == len(ixinside):
-            # If we find time stamps in tends_src[ixinside] that are not
-            #   contained in the expected cintiguous time steps
-            #   (tends_src_expected),
-            #   we assume that the data is corrupt (can have multiple reasons,
-            #   e.g. wrong increment)
-            inconsistencies += 1
-            continue
-        srcfull[validix] = src[ixinside]
-        # valid source values found in target time window
-        nvalid = len(np.where(~np.isnan(srcfull))[0])
-        if nvalid > nexpected:
-            # If we have more source time steps in target interval than
-            # expected aomething must be wrong.
-            inconsistencies += 1
-            continue
-        if float(nvalid) / float(nexpected) >= minpercvalid / 100.:
-            if method == "sum":
-                agg[i] = np.nansum(srcfull)
-            elif method == "mean":
-                agg[i] = np.nanmean(srcfull)
-            else:
-                print("Aggregation method not known, yet.")
-                raise Exception()
+    if method not in ("sum", "mean"):
+        raise ValueError("Aggregation method not known, yet.")
+
+    # target window (begin, end] and position within the window of each
+    # source time step
+    delta = tdelta * 1000000
+    delta_src = tdelta_src * 1000000
+    window = (offsets - 1) // delta
+    position = offsets - window * delta
+    inside = (window >= 0) & (window < len(tstarts))
+    window = window[inside]
+    position = position[inside]
+    src = src[inside]
+
+    # source time steps which are not on the expected time steps of their
+    # window, or which occur more than once, invalidate the window
+    bad = (position % delta_src != 0) | \
+        np.append(np.diff(offsets[inside]) == 0, False)
+    inconsistent = np.zeros(len(tstarts), dtype=bool)
+    inconsistent[window[bad]] = True
+
+    # sum and number of valid source values per target window, the source
+    # time steps are sorted, so each window is a contiguous block
+    valid = ~np.isnan(src)
+    sums = np.zeros((len(tstarts),) + src.shape[1:])
+    nvalid = np.zeros((len(tstarts),) + src.shape[1:], dtype=np.int64)
+    if len(window):
+        windows, starts = np.unique(window, return_index=True)
+        sums[windows] = np.add.reduceat(np.where(valid, src, 0.), starts,
+                                        axis=0)
+        nvalid[windows] = np.add.reduceat(valid, starts, axis=0)
+
+    if method == "mean":
+        with np.errstate(invalid='ignore', divide='ignore'):
+            sums = sums / nvalid
+    enough = nvalid / float(nexpected) >= minpercvalid / 100.
+    enough[inconsistent] = False
+    agg = np.where(enough, sums, np.nan)
+
+    inconsistencies = np.count_nonzero(inconsistent)
     if inconsistencies > 0:
         print("WARNING: Inconsistent source times "
               "in %d target time intervals." % inconsistencies)
@@ -617,8 +624,8 @@ def average_over_time_windows(src, dt_src, dt_trg, maxdist=3600,
     # Convert input time steps to numpy arrays
     dt_src, dt_trg = np.array(dt_src), np.array(dt_trg)
 
-    trg_secs = np.array([mktime(tstep.timetuple()) for tstep in dt_trg])
-    src_secs = np.array([mktime(tstep.timetuple()) for tstep in dt_src])
+    trg_secs = to_datetime64(dt_trg, 's').astype(np.int64)
+    src_secs = to_datetime64(dt_src, 's').astype(np.int64)
     helper_secs = np.arange(trg_secs[0], trg_secs[-1], helper_interval)
 
     # Interpolate to target points
@@ -630,7 +637,7 @@ def average_over_time_windows(src, dt_src, dt_trg, maxdist=3600,
     tree = cKDTree(src_secs.reshape((-1, 1)))
     dists, ix = tree.query(helper_secs.reshape((-1, 1)), k=1)
     # deal with edges (in case of extrapolation, we apply nearest neighbour)
-    np.where(np.isnan(helpers), src[ix], helpers)
+    helpers = np.where(np.isnan(helpers), src[ix], helpers)
     # mask out points which are to far from the next source point
     helpers[np.where(dists > maxdist)[0]] = np.nan
 
@@ -639,13 +646,11 @@ def average_over_time_windows(src, dt_src, dt_trg, maxdist=3600,
     trg_shape[0] = len(dt_trg) - 1
     trg = np.repeat(np.nan, _shape2size(trg_shape)).reshape(trg_shape)
 
+    # helper time steps inside the target time windows
+    lower = np.searchsorted(helper_secs, trg_secs[:-1], side='left')
+    upper = np.searchsorted(helper_secs, trg_secs[1:], side='right')
     for i in range(len(dt_trg) - 1):
-        # width of window
-        # width = float(_tdelta2seconds(dt_trg[i + 1] - dt_trg[i]))
-        # These are the intervals completely INSIDE the target time window
-        helper_ix = np.where(np.logical_and(dt_src >= dt_trg[i],
-                                            dt_src <= dt_trg[i + 1]))[0]
-        trg[i] = np.mean(helpers[helper_ix], axis=0)
+        trg[i] = np.mean(helpers[lower[i]:upper[i]], axis=0)
 
     return trg
 
@@ -711,6 +716,116 @@ def from_to(tstart, tend, tdelta):
     return tsteps
 
 
+def _naive_utc(tstep):
+    """Converts a timezone aware datetime object to naive UTC."""
+    if isinstance(tstep, dt.datetime) and tstep.utcoffset() is not None:
+        return (tstep - tstep.utcoffset()).replace(tzinfo=None)
+    return tstep
+
+
+def to_datetime64(times, unit='us'):
+    """Converts timestamps to :class:`numpy:numpy.datetime64` in bulk.
+
+    .. versionadded:: 0.12.0
+
+    Parameters
+    ----------
+    times : datetime isostring, datetime object or datetime64, or a sequence
+        or array of those. ISO strings may separate date and time by a white
+        space, e.g. 2000-01-01 15:34:12. Timezone aware datetime objects are
+        converted to UTC.
+    unit : string
+        time unit of the result, e.g. 's' or 'us'
+
+    Returns
+    -------
+    output : :class:`numpy:numpy.datetime64` or :class:`numpy:numpy.ndarray`
+        of dtype datetime64[unit] with the shape of `times`
+
+    Examples
+    --------
+    >>> print(to_datetime64(["2000-01-01 00:00:00", "2000-01-01T00:05:00"],
+    ...                     unit='s'))
+    ['2000-01-01T00:00:00' '2000-01-01T00:05:00']
+    """
+    times = np.asanyarray(times)
+    if times.dtype.kind == 'O':
+        times = np.array([_naive_utc(tstep) for tstep in times.ravel()],
+                         dtype=object).reshape(times.shape)
+    times = times.astype('datetime64[%s]' % unit)
+    if times.ndim == 0:
+        return times[()]
+    return times
+
+
+def time_axis(tstart, tend, tdelta, unit='us'):
+    """Returns an array of timesteps from <tstart> to <tend> of length <tdelta>
+
+    This is the :class:`numpy:numpy.datetime64` equivalent of
+    :meth:`~wradlib.util.from_to`, generated with :func:`numpy:numpy.arange`.
+
+    .. versionadded:: 0.12.0
+
+    Parameters
+    ----------
+    tstart : datetime isostring, datetime object or datetime64
+    tend : datetime isostring, datetime object or datetime64
+    tdelta : integer representing time interval in SECONDS
+    unit : string
+        time unit of the result
+
+    Returns
+    -------
+    output : :class:`numpy:numpy.ndarray`
+        of dtype datetime64[unit], including `tend` if it is on the axis
+
+    Examples
+    --------
+    >>> print(time_axis("2000-01-01 00:00:00", "2000-01-01 00:10:00", 300,
+    ...                 unit='s'))
+    ['2000-01-01T00:00:00' '2000-01-01T00:05:00' '2000-01-01T00:10:00']
+    """
+    tstart = to_datetime64(tstart, unit)
+    tend = to_datetime64(tend, unit)
+    step = np.timedelta64(tdelta, 's').astype('timedelta64[%s]' % unit)
+    return np.arange(tstart, tend + np.timedelta64(1, unit), step)
+
+
+def time_index(times, taxis):
+    """Maps timestamps to the intervals of a time axis.
+
+    Finds for each timestamp the index *i* of the interval
+    (taxis[i], taxis[i + 1]] containing it, using
+    :func:`numpy:numpy.searchsorted`. This follows the convention of the
+    aggregation functions, where timestamps define the END of time steps.
+
+    .. versionadded:: 0.12.0
+
+    Parameters
+    ----------
+    times : timestamps (see :meth:`~wradlib.util.to_datetime64`)
+    taxis : sorted timestamps defining the interval limits, e.g. as returned
+        by :meth:`~wradlib.util.time_axis`
+
+    Returns
+    -------
+    index : :class:`numpy:numpy.ndarray`
+        interval indices, -1 for timestamps before or at taxis[0] and
+        len(taxis) - 1 for timestamps after taxis[-1]
+
+    Examples
+    --------
+    >>> taxis = time_axis("2000-01-01 00:00:00", "2000-01-01 01:00:00", 1800)
+    >>> print(time_index(["2000-01-01 00:00:00", "2000-01-01 00:10:00",
+    ...                   "2000-01-01 00:30:00", "2000-01-01 02:00:00"],
+    ...                  taxis))
+    [-1  0  0  2]
+    """
+    taxis = to_datetime64(taxis)
+    times = to_datetime64(times)
+    return np.searchsorted(taxis, times, side='left') - 1
+
+
 @deprecated(deprecated_in="0.11.3", removed_in="1.0.0",
             current_version=short_version)
 def _tdelta2seconds(tdelta):
@@ -839,6 +954,18 @@ def _idvalid(data, isinvalid=None, minval=None, maxval=None):
     data : :class:`numpy:numpy.ndarray` of floats
     isinvalid : list of what is considered an invalid value
 
+    """
+    ix = _isinvalid(data, isinvalid=isinvalid, minval=minval, maxval=maxval)
+    return np.where(np.logical_not(ix))[0]
+
+
+def _isinvalid(data, isinvalid=None, minval=None, maxval=None):
+    """Identifies invalid entries in an array of any shape, see
+    :func:`_idvalid`.
+
+    Returns
+    -------
+    output : :class:`numpy:numpy.ndarray` of bool, True for invalid entries
     """
     if isinvalid is None:
         isinvalid = [-99., 99, -9999., -9999]
@@ -849,8 +976,7 @@ def _idvalid(data, isinvalid=None, minval=None, maxval=None):
         ix = np.logical_or(ix, np.ma.masked_less(data, minval).mask)
     if maxval is not None:
         ix = np.logical_or(ix, np.ma.masked_greater(data, maxval).mask)
-
-    return np.where(np.logical_not(ix))[0]
+    return ix
 
 
 def meshgridN(*arrs):
@@ -1001,9 +1127,9 @@ def maximum_intensity_projection(data, r=None, az=None, angle=None,
 
     # providing 'reasonable defaults', based on the data's shape
     if d1 is None:
-        d1 = np.arange(data.shape[1], dtype=np.float)
+        d1 = np.arange(data.shape[1], dtype=float)
     if d2 is None:
-        d2 = np.arange(data.shape[0], dtype=np.float)
+        d2 = np.arange(data.shape[0], dtype=float)
 
     if angle is None:
         angle = 0.0
@@ -1039,35 +1165,38 @@ def maximum_intensity_projection(data, r=None, az=None, angle=None,
     hp[:] = hc
     hc[-1] += 0.0001
 
-    # create meshgrid for polar data
-    xx, yy = np.meshgrid(x, y)
-
     # create meshgrid for cartesian slices
     xs, ys = np.meshgrid(dc, hc)
-    # xs, ys = np.meshgrid(dc,x)
-
-    # convert polar coordinates to cartesian
-    xxx = xx * np.cos(np.radians(90. - yy))
-    # yyy = xx * np.sin(np.radians(90.-yy))
 
-    # digitize coordinates according to cartesian range array
-    range_dig1 = np.digitize(xxx.ravel(), dc)
-    range_dig1.shape = xxx.shape
-
-    # digitize heights according polar height array
-    height_dig1 = np.digitize(hp.ravel(), hc)
-    # reshape accordingly
-    height_dig1.shape = hp.shape
-
-    # what am I doing here?!
-    range_dig1 = range_dig1[0:-1, 0:-1]
-    height_dig1 = height_dig1[0:-1, 0:-1]
-
-    # create height and range masks
-    height_mask = [(height_dig1 == i).ravel().nonzero()[0]
-                   for i in range(1, len(hc))]
-    range_mask = [(range_dig1 == i).ravel().nonzero()[0]
-                  for i in range(1, len(dc))]
+    # the gates are defined by the lower bounds of the polar coordinates
+    nrays, nbins = y.shape[0] - 1, x.shape[0] - 1
+    data = data[:nrays, :nbins]
+
+    # digitize cartesian range of the gates according to cartesian range array
+    xxx = x[:-1] * np.cos(np.radians(90. - y[:-1]))[:, np.newaxis]
+    range_dig = np.digitize(xxx.ravel(), dc) - 1
+
+    # digitize heights, they only depend on the range bin
+    height_dig = np.digitize(hp[0, :-1], hc) - 1
+    height_dig = np.broadcast_to(height_dig, xxx.shape).ravel()
+
+    # combined (height, range) cell id per gate, gates outside are dropped
+    nh, nc = len(hc) - 1, len(dc) - 1
+    valid = ((range_dig >= 0) & (range_dig < nc) &
+             (height_dig >= 0) & (height_dig < nh))
+    cell = height_dig[valid] * nc + range_dig[valid]
+    values = data.ravel()[valid]
+
+    # scatter-max of the gate values into the cells
+    order = np.argsort(cell, kind='mergesort')
+    cell = cell[order]
+    start = np.flatnonzero(np.r_[True, cell[1:] != cell[:-1]])
+    cellmax = np.full(nh * nc, np.nan)
+    has = np.zeros(nh * nc, dtype=bool)
+    if cell.size:
+        cellmax[cell[start]] = np.maximum.reduceat(values[order], start)
+        has[cell[start]] = True
+    cellmax.shape = has.shape = (nh, nc)
 
     # create mip output array, set outval to inf
     mip = np.zeros((d1.shape[0], 2 * d1.shape[0]))
@@ -1075,28 +1204,22 @@ def maximum_intensity_projection(data, r=None, az=None, angle=None,
 
     # fill mip array,
     # in some cases there are no values found in the specified range and height
-    # then we fill in nans and interpolate afterwards
-    for i in range(0, len(range_mask)):
-        mask1 = range_mask[i]
-        found = False
-        for j in range(0, len(height_mask)):
-            mask2 = np.intersect1d(mask1, height_mask[j])
-            # this is to catch the ValueError from the max() routine when
-            # calculating on empty array
-            try:
-                mip[j, i] = data.ravel()[mask2].max()
-                if not found:
-                    found = True
-            except ValueError:
-                if found:
-                    mip[j, i] = np.nan
-
-    # interpolate nans inside image, do not touch outvals
-    good = ~np.isnan(mip)
-    xp = good.ravel().nonzero()[0]
-    fp = mip[~np.isnan(mip)]
-    x = np.isnan(mip).ravel().nonzero()[0]
-    mip[np.isnan(mip)] = np.interp(x, xp, fp)
+    # then we fill in nans (above the lowest filled cell of each column)
+    # and interpolate afterwards
+    found = np.logical_or.accumulate(has, axis=0)
+    mip[:nh, :nc] = np.where(has, cellmax,
+                             np.where(found, np.nan, np.inf))
+
+    # interpolate nans inside image, do not touch outvals,
+    # only the enclosing valid values of the nans are needed
+    isnan = np.isnan(mip).ravel()
+    if isnan.any():
+        x = isnan.nonzero()[0]
+        xp = (~isnan).nonzero()[0]
+        pos = np.searchsorted(xp, x)
+        xp = xp[np.unique(np.r_[np.clip(pos - 1, 0, len(xp) - 1),
+                                np.clip(pos, 0, len(xp) - 1)])]
+        mip.ravel()[x] = np.interp(x, xp, mip.ravel()[xp])
 
     # reset outval to nan
     mip[mip == np.inf] = np.nan
@@ -1111,7 +1234,8 @@ def filter_window_polar(img, wsize, fun, rscale, random=False):
     Parameters
     ----------
     img : :class:`numpy:numpy.ndarray`
-        2d array of values to which the filter is to be applied
+        2d array of values to which the filter is to be applied, or a stack
+        of arrays with shape (..., number of beams, number of range bins)
     wsize : float
         Half size of the window centred on the pixel [m]
     fun : string
@@ -1127,7 +1251,7 @@ def filter_window_polar(img, wsize, fun, rscale, random=False):
         Array with the same shape as `img`, containing the filter's results.
 
     """
-    ascale = 2 * np.pi / img.shape[0]
+    ascale = 2 * np.pi / img.shape[-2]
     data_filtered = np.empty(img.shape, dtype=img.dtype)
     fun = getattr(filters, "%s_filter1d" % fun)
     nbins = img.shape[-1]
@@ -1145,15 +1269,15 @@ def filter_window_polar(img, wsize, fun, rscale, random=False):
         imax = np.where(na >= sa)[0][-1] + 1
         imin = np.where(na <= sa)[0][0]
         if sa == 0:
-            data_filtered[:, imin:imax] = img[:, imin:imax]
+            data_filtered[..., imin:imax] = img[..., imin:imax]
         imin2 = max(imin - sr, 0)
         imax2 = min(imax + sr, nbins)
-        temp = img[:, imin2:imax2]
-        temp = fun(temp, size=2 * sa + 1, mode='wrap', axis=0)
-        temp = fun(temp, size=2 * sr + 1, axis=1)
+        temp = img[..., imin2:imax2]
+        temp = fun(temp, size=2 * sa + 1, mode='wrap', axis=-2)
+        temp = fun(temp, size=2 * sr + 1, axis=-1)
         imin3 = imin - imin2
         imax3 = imin3 + imax - imin
-        data_filtered[:, imin:imax] = temp[:, imin3:imax3]
+        data_filtered[..., imin:imax] = temp[..., imin3:imax3]
     return data_filtered
 
 
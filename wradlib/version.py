@@ -0,0 +1,5 @@
+short_version = '0.11.3'
+version = '0.11.3'
+full_version = '0.11.3'
+git_revision = 'Unknown'
+release = True
@@ -54,6 +54,7 @@ Calling the objects with actual data, however, will be very fast.
 """
 
 import numpy as np
+from scipy import sparse
 from scipy.spatial import cKDTree
 from matplotlib.path import Path
 import matplotlib.patches as patches
@@ -940,6 +941,50 @@ ZonalStats`.
 
         return vals
 
+    def to_sparse(self, numsources=None):
+        """
+        Export the (weighted) zonal mean as sparse matrix.
+
+        .. versionadded:: 0.12.0
+
+        The zonal means are the product of this matrix with the values at the
+        source elements, which allows to combine them with other linear
+        steps, see :class:`wradlib.ipol.SparseInterpolator`. Rows of empty
+        targets have no entries.
+
+        Parameters
+        ----------
+        numsources : int
+            number of source elements, defaults to the number of source
+            elements of `zdata` or to the largest index + 1
+
+        Returns
+        -------
+        matrix : :class:`scipy:scipy.sparse.csr_matrix`
+            normalized weights of shape (number of targets, numsources)
+        """
+        isempty = self.check_empty()
+        if numsources is None:
+            if self.zdata is not None:
+                lyr = self.zdata.src.ds.GetLayerByName('src')
+                lyr.ResetReading()
+                lyr.SetSpatialFilter(None)
+                numsources = lyr.GetFeatureCount()
+            else:
+                numsources = max([np.max(i) for i in self.ix if len(i)]) + 1
+        ix = [np.asarray(self.ix[i], dtype=np.intp)[:0] if isempty[i]
+              else np.asarray(self.ix[i], dtype=np.intp)
+              for i in range(len(self.ix))]
+        w = [np.asarray(self.w[i], dtype=float)[:0] if isempty[i]
+             else np.asarray(self.w[i], dtype=float) / np.sum(self.w[i])
+             for i in range(len(self.w))]
+        indptr = np.concatenate([[0], np.cumsum([len(i) for i in ix])])
+        matrix = sparse.csr_matrix((np.concatenate(w), np.concatenate(ix),
+                                    indptr),
+                                   shape=(len(ix), numsources))
+        matrix.sum_duplicates()
+        return matrix
+
     def mean(self, vals):
         """
         Evaluate (weighted) zonal mean for values given at the source points.
@@ -18,12 +18,14 @@ into rainfall rates and vice versa
    z2r
    r2z
    z2rEnhanced
+   z2r_lookup_table
+   code2r
 
 
 """
 import numpy as np
 import scipy.ndimage.filters as filters
-from .trafo import decibel
+from .trafo import decibel, idecibel
 
 
 def z2r(z, a=200., b=1.6):
@@ -88,169 +90,6 @@ def r2z(r, a=200., b=1.6):
     return a * r ** b
 
 
-def _z2rEnhanced(z):
-    """Calculates rainrates from radar reflectivities using the enhanced
-    three-part Z-R-relationship used by the DWD (as of 2009).
-
-    This function does the actual calculations without any padding.
-    Neighborhood-means are taken only for available data, reducing the number
-    of elements used near the edges of the array.
-    Refer to the RADOLAN final report or the RADOLAN System handbook for
-    details on the calculations.
-    Basically, for low reflectivities an index called the shower index is
-    calculated as the mean of the differences along both axis in a neighborhood
-    of 3x3 pixels.
-    This means:
-           x-direction -->
-    y |    +---+---+---+
-    | |    | 1 | 2 | 3 |
-    d v    +---+---+---+
-    i      | 4 | 5 | 6 |
-    r      +---+---+---+
-    e      | 7 | 8 | 9 |
-    c      +---+---+---+
-    t
-    i      if 5 is the pixel in question, its shower index is calculated as
-    o      ( |1-2| + |2-3| + |4-5| + |5-6| + |7-8| + |8-9| +
-    n      + |1-4| + |4-7| + |2-5| + |5-8| + |3-6| + |6-9| ) / 12.
-           then, the upper line of the sum would be diffx (DIFFerences in
-           X-direction), the lower line would be diffy
-           (DIFFerences in Y-direction) in the code below.
-    """
-    # get the shape of the input
-    dimy = z.shape[0]
-    dimx = z.shape[1]
-
-    # calculate the decibel values from the input
-    db = decibel(z)
-
-    # set up our output arrays
-    r = np.zeros(z.shape)
-    si = np.zeros(z.shape)
-
-    # calculate difference fields in x and y direction
-    #  mainly for performance reasons, so that we can use numpy's efficient
-    #  array operations and avoid calculating a difference more than once
-    diffx = np.abs(db[:, :-1] - db[:, 1:])
-    diffy = np.abs(db[:-1, :] - db[1:, :])
-
-    # if the reflectivity is larger than 44dBZ, then there is no need to
-    # calculate the shower index
-    gt44 = np.where(db > 44.)
-    r[gt44] = z2r(z[gt44], a=77., b=1.9)
-    # the same is true for values between 36.5 and 44 dBZ
-    bt3644 = np.where(np.logical_and(db >= 36.5, db <= 44.))
-    r[bt3644] = z2r(z[bt3644], a=200., b=1.6)
-
-    # now iterate over the array and look for the remaining values
-    # TODO : this could be a starting point for further optimization, if we
-    #        iterated only over the remaining pixels instead of all
-    for i in range(dimy):
-        for j in range(dimx):
-            # if the reflectivity is too high, we coped with it already
-            # so we can skip that one
-            if db[i, j] >= 36.5:
-                # just set the shower index to some impossible value so that
-                # we know that there was no calculation done here
-                si[i, j] = -1
-                # continue with the next iteration
-                continue
-            else:
-                # calculate the bounds of the region where we have to consider
-                # the respective difference
-                xmin = max(0, j - 1)
-                xmax = min(dimx, j + 1)
-                ymin = max(0, i - 1)
-                ymax = min(dimy, i + 1)
-                # in fact python is quite forgiving with upper indices
-                # ours might go one index too far, so don't try to port this
-                # to another programming language straigt away!
-                diffxcut = diffx[ymin:ymax + 1, xmin:xmax]
-                diffycut = diffy[ymin:ymax, xmin:xmax + 1]
-                # calculate the mean for the current pixel
-                mn = (np.sum(diffxcut) + np.sum(diffycut)) / \
-                     (diffxcut.size + diffycut.size)
-                # apply the three different Z/R relations
-                if mn < 3.5:
-                    r[i, j] = z2r(z[i, j], a=125., b=1.4)
-                elif mn <= 7.5:
-                    r[i, j] = z2r(z[i, j], a=200., b=1.6)
-                else:
-                    r[i, j] = z2r(z[i, j], a=320., b=1.4)
-                # save the shower index
-                si[i, j] = mn
-    # return the results
-    return r, si
-
-
-def _z2rEnhanced_md(z):
-    """multidimensional version
-    assuming the two last dimensions represent an image
-    This version should also be a bit more performant than the original because
-    it uses less for-loops"""
-    # get the shape of the input
-    dimy = z.shape[-2]
-    dimx = z.shape[-1]
-
-    # calculate the decibel values from the input
-    db = decibel(z)
-
-    # set up our output arrays
-    r = np.zeros(z.shape)
-    si = np.zeros(z.shape)
-
-    # calculate difference fields in x and y direction
-    #  mainly for performance reasons, so that we can use numpy's efficient
-    #  array operations and avoid calculating a difference more than once
-    diffx = np.abs(db[..., :, :-1] - db[..., :, 1:])
-    diffy = np.abs(db[..., :-1, :] - db[..., 1:, :])
-
-    # if the reflectivity is larger than 44dBZ, then there is no need to
-    # calculate the shower index
-    gt44 = db > 44.
-    r[gt44] = z2r(z[gt44], a=77, b=1.9)
-    si[gt44] = -1
-    # the same is true for values between 36.5 and 44 dBZ
-    bt3644 = (db >= 36.5) & (db <= 44.)
-    r[bt3644] = z2r(z[bt3644], a=200, b=1.6)
-    si[bt3644] = -1
-
-    # now iterate only over remaining pixels
-    wlt36 = np.where(db < 36.5)
-    # nlt36 = len(wlt36[0])
-    for indices in zip(*wlt36):
-        # x and y-indices
-        i = indices[-2]
-        j = indices[-1]
-        # all remaining dimensional indices
-        ridx = indices[:-2]
-        # calculate the bounds of the region where we have to consider
-        # the respective difference
-        xmin = max(0, j - 1)
-        xmax = min(dimx, j + 1)
-        ymin = max(0, i - 1)
-        ymax = min(dimy, i + 1)
-        # in fact python is quite forgiving with upper indices
-        # ours might go one index too far, so don't try to port this
-        # to another programming language straigt away!
-        diffxcut = diffx[ridx, ymin:ymax + 1, xmin:xmax]
-        diffycut = diffy[ridx, ymin:ymax, xmin:xmax + 1]
-        # calculate the mean for the current pixel
-        mn = (np.sum(diffxcut) + np.sum(diffycut)) / \
-             (diffxcut.size + diffycut.size)
-        # apply the three different Z/R relations
-        if mn < 3.5:
-            r[ridx, i, j] = z2r(z[ridx, i, j], a=125, b=1.4)
-        elif mn <= 7.5:
-            r[ridx, i, j] = z2r(z[ridx, i, j], a=200, b=1.6)
-        else:
-            r[ridx, i, j] = z2r(z[ridx, i, j], a=320, b=1.4)
-        # save the shower index
-        si[ridx, i, j] = mn
-    # return the results
-    return r, si
-
-
 def z2rEsifilter(data):
     """calculates the shower index for the enhanced z-r relation
     to be used as the callable for a scipy.ndimate.filters.generic_filter
@@ -372,7 +211,172 @@ def _z2rEnhanced_mdcorr(z, xmode='reflect', ymode='wrap'):
     return r, si
 
 
-def z2rEnhanced(z):
+def z2r_lookup_table(a=200., b=1.6, gain=0.5, offset=-32.5, nbits=8,
+                     nodata=None, undetect=None, dtype=np.float32):
+    """Lookup table of rain rates for integer coded reflectivities.
+
+    Precomputes the rain rate for every possible code value of `nbits`
+    integer data, which is decoded to reflectivity as
+    :math:`dBZ = code \\cdot gain + offset` (the defaults correspond to DWD
+    RVP6 units, see :meth:`~wradlib.trafo.rvp2dBZ`). The table is applied to
+    coded data with :meth:`~wradlib.zr.code2r`.
+
+    .. versionadded:: 0.12.0
+
+    Parameters
+    ----------
+    a : float
+        Parameter a of the Z/R relationship
+    b : float
+        Parameter b of the Z/R relationship
+    gain : float
+        dBZ per code value
+    offset : float
+        dBZ of code value 0
+    nbits : int
+        number of bits of the coded data, 8 or 16 (256 or 65536 entries)
+    nodata : int or sequence of ints
+        code value(s) which are set to NaN
+    undetect : int or sequence of ints
+        code value(s) which are set to zero rain rate
+    dtype : data-type
+        data type of the table and the resulting rain rates
+
+    Returns
+    -------
+    table : :class:`numpy:numpy.ndarray`
+        1-D array of size 2**nbits containing the rain rate for every code
+
+    Examples
+    --------
+    IRIS `DB_DBZ` data is decoded as (code - 64) / 2, which corresponds to
+    `gain=0.5` and `offset=-32.`:
+
+    >>> import wradlib
+    >>> import numpy as np
+    >>> table = wradlib.zr.z2r_lookup_table(gain=0.5, offset=-32., nodata=0)
+    >>> codes = np.array([[0, 64, 128]], dtype=np.uint8)
+    >>> print(wradlib.zr.code2r(codes, table))  # doctest: +SKIP
+    [[       nan 0.03646332 3.6463323 ]]
+
+    """
+    codes = np.arange(2 ** nbits)
+    table = z2r(idecibel(codes * gain + offset), a=a, b=b).astype(dtype)
+    if nodata is not None:
+        table[nodata] = np.nan
+    if undetect is not None:
+        table[undetect] = 0.
+    return table
+
+
+def code2r(code, table, out=None):
+    """Converts integer coded reflectivities to rain rates using a lookup
+    table.
+
+    This is one gather per pixel, without intermediate float arrays for
+    the decoded reflectivities.
+
+    .. versionadded:: 0.12.0
+
+    Parameters
+    ----------
+    code : :class:`numpy:numpy.ndarray`
+        array of non-negative integer codes, e.g. of dtype uint8 or uint16
+    table : :class:`numpy:numpy.ndarray`
+        lookup table as returned by :meth:`~wradlib.zr.z2r_lookup_table`
+    out : :class:`numpy:numpy.ndarray`
+        optional output array with the shape of `code` and the dtype of
+        `table`
+
+    Returns
+    -------
+    r : :class:`numpy:numpy.ndarray`
+        rain rates of shape `code.shape`
+
+    Raises
+    ------
+    ValueError
+        if `code` contains negative values
+    IndexError
+        if `code` contains values beyond the length of `table`
+
+    """
+    code = np.asanyarray(code)
+    # unsigned codes which can't exceed the table don't need bounds checks
+    if code.dtype.kind == 'u' and 2 ** (8 * code.dtype.itemsize) <= len(table):
+        mode = 'clip'
+    else:
+        mode = 'raise'
+        # np.take wraps negative indices around instead of raising
+        if code.dtype.kind != 'u' and (code < 0).any():
+            raise ValueError('Codes must be non-negative.')
+    return np.take(table, code, out=out, mode=mode)
+
+
+# parameters (a, b) of the Z-R relationships of the enhanced Z-R
+# conversion, in the order of the classes of _z2rEnhanced_fused
+_Z2R_ENHANCED_AB = ((77., 1.9), (200., 1.6), (125., 1.4), (200., 1.6),
+                    (320., 1.4))
+
+
+def _z2rEnhanced_fused(z, r, si):
+    """Enhanced Z-R conversion of a stack of 2-D images (..., y, x).
+
+    The first image dimension is treated as cyclical. The shower index is
+    computed from differences of a padded copy of the decibel values, the
+    Z-R relationship of all classes is applied in one pass and the results
+    are written into `r` and `si`, which also define the computation dtype.
+    """
+    dtype = si.dtype
+    ny, nx = z.shape[-2:]
+    # decibel values with one beam of wrap-around padding on each side
+    db = np.empty(z.shape[:-2] + (ny + 2, nx), dtype=dtype)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        np.log10(z, out=db[..., 1:-1, :])
+    db[..., 1:-1, :] *= 10.
+    db[..., 0, :] = db[..., -2, :]
+    db[..., -1, :] = db[..., 1, :]
+
+    # differences in x-direction, summed over 2 columns and 3 rows
+    diff = np.zeros(db.shape, dtype=dtype)
+    np.subtract(db[..., 1:], db[..., :-1], out=diff[..., :-1])
+    np.abs(diff, out=diff)
+    diff[..., 1:] += diff[..., :-1]
+    np.add(diff[..., :-2, :], diff[..., 1:-1, :], out=si)
+    si += diff[..., 2:, :]
+    # differences in y-direction, summed over 2 rows and 3 columns
+    diff = diff[..., 1:, :]
+    np.subtract(db[..., 1:, :], db[..., :-1, :], out=diff)
+    np.abs(diff, out=diff)
+    diff[..., :-1, :] += diff[..., 1:, :]
+    diff = diff[..., :-1, :]
+    si += diff
+    si[..., 1:] += diff[..., :-1]
+    si[..., :-1] += diff[..., 1:]
+    # 12 differences in the interior, 7 at the first and last range bin
+    # (2 if there is only one range bin)
+    si /= 12.
+    if nx > 1:
+        si[..., [0, -1]] *= 12. / 7.
+    else:
+        si *= 6.
+
+    # class of each bin, selected in the order of precedence
+    db = db[..., 1:-1, :]
+    cls = np.full(z.shape, 4, dtype=np.int8)
+    cls[si <= 7.5] = 3
+    cls[si < 3.5] = 2
+    high = db >= 36.5
+    cls[high] = 1
+    cls[db > 44.] = 0
+    si[high] = -1.
+    ab = np.array(_Z2R_ENHANCED_AB, dtype=dtype)
+    # z2r(z, a, b) = (z / a) ** (1 / b)
+    np.multiply(z, (1. / ab[:, 0])[cls], out=r)
+    np.power(r, (1. / ab[:, 1])[cls], out=r)
+
+
+def z2rEnhanced(z, out=None, dtype=None, chunksize=None):
     """Calculates rainrates from radar reflectivities using the enhanced
     three-part Z-R-relationship used by the DWD (as of 2009)
 
@@ -380,11 +384,25 @@ def z2rEnhanced(z):
     i.e. z should be of shape (nazimuths, nbins) --> the first dimension
     is the cyclical one. For DWD DX-Data z's shape is (360,128).
 
+    Stacks of images (e.g. of shape (ntimes, nazimuths, nbins)) are processed
+    in chunks of `chunksize` images to limit the memory used for temporary
+    arrays.
+
     Parameters
     ----------
     z : a float or an array of floats
         Corresponds to reflectivity Z in mm**6/m**3
-        **must** be a 2-D array
+        **must** be at least a 2-D array, the last two dimensions are
+        (nazimuths, nbins)
+    out : array
+        optional output array for the rain rates with the shape of z
+    dtype : data-type
+        data type of the calculation and the results, defaults to the
+        dtype of `out` if given, float64 otherwise. Use np.float32 to halve
+        the memory footprint.
+    chunksize : int
+        number of images processed at once, defaults to as many images as
+        fit into about 4 million bins
 
     Returns
     -------
@@ -395,20 +413,35 @@ def z2rEnhanced(z):
         for control purposes. May be omitted in later versions
 
     """
-    # create a padded version of the input array
-    padz = np.zeros((z.shape[0] + 2, z.shape[1]))
-    # fill the center with the original data
-    padz[1:-1, :] = z
-    # add the last beam before the first one
-    padz[0, :] = z[-1, :]
-    # add the first beam after the last one
-    padz[-1, :] = z[0, :]
-
-    # do the actual calculation
-    padr, padsi = _z2rEnhanced(padz)
-
-    # return the unpadded field
-    return padr[1:-1, :], padsi[1:-1, :]
+    z = np.asanyarray(z)
+    assert z.ndim >= 2, "z must be at least a 2-D array."
+    if dtype is None:
+        dtype = np.float64 if out is None else out.dtype
+    dtype = np.dtype(dtype)
+    if out is None:
+        out = np.empty(z.shape, dtype=dtype)
+    assert out.shape == z.shape, "out must have the same shape as z."
+    si = np.empty(z.shape, dtype=dtype)
+
+    ny, nx = z.shape[-2:]
+    if chunksize is None:
+        chunksize = 2 ** 22 // max(ny * nx, 1)
+    chunksize = max(int(chunksize), 1)
+    zs = z.reshape((-1, ny, nx))
+    sis = si.reshape((-1, ny, nx))
+    # results are written directly into out where possible
+    copy = not out.flags.c_contiguous or out.dtype != dtype
+    if copy:
+        rs = np.empty(zs.shape, dtype=dtype)
+    else:
+        rs = out.reshape((-1, ny, nx))
+    for i in range(0, len(zs), chunksize):
+        chunk = slice(i, i + chunksize)
+        _z2rEnhanced_fused(zs[chunk].astype(dtype, copy=False), rs[chunk],
+                           sis[chunk])
+    if copy:
+        out[...] = rs.reshape(z.shape)
+    return out, si
 
 
 if __name__ == '__main__':